@@ -0,0 +1,81 @@
+"""Memoria retenida por listing: modelos pydantic vs `CompactListing`.
+
+Genera páginas JSON con el mercado sintético de `fakeserver.MarketData`, las
+decodifica con cada representación y mide con tracemalloc los bytes que quedan
+vivos al retener todos los listings (el JSON crudo se excluye de la medición).
+
+    python bench/bench_compact.py [--listings 20000] [--sellers 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Ejecutable sin instalar el paquete, desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from csfloat_client.compact import CompactPool
+from csfloat_client.endpoints import _decode_listings_page, _find_items_payload, _loads
+from csfloat_client.fakeserver import MarketData
+
+HEADERS: Dict[str, str] = {}
+
+
+def _pages(listings: int, sellers: int) -> List[bytes]:
+    data = MarketData(listings, seed=1, sellers=sellers)
+    return [json.dumps([data.listing(i) for i in range(s, min(s + 50, listings))]).encode() for s in range(0, listings, 50)]
+
+
+def _models(pages: List[bytes]) -> List[Any]:
+    return [l for content in pages for l in _decode_listings_page(content, HEADERS).items]
+
+
+def _compact(pages: List[bytes]) -> List[Any]:
+    pool = CompactPool()
+    out: List[Any] = [pool]  # el pool (vendedores, stickers, cadenas) cuenta como parte del costo
+    for content in pages:
+        out.extend(pool.listing(d) for d in _find_items_payload(_loads(content)))
+    return out
+
+
+def _retained(build: Callable[[List[bytes]], List[Any]], pages: List[bytes]) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = build(pages)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(kept)
+    del kept
+    return {"bytes_per_listing": current / n, "peak_mb": peak / 1e6, "seconds": elapsed}
+
+
+def run(listings: int = 20_000, sellers: int = 2_000) -> Dict[str, Dict[str, float]]:
+    pages = _pages(listings, sellers)
+    return {"pydantic": _retained(_models, pages), "compact": _retained(_compact, pages)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=20_000)
+    parser.add_argument("--sellers", type=int, default=2_000, help="Vendedores distintos en el mercado sintético")
+    args = parser.parse_args()
+    res = run(args.listings, args.sellers)
+    base = res["pydantic"]["bytes_per_listing"]
+    for name, m in res.items():
+        print(
+            f"{name:<10} {m['bytes_per_listing']:>10,.0f} B/listing (x{base / m['bytes_per_listing']:.1f})"
+            f"  pico {m['peak_mb']:>7.1f} MB  {m['seconds']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Micro-benchmark de decodificación de una página de 50 listings.
+
+Compara la ruta anterior (`json.loads` + `Listing.model_validate` por ítem), la
+ruta rápida (`TypeAdapter.validate_json` sobre los bytes crudos) y el modo raw
+(solo parseo JSON, sin modelos). La página sale del mercado sintético de
+`fakeserver.MarketData`.
+
+    python bench/bench_decode.py [--items 50] [--rounds 200]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Ejecutable sin instalar el paquete, desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from csfloat_client.endpoints import _decode_listings_page, _find_items_payload, _loads
+from csfloat_client.fakeserver import MarketData
+from csfloat_client.models import Listing
+
+HEADERS = {"x-next-cursor": "abc"}
+
+
+def _legacy(content: bytes) -> int:
+    data = json.loads(content)
+    payload = _find_items_payload(data)
+    return len([Listing.model_validate(obj) for obj in payload])
+
+
+def _fast(content: bytes) -> int:
+    return len(_decode_listings_page(content, HEADERS).items)
+
+
+def _raw(content: bytes) -> int:
+    return len(_find_items_payload(_loads(content)))
+
+
+def _measure(fn: Callable[[bytes], int], content: bytes, rounds: int) -> float:
+    fn(content)  # warm-up
+    start = time.perf_counter()
+    items = 0
+    for _ in range(rounds):
+        items += fn(content)
+    return items / (time.perf_counter() - start)
+
+
+def run(items: int = 50, rounds: int = 200) -> Dict[str, float]:
+    data = MarketData(items, seed=1)
+    content = json.dumps([data.listing(i) for i in range(items)]).encode()
+    return {
+        "legacy_items_per_sec": _measure(_legacy, content, rounds),
+        "fast_items_per_sec": _measure(_fast, content, rounds),
+        "raw_items_per_sec": _measure(_raw, content, rounds),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    res = run(args.items, args.rounds)
+    base = res["legacy_items_per_sec"]
+    for name, value in res.items():
+        print(f"{name:<24} {value:>12,.0f}  (x{value / base:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Costo de arranque del CLI medido con `python -X importtime`.
+
+Corre cada objetivo en un intérprete nuevo (varias veces, se toma la mediana)
+y reporta el tiempo acumulado de import del módulo y los módulos pesados que
+quedaron cargados. También mide el tiempo de pared de `csf --help`.
+
+    python bench/bench_import.py [--runs 5] [--budget-ms 150]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TARGETS = ("csfloat_client", "csfloat_client.cli")
+HEAVY = ("httpx", "pydantic", "rich", "dotenv", "numpy", "pyarrow")
+# Los subprocesos corren desde la raíz del repo: no hace falta instalar el paquete
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_time_us(module: str) -> int:
+    """Microsegundos acumulados de importar `module` en un proceso limpio."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"{module} no aparece en la salida de -X importtime")
+
+
+def loaded_heavy(module: str) -> List[str]:
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT).stdout
+    return out.split()
+
+
+def help_wall_ms() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "csfloat_client.cli", "--help"], capture_output=True, check=True, cwd=ROOT)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(runs: int = 5) -> Dict[str, float]:
+    res: Dict[str, float] = {}
+    for module in TARGETS:
+        res[f"{module}_import_ms"] = statistics.median(import_time_us(module) for _ in range(runs)) / 1000
+    res["csf_help_wall_ms"] = statistics.median(help_wall_ms() for _ in range(runs))
+    return res
+
+
+def main() -> Optional[int]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fallar si el import del CLI supera este valor")
+    args = parser.parse_args()
+    res = run(args.runs)
+    for name, value in res.items():
+        print(f"{name:<32} {value:>9.1f}")
+    for module in TARGETS:
+        print(f"{module:<32} carga: {', '.join(loaded_heavy(module)) or '-'}")
+    if args.budget_ms is not None and res["csfloat_client.cli_import_ms"] > args.budget_ms:
+        print(f"Presupuesto excedido: {res['csfloat_client.cli_import_ms']:.1f} ms > {args.budget_ms} ms")
+        return 1
+    return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Micro-benchmark del costo por request de `http._log_request` en cada modo.
+
+Mide `rich` (tabla por request), `jsonl` (una línea JSON) y `off`, además de
+`jsonl` con muestreo. La salida se descarta (`os.devnull`), así que el número
+refleja el costo de CPU de formatear, no el de la terminal.
+
+    python bench/bench_logging.py [--rounds 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+from rich.console import Console
+
+# Ejecutable sin instalar el paquete, desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from csfloat_client import http
+
+URL = httpx.URL("https://csfloat.com/api/v1/listings?limit=50&sort_by=most_recent&cursor=abc")
+FILTERS = {"limit": 50, "sort_by": "most_recent", "cursor": "abc"}
+
+
+def _measure(mode: str, rounds: int, sample: Optional[float] = None) -> float:
+    http.set_log_mode(mode, sample=sample)
+    try:
+        http._log_request("GET", URL, 200, 12.3, "req-1", filters_preview=FILTERS)  # warm-up
+        start = time.perf_counter()
+        for _ in range(rounds):
+            http._log_request("GET", URL, 200, 12.3, "req-1", filters_preview=FILTERS)
+        return (time.perf_counter() - start) / rounds * 1e6
+    finally:
+        http.set_log_mode(None)
+
+
+def run(rounds: int = 2000) -> Dict[str, float]:
+    """Microsegundos por request para cada modo."""
+    original = http.console
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        # Consola "terminal" para que rich haga todo el trabajo de estilos
+        http.console = Console(file=devnull, force_terminal=True, width=120)
+        try:
+            return {
+                "rich_us_per_request": _measure("rich", rounds),
+                "jsonl_us_per_request": _measure("jsonl", rounds),
+                "jsonl_sample_0.1_us_per_request": _measure("jsonl", rounds, sample=0.1),
+                "off_us_per_request": _measure("off", rounds),
+            }
+        finally:
+            http.console = original
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    res = run(args.rounds)
+    base = res["rich_us_per_request"]
+    for name, value in res.items():
+        print(f"{name:<34} {value:>10.2f} µs  (x{base / value:.0f} vs rich)")
+
+
+if __name__ == "__main__":
+    main()
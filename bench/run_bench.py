@@ -0,0 +1,144 @@
+"""Suite de benchmarks offline contra el servidor falso local (`csfloat_client.fakeserver`).
+
+Mide, sin tocar la API real:
+- páginas/s de `iter_listing_pages` (secuencial y con prefetch),
+- ítems/s de decodificación (ver `bench_decode.py`),
+- filas/s de export CSV de punta a punta,
+- pico de memoria (tracemalloc) del export.
+
+Los resultados se guardan en JSON; con `--baseline` se comparan contra una
+corrida anterior para detectar regresiones.
+
+    python bench/run_bench.py [--listings 5000] [--latency 0] [--error-429-every 0]
+                              [--out bench/results/latest.json] [--baseline prev.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Ejecutable sin instalar el paquete, desde cualquier directorio: la raíz del
+# repo para `csfloat_client` y `bench/` para `bench_decode`
+_BENCH_DIR = Path(__file__).resolve().parent
+sys.path[:0] = [str(_BENCH_DIR.parent), str(_BENCH_DIR)]
+
+import bench_decode
+from csfloat_client.config import get_settings
+from csfloat_client.exporters import export_pages
+from csfloat_client.fakeserver import FakeCSFloatServer
+from csfloat_client.http import CSFloatSession
+from csfloat_client.metrics import get_metrics
+from csfloat_client.utils import iter_listing_pages
+
+# Métricas donde "más es mejor"; el resto (memoria) es "menos es mejor"
+HIGHER_IS_BETTER = ("per_sec",)
+
+
+def _configure(base_url: str) -> None:
+    os.environ["CSFLOAT_BASE"] = base_url
+    os.environ["CSFLOAT_RATE_LIMIT"] = "off"
+    os.environ["CSFLOAT_LOG"] = "off"
+    os.environ["CSFLOAT_IGNORE_DOTENV"] = "1"
+    os.environ.pop("CSFLOAT_CACHE_DIR", None)
+    os.environ.pop("CSFLOAT_API_KEY", None)
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+
+def _pages_per_sec(session: CSFloatSession, prefetch: int) -> float:
+    start = time.perf_counter()
+    pages = sum(1 for _ in iter_listing_pages(initial_filters={"limit": 50}, session=session, prefetch=prefetch))
+    return pages / (time.perf_counter() - start)
+
+
+def _export(session: CSFloatSession, out: Path) -> int:
+    pages = iter_listing_pages(initial_filters={"limit": 50}, session=session, prefetch=1)
+    return export_pages(pages, out, format="csv")
+
+
+def _export_rows_per_sec(session: CSFloatSession, out: Path) -> float:
+    start = time.perf_counter()
+    rows = _export(session, out)
+    return rows / (time.perf_counter() - start)
+
+
+def _peak_mb(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def run(listings: int = 5000, latency: float = 0.0, error_429_every: int = 0) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with FakeCSFloatServer(total=listings, latency=latency, error_429_every=error_429_every) as srv, \
+            CSFloatSession() as session, tempfile.TemporaryDirectory() as tmp:
+        _configure(srv.url)
+        _pages_per_sec(session, 0)  # warm-up (conexión keep-alive)
+        get_metrics().reset()
+        results["pages_per_sec"] = _pages_per_sec(session, 0)
+        results["pages_per_sec_prefetch"] = _pages_per_sec(session, 1)
+        results["export_csv_rows_per_sec"] = _export_rows_per_sec(session, Path(tmp) / "out.csv")
+        results["export_csv_peak_mb"] = _peak_mb(lambda: _export(session, Path(tmp) / "out.csv"))
+        results["retries"] = get_metrics().snapshot()["retries"]
+        results["server_requests"] = srv.requests
+    decode = bench_decode.run()
+    results["decode_items_per_sec"] = decode["fast_items_per_sec"]
+    results["decode_raw_items_per_sec"] = decode["raw_items_per_sec"]
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, float]:
+    """Cambio relativo por métrica (positivo = mejor)."""
+    out: Dict[str, float] = {}
+    for key, value in current.items():
+        base = baseline.get(key)
+        if not isinstance(value, (int, float)) or not isinstance(base, (int, float)) or not base:
+            continue
+        change = (value - base) / base
+        out[key] = change if any(s in key for s in HIGHER_IS_BETTER) else -change
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia artificial por request (s)")
+    parser.add_argument("--error-429-every", type=int, default=0, help="Responder 429 cada N requests")
+    parser.add_argument("--out", type=Path, default=Path("bench/results/latest.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON de una corrida anterior")
+    args = parser.parse_args()
+
+    metrics = run(args.listings, args.latency, args.error_429_every)
+    for name, value in metrics.items():
+        print(f"{name:<28} {value:>14,.2f}")
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"listings": args.listings, "latency": args.latency, "error_429_every": args.error_429_every},
+        "metrics": metrics,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Resultados en {args.out}")
+
+    if args.baseline is not None:
+        baseline: Optional[Dict[str, Any]] = json.loads(args.baseline.read_text(encoding="utf-8")).get("metrics")
+        print("\nvs baseline (positivo = mejor):")
+        for name, change in compare(metrics, baseline or {}).items():
+            print(f"{name:<28} {change:>+8.1%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
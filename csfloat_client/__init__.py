@@ -1,21 +1,48 @@
 """CSFloat Market API client and CLI.
 
 Exposes typed wrappers for listings endpoints and a Typer-based CLI.
+
+Los nombres públicos se importan bajo demanda (PEP 562): `import csfloat_client`
+no carga httpx ni pydantic hasta que se usa alguno de ellos.
 """
-from .models import Listing, Item, Seller, Sticker, SCM, ListingsPage
-from .endpoints import get_listings, get_listing, post_listing, get_listings_page
-
-__all__ = [
-    "Listing",
-    "Item",
-    "Seller",
-    "Sticker",
-    "SCM",
-    "ListingsPage",
-    "get_listings",
-    "get_listing",
-    "post_listing",
-    "get_listings_page",
-]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .endpoints import get_listing, get_listings, get_listings_page, post_listing
+    from .http import CSFloatHTTPError, CSFloatSession
+    from .models import SCM, Item, Listing, ListingsPage, Seller, Sticker
+
+_LAZY = {
+    "Listing": ".models",
+    "Item": ".models",
+    "Seller": ".models",
+    "Sticker": ".models",
+    "SCM": ".models",
+    "ListingsPage": ".models",
+    "get_listings": ".endpoints",
+    "get_listing": ".endpoints",
+    "post_listing": ".endpoints",
+    "get_listings_page": ".endpoints",
+    "CSFloatSession": ".http",
+    "CSFloatHTTPError": ".http",
+}
+
+__all__ = list(_LAZY)
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # los siguientes accesos no pasan por acá
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,305 @@
+"""API asíncrona (asyncio) sobre `httpx.AsyncClient`.
+
+Espeja `http.request` y los endpoints síncronos con la misma semántica de
+reintentos/backoff, para correr muchas consultas concurrentes en un único
+event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional
+
+import httpx
+
+from .config import Settings, get_settings
+from .entities import get_entity_cache
+from .endpoints import LISTINGS_PATH, _build_listing_body, _clamp_filters, _decode_listings_page, _remember
+from .http import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE,
+    DEFAULT_TIMEOUT,
+    RETRY_STATUSES,
+    CSFloatHTTPError,
+    HTTPResult,
+    _backoff_delay,
+    _default_headers,
+    _log_request,
+    _resolve_cache,
+    _resolve_limiter,
+)
+from .metrics import get_metrics
+from .models import Listing, ListingsPage
+from .cache import CacheEntry, ResponseCache
+from .ratelimit import RateLimiter
+from .query import build_query
+
+
+async def _sleep_backoff(attempt: int, retry_after: Optional[str], *, method: str, path: str) -> None:
+    delay = _backoff_delay(attempt, retry_after)
+    get_metrics().observe_retry(method, path, delay)
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+def create_async_client(
+    timeout: httpx.Timeout | float | None = None,
+    *,
+    limits: Optional[httpx.Limits] = None,
+    http2: bool = False,
+) -> httpx.AsyncClient:
+    s = get_settings()
+    return httpx.AsyncClient(
+        base_url=s.base_url,
+        headers=_default_headers(),
+        timeout=timeout or DEFAULT_TIMEOUT,
+        limits=limits or httpx.Limits(
+            max_connections=DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections=DEFAULT_MAX_KEEPALIVE,
+            keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2,
+    )
+
+
+class AsyncCSFloatSession:
+    """Equivalente asíncrono de `CSFloatSession` (un `httpx.AsyncClient` con pool)."""
+
+    def __init__(
+        self,
+        *,
+        timeout: httpx.Timeout | float | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._client: Optional[httpx.AsyncClient] = None
+        self._settings: Optional[Settings] = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        s = get_settings()
+        if self._client is None or self._settings != s:
+            if self._client is not None:
+                await self._client.aclose()
+            self._client = create_async_client(timeout=self.timeout, limits=self.limits, http2=self.http2)
+            self._settings = s
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._settings = None
+
+    async def __aenter__(self) -> "AsyncCSFloatSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Iterable[tuple[str, Any]] | Mapping[str, Any]] = None,
+        json: Optional[Mapping[str, Any]] = None,
+        max_retries: int = 3,
+        timeout: httpx.Timeout | float | None = None,
+    ) -> HTTPResult:
+        """Versión asíncrona de `CSFloatSession.request` (mismos reintentos y errores)."""
+        client = await self._get_client()
+        limiter = _resolve_limiter(self.rate_limiter)
+        metrics = get_metrics()
+        extra: Dict[str, Any] = {}
+        if timeout is not None:
+            extra["timeout"] = timeout
+        cache = _resolve_cache(self.cache)
+        cache_key: Optional[str] = None
+        cached: Optional[CacheEntry] = None
+        if cache is not None and method.upper() == "GET":
+            cache_key = cache.key(method, path, params)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                if cached.fresh:
+                    metrics.observe_cache_hit()
+                    req = client.build_request(method, path, params=params)
+                    return HTTPResult(response=cached.to_response(req), latency_ms=0.0)
+                if cached.etag:
+                    extra["headers"] = {"If-None-Match": cached.etag}
+        last_exc: Optional[Exception] = None
+        for attempt in range(max_retries + 1):
+            if limiter is not None:
+                waited = time.perf_counter()
+                await limiter.acquire_async()
+                metrics.observe_throttle(time.perf_counter() - waited)
+            start = time.perf_counter()
+            try:
+                resp = await client.request(method, path, params=params, json=json, **extra)
+            except httpx.RequestError as e:
+                latency_ms = (time.perf_counter() - start) * 1000.0
+                metrics.observe_response(method, path, None, latency_ms)
+                _log_request(method, httpx.URL(path), None, latency_ms, None)
+                last_exc = e
+                if attempt < max_retries:
+                    await _sleep_backoff(attempt, None, method=method, path=path)
+                    continue
+                raise CSFloatHTTPError(f"Error de red/timeout en {method.upper()} {path}: {e}") from e
+
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            status = resp.status_code
+            metrics.observe_response(method, path, status, latency_ms, len(resp.content))
+            if limiter is not None:
+                limiter.feedback(status, resp.headers.get("Retry-After"))
+            req_id = resp.headers.get("x-request-id") or resp.headers.get("request-id")
+            _log_request(method, resp.request.url, status, latency_ms, req_id, filters_preview=params if method.upper()=="GET" else None)
+
+            if status == 304 and cached is not None:
+                cache.refresh(cache_key, path, resp)  # type: ignore[union-attr,arg-type]
+                return HTTPResult(response=cached.to_response(resp.request), latency_ms=latency_ms)
+
+            if status in RETRY_STATUSES and attempt < max_retries:
+                if status == 429 and limiter is not None:
+                    # El limitador ya absorbió el 429 (pausa por Retry-After y tasa
+                    # reducida): la espera la hace el próximo acquire, no un backoff
+                    metrics.observe_retry(method, path, 0.0)
+                else:
+                    await _sleep_backoff(attempt, resp.headers.get("Retry-After"), method=method, path=path)
+                continue
+
+            try:
+                resp.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                body = None
+                try:
+                    body = resp.text[:500]
+                except Exception:
+                    pass
+                raise CSFloatHTTPError(
+                    f"HTTP {status} en {method.upper()} {path}: {body}"
+                ) from e
+            if cache_key is not None:
+                cache.put(cache_key, path, resp)  # type: ignore[union-attr]
+            return HTTPResult(response=resp, latency_ms=latency_ms)
+        if last_exc:
+            raise CSFloatHTTPError(f"Fallo tras reintentos: {last_exc}")
+        raise CSFloatHTTPError("Fallo desconocido tras reintentos")
+
+
+# Un AsyncClient queda atado al event loop donde se creó: una sesión por loop.
+_default_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncCSFloatSession]" = weakref.WeakKeyDictionary()
+
+
+def get_default_async_session() -> AsyncCSFloatSession:
+    """Sesión asíncrona compartida del event loop en curso."""
+    loop = asyncio.get_running_loop()
+    sess = _default_sessions.get(loop)
+    if sess is None:
+        sess = AsyncCSFloatSession()
+        _default_sessions[loop] = sess
+    return sess
+
+
+async def aclose_default_session() -> None:
+    """Cierra la sesión compartida del event loop en curso, si hay una.
+
+    Llamarla antes de que termine el loop (p.ej. al final de la corrutina que
+    corre `asyncio.run`): el `AsyncClient` no se puede cerrar desde otro loop.
+    """
+    sess = _default_sessions.pop(asyncio.get_running_loop(), None)
+    if sess is not None:
+        await sess.aclose()
+
+
+async def request(
+    method: str,
+    path: str,
+    *,
+    params: Optional[Iterable[tuple[str, Any]] | Mapping[str, Any]] = None,
+    json: Optional[Mapping[str, Any]] = None,
+    max_retries: int = 3,
+    timeout: httpx.Timeout | float | None = None,
+    session: Optional[AsyncCSFloatSession] = None,
+) -> HTTPResult:
+    """Mirror asíncrono de `http.request`."""
+    sess = session or get_default_async_session()
+    return await sess.request(method, path, params=params, json=json, max_retries=max_retries, timeout=timeout)
+
+
+async def get_listings_page(*, session: Optional[AsyncCSFloatSession] = None, **filters: Any) -> ListingsPage:
+    """Versión asíncrona de `endpoints.get_listings_page`."""
+    params = build_query(_clamp_filters(filters))
+    res = await request("GET", LISTINGS_PATH, params=params, session=session)
+    page = _decode_listings_page(res.response.content, res.response.headers)
+    _remember(page.items)
+    return page
+
+
+async def get_listing(
+    listing_id: str,
+    *,
+    session: Optional[AsyncCSFloatSession] = None,
+    use_cache: bool = True,
+) -> Listing:
+    """Versión asíncrona de `endpoints.get_listing` (incluye el identity map)."""
+    cache = get_entity_cache()
+    if use_cache and cache is not None:
+        hit = cache.get(listing_id)
+        if hit is not None:
+            return hit
+    res = await request("GET", f"{LISTINGS_PATH}/{listing_id}", session=session)
+    listing = Listing.model_validate(res.response.json())
+    _remember([listing])
+    return listing
+
+
+async def post_listing(
+    *,
+    asset_id: str,
+    type: str = "buy_now",
+    price: Optional[int] = None,
+    session: Optional[AsyncCSFloatSession] = None,
+    **kwargs: Any,
+) -> Listing:
+    """Versión asíncrona de `endpoints.post_listing` (mismas validaciones)."""
+    body = _build_listing_body(asset_id=asset_id, type=type, price=price, **kwargs)
+    res = await request("POST", LISTINGS_PATH, json=body, session=session)
+    listing = Listing.model_validate(res.response.json())
+    _remember([listing])
+    return listing
+
+
+async def paginate_listings(
+    *,
+    initial_filters: Optional[Mapping[str, Any]] = None,
+    max_pages: Optional[int] = None,
+    session: Optional[AsyncCSFloatSession] = None,
+) -> AsyncIterator[Listing]:
+    """Async-iterator equivalente a `utils.paginate_listings`."""
+    filters: Dict[str, Any] = dict(initial_filters or {})
+    pages = 0
+    while True:
+        page = await get_listings_page(session=session, **filters)
+        for it in page.items:
+            yield it
+        pages += 1
+        if max_pages is not None and pages >= max_pages:
+            break
+        if not page.next_cursor:
+            break
+        filters = dict(filters)
+        filters["cursor"] = page.next_cursor
@@ -0,0 +1,202 @@
+"""Publicación masiva de listings desde CSV o JSONL (`csf listing:list-bulk`).
+
+Flujo:
+1. `read_listing_rows` lee las filas (columnas de `post_listing`: asset_id,
+   type, price, max_offer_discount, reserve_price, duration_days,
+   description, private) y convierte los tipos de las celdas CSV.
+2. `prepare_listing_posts` valida todas las filas antes de publicar nada, con
+   `_build_listing_body` (las mismas reglas que `post_listing`), y detecta
+   asset_id repetidos.
+3. `post_listings` publica con concurrencia acotada; todas las requests pasan
+   por el rate limiter de la sesión.
+4. `write_listing_results` escribe el archivo de resultados: las columnas de
+   entrada más `status` (ok|error|pending), `listing_id` y `error`.
+
+El archivo de resultados se puede volver a usar como entrada: las filas con
+`status=ok` se saltean, así que solo se reintentan las fallidas.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from . import endpoints as _ep
+from .http import CSFloatHTTPError, CSFloatSession
+from .models import Listing
+
+DEFAULT_POST_CONCURRENCY = 4
+RESULT_COLUMNS = ("status", "listing_id", "error")
+_INT_FIELDS = ("price", "max_offer_discount", "reserve_price", "duration_days")
+_TRUE = {"1", "true", "yes", "si", "sí", "y"}
+_FALSE = {"0", "false", "no", "n"}
+
+
+@dataclass
+class ListingPost:
+    """Una fila del archivo: su body validado y, tras publicar, el resultado."""
+
+    row: int  # número de fila de datos (desde 1)
+    data: Dict[str, Any]  # columnas tal como vinieron (sin las de resultado)
+    body: Optional[Dict[str, Any]] = None
+    listing: Optional[Listing] = None
+    error: Optional[Exception] = None
+    skipped: bool = False  # ya publicada en una corrida anterior
+
+    @property
+    def status(self) -> str:
+        if self.skipped or self.listing is not None:
+            return "ok"
+        return "error" if self.error is not None else "pending"
+
+
+class BulkValidationError(ValueError):
+    """Filas inválidas: no se publicó ninguna. `invalid` trae cada fila con su `error`."""
+
+    def __init__(self, invalid: List[ListingPost]) -> None:
+        super().__init__(f"{len(invalid)} filas inválidas")
+        self.invalid = invalid
+
+
+def detect_format(path: str | Path) -> str:
+    return "jsonl" if Path(path).suffix.lower() in (".jsonl", ".ndjson") else "csv"
+
+
+def read_listing_rows(path: str | Path, *, format: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Filas del archivo como dicts; en CSV las celdas vacías se descartan."""
+    fmt = format or detect_format(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        if fmt != "csv":
+            raise ValueError("format debe ser csv o jsonl")
+        return [{k: v for k, v in row.items() if k and v not in (None, "")} for row in csv.DictReader(f)]
+
+
+def _coerce(data: Dict[str, Any]) -> Dict[str, Any]:
+    params = {k: v for k, v in data.items() if k not in RESULT_COLUMNS}
+    if "desc" in params and "description" not in params:
+        params["description"] = params.pop("desc")
+    for name in _INT_FIELDS:
+        value = params.get(name)
+        if isinstance(value, str):
+            try:
+                params[name] = int(value)
+            except ValueError:
+                raise ValueError(f"{name} debe ser un entero (centavos/días): {value!r}") from None
+    private = params.get("private")
+    if isinstance(private, str):
+        if private.strip().lower() not in _TRUE | _FALSE:
+            raise ValueError(f"private debe ser true o false: {private!r}")
+        params["private"] = private.strip().lower() in _TRUE
+    if "asset_id" not in params:
+        raise ValueError("falta asset_id")
+    params["asset_id"] = str(params["asset_id"])
+    return params
+
+
+def prepare_listing_posts(rows: Iterable[Dict[str, Any]]) -> List[ListingPost]:
+    """Valida todas las filas; `BulkValidationError` si alguna es inválida.
+
+    Las filas que ya tienen `status=ok` (archivo de resultados re-alimentado)
+    quedan marcadas como `skipped` y no se validan ni publican.
+    """
+    posts: List[ListingPost] = []
+    invalid: List[ListingPost] = []
+    assets: Dict[str, int] = {}
+    for n, data in enumerate(rows, 1):
+        post = ListingPost(n, {k: v for k, v in data.items() if k not in RESULT_COLUMNS})
+        posts.append(post)
+        if str(data.get("status", "")).lower() == "ok":
+            post.skipped = True
+            post.data["listing_id"] = data.get("listing_id")
+            continue
+        try:
+            params = _coerce(data)
+            post.body = _ep._build_listing_body(**params)
+            asset = params["asset_id"]
+            if asset in assets:
+                raise ValueError(f"asset_id repetido (fila {assets[asset]})")
+            assets[asset] = n
+        except (ValueError, TypeError) as e:
+            post.error = e
+            invalid.append(post)
+    if invalid:
+        raise BulkValidationError(invalid)
+    return posts
+
+
+def post_listings(
+    posts: Sequence[ListingPost],
+    *,
+    concurrency: int = DEFAULT_POST_CONCURRENCY,
+    session: Optional[CSFloatSession] = None,
+) -> Iterator[ListingPost]:
+    """Publica los `posts` pendientes con hasta `concurrency` requests en vuelo.
+
+    Emite cada `ListingPost` en orden de finalización con `listing` o `error`;
+    un error HTTP no corta el resto.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency debe ser >= 1")
+
+    def submit(post: ListingPost) -> ListingPost:
+        try:
+            post.listing = _ep.post_listing(session=session, **(post.body or {}))
+            post.error = None
+        except (CSFloatHTTPError, ValueError) as e:
+            post.error = e
+        return post
+
+    pending: set[Future] = set()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="csfloat-post") as pool:
+        for post in posts:
+            if post.skipped:
+                continue
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+            pending.add(pool.submit(submit, post))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+
+def _result_row(post: ListingPost) -> Dict[str, Any]:
+    row = dict(post.data)
+    listing_id = post.listing.id if post.listing is not None else post.data.get("listing_id")
+    row.pop("listing_id", None)
+    row.update({"status": post.status, "listing_id": listing_id or "", "error": str(post.error) if post.error else ""})
+    return row
+
+
+def write_listing_results(posts: Sequence[ListingPost], path: str | Path, *, format: Optional[str] = None) -> None:
+    """Escribe una fila de resultado por post, en el orden del archivo de entrada.
+
+    La escritura es atómica (archivo temporal + `os.replace`): se puede llamar
+    tras cada publicación como checkpoint. Las filas aún no publicadas quedan
+    con `status=pending` y se reintentan al re-alimentar el archivo.
+    """
+    fmt = format or detect_format(path)
+    rows = [_result_row(p) for p in sorted(posts, key=lambda p: p.row)]
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        if fmt == "jsonl":
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            columns: List[str] = []
+            for row in rows:
+                columns.extend(k for k in row if k not in columns and k not in RESULT_COLUMNS)
+            writer = csv.DictWriter(f, fieldnames=[*columns, *RESULT_COLUMNS])
+            writer.writeheader()
+            writer.writerows(rows)
+    os.replace(tmp, p)
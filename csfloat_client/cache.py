@@ -0,0 +1,233 @@
+"""Cache HTTP en disco (opt-in) para respuestas GET.
+
+La clave es la request normalizada (método, base_url, ruta y la query ordenada
+de `query.build_query`, más una huella de la API key), así que los mismos
+filtros siempre caen en la misma entrada. Las entradas viven en un SQLite con
+tamaño acotado y desalojo LRU; el TTL se elige por prefijo de ruta y
+`Cache-Control: max-age`/`no-cache`/`no-store` del servidor tiene prioridad.
+Las entradas vencidas con `ETag` se revalidan con `If-None-Match` (un 304 las
+renueva sin volver a descargar el cuerpo).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+from .config import get_settings
+from .query import build_query
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 60.0
+# TTL por endpoint del cache del proceso: la búsqueda cambia con cada listing
+# nuevo; el detalle de un listing cambia poco (precio, estado)
+SEARCH_PREFIX = "/api/v1/listings"  # endpoints.LISTINGS_PATH
+DETAIL_PREFIX = "/api/v1/listings/"
+DEFAULT_TTLS = {SEARCH_PREFIX: 15.0, DETAIL_PREFIX: 120.0}
+
+
+@dataclass
+class CacheEntry:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(self.status, headers=self.headers, content=self.body, request=request)
+
+
+def _parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    out: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            out[name.lower()] = arg.strip('"') or None
+    return out
+
+
+class ResponseCache:
+    """Cache de respuestas en un SQLite dentro de `directory`.
+
+    - `max_bytes`: tamaño máximo de los cuerpos guardados; se desaloja por LRU.
+    - `ttl`: TTL por defecto en segundos.
+    - `ttls`: TTL por prefijo de ruta (gana el prefijo más largo), p.ej.
+      `{"/api/v1/listings": 30}`.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+        ttls: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.directory / "responses.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, status INTEGER, headers TEXT, body BLOB, etag TEXT, "
+            "expires_at REAL, last_access REAL, size INTEGER)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries(last_access)")
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def key(
+        method: str,
+        path: str,
+        params: Optional[Iterable[Tuple[str, Any]] | Mapping[str, Any]] = None,
+    ) -> str:
+        if params is None:
+            pairs: list = []
+        elif isinstance(params, Mapping):
+            pairs = build_query(params)
+        else:
+            pairs = sorted((str(k), str(v)) for k, v in params)
+        s = get_settings()
+        auth = hashlib.sha256(s.api_key.encode()).hexdigest()[:16] if s.api_key else "-"
+        return f"{method.upper()} {s.base_url}{path}?{urlencode(pairs)} auth={auth}"
+
+    def ttl_for(self, path: str, headers: Mapping[str, str]) -> Optional[float]:
+        """TTL para una respuesta; None si no debe guardarse (`no-store`)."""
+        cc = _parse_cache_control(headers.get("cache-control"))
+        if "no-store" in cc:
+            return None
+        if "no-cache" in cc:
+            return 0.0
+        if cc.get("max-age"):
+            try:
+                return max(0.0, float(cc["max-age"]))  # type: ignore[arg-type]
+            except ValueError:
+                pass
+        best = None
+        for prefix, ttl in self.ttls.items():
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+                best = (prefix, ttl)
+        return best[1] if best else self.ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, etag, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        status, headers, body, etag, expires_at = row
+        entry = CacheEntry(status, json.loads(headers), body, etag, expires_at)
+        if entry.fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def put(self, key: str, path: str, response: httpx.Response) -> None:
+        ttl = self.ttl_for(path, response.headers)
+        if ttl is None:
+            return
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        # Los headers de transporte no aplican a una respuesta ya decodificada
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() not in {"content-encoding", "transfer-encoding", "content-length"}
+        }
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, status, headers, body, etag, expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.status_code, json.dumps(headers), body, response.headers.get("etag"), now + ttl, now, len(body)),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key: str, path: str, response: httpx.Response) -> None:
+        """Renueva el vencimiento de una entrada tras un 304 Not Modified."""
+        ttl = self.ttl_for(path, response.headers)
+        now = time.time()
+        with self._lock:
+            if ttl is None:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            else:
+                self._conn.execute(
+                    "UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?", (now + ttl, now, key)
+                )
+            self._conn.commit()
+        self.revalidated += 1
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_key: Optional[tuple] = None
+_default_lock = threading.Lock()
+
+
+def default_ttls() -> Dict[str, float]:
+    """`DEFAULT_TTLS` con los overrides de `CSFLOAT_CACHE_TTL_SEARCH` / `_DETAIL`."""
+    s = get_settings()
+    ttls = dict(DEFAULT_TTLS)
+    if s.cache_ttl_search is not None:
+        ttls[SEARCH_PREFIX] = s.cache_ttl_search
+    if s.cache_ttl_detail is not None:
+        ttls[DETAIL_PREFIX] = s.cache_ttl_detail
+    return ttls
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Cache compartido del proceso si `CSFLOAT_CACHE_DIR` está definido; si no, None."""
+    global _default_cache, _default_key
+    s = get_settings()
+    key = (s.cache_dir, s.cache_ttl_search, s.cache_ttl_detail)
+    with _default_lock:
+        if key != _default_key:
+            if _default_cache is not None:
+                _default_cache.close()
+            _default_cache = ResponseCache(s.cache_dir, ttls=default_ttls()) if s.cache_dir else None
+            _default_key = key
+        return _default_cache
@@ -1,30 +1,92 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Optional
+import csv
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from . import endpoints as ep
-from .utils import build_query, paginate_listings, export_listings_csv
+from .cli_options import (
+    CRAWL_STRATEGY_CHOICES,
+    DEFAULT_BULK_CONCURRENCY,
+    DEFAULT_PLAN_MAX_PAGES,
+    DEFAULT_POST_CONCURRENCY,
+    DEFAULT_SKETCH_K,
+    DEFAULT_WATCH_MAX_INTERVAL,
+    DEFAULT_WATCH_MIN_INTERVAL,
+    EXPORT_FORMAT_CHOICES,
+    SORT_VALUES,
+    STAT_GROUP_CHOICES,
+    TOP_SCORE_CHOICES,
+)
+from .config import LOG_MODES
+from .console import LazyConsole
+from .metrics import get_metrics
 
+if TYPE_CHECKING:
+    from . import endpoints as ep
+    from .models import ListingsPage
+    from .planner import SeedTarget
+
+# httpx, pydantic y rich se importan dentro de cada comando: `csf --help` y el
+# arranque no los cargan (presupuesto en tests/test_import_time.py)
 app = typer.Typer(add_completion=False, help="CLI para CSFloat Market API")
-console = Console()
+console = LazyConsole()
+err_console = LazyConsole(stderr=True)
+
+
+def _print_stats() -> None:
+    from rich.table import Table
 
+    snap = get_metrics().snapshot()
+    table = Table(show_header=True, header_style="bold blue", title="Estadísticas de requests")
+    table.add_column("endpoint", style="cyan")
+    table.add_column("requests", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("status")
+    table.add_column("reintentos", justify="right")
+    for ep_name, m in snap["endpoints"].items():
+        table.add_row(
+            ep_name,
+            str(m["requests"]),
+            f"{m['latency_ms_p50']:.1f}",
+            f"{m['latency_ms_p95']:.1f}",
+            " ".join(f"{k}={v}" for k, v in m["statuses"].items()),
+            str(m["retries"]),
+        )
+    err_console.print(table)
+    err_console.print(
+        f"requests={snap['requests']} reintentos={snap['retries']} "
+        f"backoff={snap['backoff_seconds']:.2f}s rate-limit={snap['throttle_seconds']:.2f}s "
+        f"bytes={snap['bytes_received']} cache-hits={snap['cache_hits']} ítems={snap['items_parsed']}"
+    )
+
+
+@app.callback()
+def _global_options(
+    ctx: typer.Context,
+    log: Optional[str] = typer.Option(None, "--log", help="Log de requests: rich|jsonl|off (default: CSFLOAT_LOG o automático)"),
+    log_sample: Optional[float] = typer.Option(None, "--log-sample", help="Fracción de requests exitosas a loguear (0-1)"),
+    stats: bool = typer.Option(False, "--stats", help="Resumen de métricas HTTP al terminar (stderr)"),
+    metrics_file: Optional[str] = typer.Option(None, "--metrics-file", help="Guardar métricas en formato Prometheus al terminar"),
+) -> None:
+    from .http import set_log_mode
 
-SortValues = [
-    "lowest_price",
-    "highest_price",
-    "most_recent",
-    "expires_soon",
-    "lowest_float",
-    "highest_float",
-    "best_deal",
-    "highest_discount",
-    "float_rank",
-    "num_bids",
-]
+    if log is not None and log not in LOG_MODES:
+        console.print(f"[red]--log debe ser uno de: {', '.join(LOG_MODES)}[/red]")
+        raise typer.Exit(code=2)
+    set_log_mode(log, sample=log_sample)
+    if stats or metrics_file:
+        get_metrics().reset()
+    if stats:
+        ctx.call_on_close(_print_stats)
+    if metrics_file:
+        ctx.call_on_close(lambda: Path(metrics_file).write_text(get_metrics().to_prometheus(), encoding="utf-8"))
 
 
 # Helpers
@@ -44,6 +106,8 @@ def _filters_from_cli(**kwargs: Any) -> dict[str, Any]:
 
 
 def _print_listings_table(listings: List[ep.Listing]) -> None:
+    from rich.table import Table
+
     table = Table(show_header=True, header_style="bold blue")
     table.add_column("id", style="cyan")
     table.add_column("price")
@@ -68,10 +132,31 @@ def _print_listings_table(listings: List[ep.Listing]) -> None:
     console.print(table)
 
 
+class _ExportProgress:
+    """Cuenta filas/páginas de un stream de páginas para una línea de progreso."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.pages = 0
+        self.started = time.perf_counter()
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return f"filas={self.rows} páginas={self.pages} ({self.rows / elapsed:.0f} filas/s)"
+
+    def track(self, pages: Iterable[ListingsPage], status: Any = None) -> Iterator[ListingsPage]:
+        for page in pages:
+            yield page
+            self.pages += 1
+            self.rows += len(page.items)
+            if status is not None:
+                status.update(self.line())
+
+
 @app.command(name="listings:find")
 def listings_find(
     limit: Optional[int] = typer.Option(None, help="Máx 50"),
-    sort_by: Optional[str] = typer.Option(None, help=f"Orden: {', '.join(SortValues)}"),
+    sort_by: Optional[str] = typer.Option(None, help=f"Orden: {', '.join(SORT_VALUES)}"),
     cursor: Optional[str] = typer.Option(None, help="Cursor opaco para página siguiente"),
     # Filtros
     category: Optional[int] = typer.Option(None),
@@ -89,6 +174,8 @@ def listings_find(
     type: Optional[str] = typer.Option(None, help="buy_now|auction"),
     stickers: Optional[str] = typer.Option(None, help="ID|POSITION?[,ID|POSITION?...]"),
 ) -> None:
+    from . import endpoints as ep
+
     filters = _filters_from_cli(
         limit=limit,
         sort_by=sort_by,
@@ -115,9 +202,83 @@ def listings_find(
         console.print(f"[yellow]next_cursor[/yellow]: {page.next_cursor}")
 
 
+def _read_ids(path: str) -> Iterator[str]:
+    # Un id por línea; "-" lee de stdin. Se consume perezosamente
+    if path == "-":
+        yield from sys.stdin
+        return
+    with open(path, encoding="utf-8") as f:
+        yield from f
+
+
+def _bulk_listing_get(ids: Iterable[str], format: str, concurrency: int) -> None:
+    from rich.table import Table
+
+    from . import endpoints as ep
+    from .utils import CSV_HEADERS, _csv_row
+
+    ok = 0
+    errors: List[ep.ListingLookup] = []
+    rows: List[ep.Listing] = []
+    writer = csv.writer(sys.stdout) if format == "csv" else None
+    if writer is not None:
+        writer.writerow(CSV_HEADERS)
+    # Resultados en orden de finalización: se emiten apenas llegan
+    for res in ep.get_listings_by_ids(ids, concurrency=concurrency):
+        if res.listing is None:
+            errors.append(res)
+            continue
+        ok += 1
+        if format == "ndjson":
+            sys.stdout.write(res.listing.model_dump_json() + "\n")
+            sys.stdout.flush()
+        elif writer is not None:
+            writer.writerow(_csv_row(res.listing))
+            sys.stdout.flush()
+        else:
+            rows.append(res.listing)
+    if format == "table":
+        _print_listings_table(rows)
+
+    err_console.print(f"[green]OK: {ok}[/green]  [red]Errores: {len(errors)}[/red]")
+    if errors:
+        table = Table(show_header=True, header_style="bold red")
+        table.add_column("id", style="cyan")
+        table.add_column("error")
+        for res in errors:
+            table.add_row(res.id, str(res.error))
+        err_console.print(table)
+        raise typer.Exit(code=1)
+
+
 @app.command(name="listing:get")
-def listing_get(id: str = typer.Option(..., "--id", help="Listing ID")) -> None:
-    l = ep.get_listing(id)
+def listing_get(
+    ids: Optional[List[str]] = typer.Argument(None, help="IDs de listings (modo bulk)"),
+    id: Optional[str] = typer.Option(None, "--id", help="Listing ID"),
+    ids_file: Optional[str] = typer.Option(None, "--ids-file", help="Archivo con un id por línea ('-' = stdin)"),
+    format: str = typer.Option("table", "--format", help="table|ndjson|csv (modo bulk)"),
+    concurrency: int = typer.Option(DEFAULT_BULK_CONCURRENCY, "--concurrency", help="Requests simultáneas (modo bulk)"),
+) -> None:
+    from rich.table import Table
+
+    from . import endpoints as ep
+    from .http import set_default_log_mode
+
+    if format not in ("table", "ndjson", "csv"):
+        console.print("[red]--format debe ser table, ndjson o csv[/red]")
+        raise typer.Exit(code=2)
+    if id is None and not ids and ids_file is None:
+        console.print("[red]Indicá --id, uno o más IDs o --ids-file[/red]")
+        raise typer.Exit(code=2)
+    if ids or ids_file is not None or format != "table":
+        set_default_log_mode("off")
+        sources: List[Iterable[str]] = [[id] if id else [], ids or []]
+        if ids_file is not None:
+            sources.append(_read_ids(ids_file))
+        _bulk_listing_get(itertools.chain(*sources), format, concurrency)
+        return
+
+    l = ep.get_listing(id)  # type: ignore[arg-type]
     table = Table(show_header=True, header_style="bold blue")
     table.add_column("field")
     table.add_column("value")
@@ -148,6 +309,8 @@ def listing_list(
     desc: Optional[str] = typer.Option(None, help="Descripción (<=180)"),
     private: Optional[bool] = typer.Option(None),
 ) -> None:
+    from . import endpoints as ep
+
     l = ep.post_listing(
         asset_id=asset_id,
         type=type,
@@ -161,9 +324,71 @@ def listing_list(
     console.print(f"Publicado listing id={l.id} tipo={l.type} price={l.price}")
 
 
+@app.command(name="listing:list-bulk")
+def listing_list_bulk(
+    file: str = typer.Argument(..., help="CSV o JSONL con asset_id, type, price, ... (un listing por fila)"),
+    results: Optional[str] = typer.Option(None, "--results", help="Archivo de resultados (default: FILE.results.<ext>)"),
+    concurrency: int = typer.Option(DEFAULT_POST_CONCURRENCY, help="Publicaciones simultáneas"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Solo validar, sin publicar"),
+) -> None:
+    from rich.table import Table
+
+    from .bulk import (
+        BulkValidationError,
+        detect_format,
+        post_listings,
+        prepare_listing_posts,
+        read_listing_rows,
+        write_listing_results,
+    )
+    from .http import set_default_log_mode
+
+    try:
+        posts = prepare_listing_posts(read_listing_rows(file))
+    except BulkValidationError as e:
+        table = Table(title=f"{len(e.invalid)} filas inválidas (no se publicó nada)")
+        table.add_column("fila", justify="right")
+        table.add_column("asset_id")
+        table.add_column("error")
+        for post in e.invalid:
+            table.add_row(str(post.row), str(post.data.get("asset_id", "")), str(post.error))
+        console.print(table)
+        raise typer.Exit(code=2)
+    except (ValueError, OSError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=2)
+
+    skipped = sum(p.skipped for p in posts)
+    todo = len(posts) - skipped
+    if dry_run:
+        err_console.print(f"filas={len(posts)} válidas={todo} ya publicadas={skipped}")
+        return
+    set_default_log_mode("off")
+    path = Path(file)
+    out = results or str(path.with_name(f"{path.stem}.results.{detect_format(file)}"))
+    failed = 0
+    stream = post_listings(posts, concurrency=concurrency)
+    try:
+        for post in stream:
+            if post.error is not None:
+                failed += 1
+                err_console.print(f"[red]fila {post.row} asset={post.data.get('asset_id')}: {post.error}[/red]")
+            # Checkpoint por fila: si el proceso muere, lo publicado queda registrado
+            write_listing_results(posts, out)
+    finally:
+        # Ante Ctrl-C o un error inesperado: esperar las publicaciones en vuelo
+        # y registrarlas, para que re-alimentar el archivo no las duplique
+        stream.close()
+        write_listing_results(posts, out)
+    err_console.print(f"publicados={todo - failed} fallidos={failed} ya publicados={skipped} resultados={out}")
+    if failed:
+        raise typer.Exit(code=1)
+
+
 @app.command(name="listings:export")
 def listings_export(
-    out: str = typer.Option(..., "--out", help="Ruta de salida CSV"),
+    out: str = typer.Option(..., "--out", help="Ruta de salida"),
+    format: str = typer.Option("csv", "--format", help=f"Formato: {'|'.join(EXPORT_FORMAT_CHOICES)}"),
     title: Optional[str] = typer.Option(None, help="Metadata opcional"),
     limit: Optional[int] = typer.Option(None),
     sort_by: Optional[str] = typer.Option(None),
@@ -183,7 +408,15 @@ def listings_export(
     type: Optional[str] = typer.Option(None),
     stickers: Optional[str] = typer.Option(None),
     pages: Optional[int] = typer.Option(None, help="Máx páginas a recorrer"),
+    prefetch: int = typer.Option(1, help="Páginas a pedir por adelantado (0 = secuencial)"),
+    resume: bool = typer.Option(False, "--resume", help="Continuar desde el checkpoint de --out"),
 ) -> None:
+    from .exporters import APPENDABLE_FORMATS, EXPORT_FORMATS, export_pages
+    from .http import set_default_log_mode
+    from .utils import ExportCheckpoint, iter_listing_pages
+
+    # Comando bulk: sin log por request salvo que se pida (--log / CSFLOAT_LOG)
+    set_default_log_mode("off")
     filters = _filters_from_cli(
         limit=limit,
         sort_by=sort_by,
@@ -204,13 +437,569 @@ def listings_export(
         stickers=stickers,
     )
 
-    listings = list(paginate_listings(initial_filters=filters, max_pages=pages))
-    n = export_listings_csv(listings, out)
-    console.print(f"Exportadas {n} filas a {out}")
+    if format not in EXPORT_FORMATS:
+        console.print(f"[red]Formato inválido: {format}. Opciones: {', '.join(EXPORT_FORMATS)}[/red]")
+        raise typer.Exit(code=1)
+    appendable = format in APPENDABLE_FORMATS
+    if resume and not appendable:
+        console.print(f"[red]--resume no está disponible para el formato {format}[/red]")
+        raise typer.Exit(code=1)
+
+    ckpt_path = ExportCheckpoint.path_for(out)
+    checkpoint = ExportCheckpoint(filters=filters, format=format)
+    if resume:
+        saved = ExportCheckpoint.load(ckpt_path)
+        if saved is None:
+            console.print(f"[red]No hay checkpoint para reanudar en {ckpt_path}[/red]")
+            raise typer.Exit(code=1)
+        if not saved.matches(filters):
+            console.print("[red]Los filtros no coinciden con los del checkpoint; no se puede reanudar[/red]")
+            raise typer.Exit(code=1)
+        if saved.format != format:
+            console.print(
+                f"[red]El checkpoint es de un export {saved.format}; reanudá con --format {saved.format} "
+                f"(o exportá de nuevo sin --resume)[/red]"
+            )
+            raise typer.Exit(code=1)
+        checkpoint = saved
+        if checkpoint.cursor is None:
+            # La corrida anterior ya había consumido todas las páginas
+            ckpt_path.unlink()
+            console.print(f"Export ya completo: {checkpoint.rows} filas en {out}")
+            return
+        if pages is not None:
+            # --pages cuenta el total entre corridas
+            pages -= checkpoint.pages
+            if pages <= 0:
+                console.print(f"Límite de páginas ya alcanzado: {checkpoint.rows} filas en {out}")
+                return
+        filters = dict(filters, cursor=checkpoint.cursor)
+        console.print(f"Reanudando desde página {checkpoint.pages + 1} ({checkpoint.rows} filas ya exportadas)")
+
+    progress = _ExportProgress()
+    stream = iter_listing_pages(initial_filters=filters, max_pages=pages, prefetch=prefetch)
+    try:
+        with console.status(progress.line()) as status:
+            n = export_pages(
+                progress.track(stream, status),
+                out,
+                format=format,
+                checkpoint=checkpoint if appendable else None,
+                checkpoint_path=ckpt_path,
+            )
+    except ImportError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1)
+    if appendable and checkpoint.cursor is None:
+        # Sin páginas pendientes: el checkpoint ya no sirve
+        ckpt_path.unlink(missing_ok=True)
+    console.print(f"Exportadas {n} filas a {out} — {progress.line()}")
     if title:
         console.print(f"Título: {title}")
 
 
+@app.command(name="listings:crawl")
+def listings_crawl(
+    out: str = typer.Option(..., "--out", help="Ruta de salida"),
+    format: str = typer.Option("csv", "--format", help=f"Formato: {'|'.join(EXPORT_FORMAT_CHOICES)}"),
+    by: str = typer.Option("price", "--by", help=f"Partición: {'|'.join(CRAWL_STRATEGY_CHOICES)}"),
+    shards: int = typer.Option(8, help="Particiones iniciales (price/float)"),
+    concurrency: int = typer.Option(4, help="Particiones con request en vuelo a la vez"),
+    split_after: int = typer.Option(4, help="Páginas de una partición antes de dividirla"),
+    max_listings: Optional[int] = typer.Option(None, help="Cortar tras N listings únicos"),
+    category: Optional[int] = typer.Option(None),
+    def_index: List[int] = typer.Option([]),
+    min_float: Optional[float] = typer.Option(None),
+    max_float: Optional[float] = typer.Option(None),
+    rarity: Optional[int] = typer.Option(None),
+    paint_seed: Optional[int] = typer.Option(None),
+    paint_index: Optional[int] = typer.Option(None),
+    user_id: Optional[str] = typer.Option(None),
+    collection: Optional[str] = typer.Option(None),
+    min_price: Optional[int] = typer.Option(None),
+    max_price: Optional[int] = typer.Option(None),
+    market_hash_name: Optional[str] = typer.Option(None),
+    type: Optional[str] = typer.Option(None),
+    stickers: Optional[str] = typer.Option(None),
+) -> None:
+    from .crawl import ShardedCrawler
+    from .exporters import EXPORT_FORMATS, export_pages
+    from .http import set_default_log_mode
+
+    # Comando bulk: sin log por request salvo que se pida (--log / CSFLOAT_LOG)
+    set_default_log_mode("off")
+    filters = _filters_from_cli(
+        category=category,
+        def_index=def_index,
+        min_float=min_float,
+        max_float=max_float,
+        rarity=rarity,
+        paint_seed=paint_seed,
+        paint_index=paint_index,
+        user_id=user_id,
+        collection=collection,
+        min_price=min_price,
+        max_price=max_price,
+        market_hash_name=market_hash_name,
+        type=type,
+        stickers=stickers,
+    )
+    if format not in EXPORT_FORMATS:
+        console.print(f"[red]Formato inválido: {format}. Opciones: {', '.join(EXPORT_FORMATS)}[/red]")
+        raise typer.Exit(code=1)
+    try:
+        crawler = ShardedCrawler(
+            filters,
+            by=by,
+            shards=shards,
+            concurrency=concurrency,
+            split_after=split_after,
+            max_listings=max_listings,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1)
+
+    progress = _ExportProgress()
+    try:
+        with console.status(progress.line()) as status:
+            n = export_pages(progress.track(crawler.pages(), status), out, format=format)
+    except ImportError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1)
+    st = crawler.stats
+    console.print(
+        f"Exportados {n} listings únicos a {out} — particiones={st.partitions} divisiones={st.splits} "
+        f"páginas={st.pages} duplicados={st.duplicates}"
+    )
+
+
+@app.command(name="listings:watch")
+def listings_watch(
+    min_interval: float = typer.Option(DEFAULT_WATCH_MIN_INTERVAL, help="Segundos mínimos entre ciclos"),
+    max_interval: float = typer.Option(DEFAULT_WATCH_MAX_INTERVAL, help="Segundos máximos entre ciclos"),
+    prices: bool = typer.Option(False, "--prices", help="Emitir también cambios de precio"),
+    emit_initial: bool = typer.Option(False, "--emit-initial", help="Emitir los listings del primer ciclo"),
+    max_cycles: Optional[int] = typer.Option(None, help="Terminar tras N ciclos"),
+    limit: Optional[int] = typer.Option(None, help="Listings por página (máx 50)"),
+    category: Optional[int] = typer.Option(None),
+    def_index: List[int] = typer.Option([]),
+    min_float: Optional[float] = typer.Option(None),
+    max_float: Optional[float] = typer.Option(None),
+    rarity: Optional[int] = typer.Option(None),
+    paint_seed: Optional[int] = typer.Option(None),
+    paint_index: Optional[int] = typer.Option(None),
+    user_id: Optional[str] = typer.Option(None),
+    collection: Optional[str] = typer.Option(None),
+    min_price: Optional[int] = typer.Option(None),
+    max_price: Optional[int] = typer.Option(None),
+    market_hash_name: Optional[str] = typer.Option(None),
+    type: Optional[str] = typer.Option(None),
+    stickers: Optional[str] = typer.Option(None),
+) -> None:
+    from .http import set_default_log_mode
+    from .watch import ListingWatcher
+
+    # stdout es el feed NDJSON: sin log por request salvo que se pida
+    set_default_log_mode("off")
+    filters = _filters_from_cli(
+        limit=limit,
+        category=category,
+        def_index=def_index,
+        min_float=min_float,
+        max_float=max_float,
+        rarity=rarity,
+        paint_seed=paint_seed,
+        paint_index=paint_index,
+        user_id=user_id,
+        collection=collection,
+        min_price=min_price,
+        max_price=max_price,
+        market_hash_name=market_hash_name,
+        type=type,
+        stickers=stickers,
+    )
+    watcher = ListingWatcher(
+        filters,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        emit_initial=emit_initial,
+        track_prices=prices,
+        on_error=lambda e: err_console.print(f"[red]{e}; reintentando en {watcher.interval:g}s[/red]"),
+    )
+    emitted = 0
+    try:
+        for event in watcher.run(max_cycles=max_cycles):
+            sys.stdout.write(event.to_json() + "\n")
+            sys.stdout.flush()
+            emitted += 1
+    except KeyboardInterrupt:
+        pass
+    err_console.print(f"ciclos={watcher.cycles} requests={watcher.requests} eventos={emitted} errores={watcher.errors}")
+
+
+def _read_targets(path: str) -> List[SeedTarget]:
+    from .planner import SeedTarget
+
+    # Lista JSON de objetos o JSONL (un objeto por línea)
+    text = Path(path).read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        rows = json.loads(text)
+    else:
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [SeedTarget.from_dict(r) for r in rows]
+
+
+@app.command(name="listings:seeds")
+def listings_seeds(
+    target: List[str] = typer.Option([], "--target", help="DEF:PAINT[:SEEDS[:MIN-MAX]], p. ej. 7:44:661,670:0-0.2. Puede repetirse"),
+    targets_file: Optional[str] = typer.Option(None, "--targets-file", help="JSON/JSONL con def_index, paint_index, seeds, min_float, max_float, name"),
+    format: str = typer.Option("table", "--format", help="table|ndjson"),
+    concurrency: int = typer.Option(4, help="Consultas simultáneas"),
+    max_pages: int = typer.Option(DEFAULT_PLAN_MAX_PAGES, help="Páginas máximas por consulta"),
+    scan_over: Optional[int] = typer.Option(None, help="Recorrer el skin entero si un target tiene más de N seeds"),
+    category: Optional[int] = typer.Option(None),
+    min_price: Optional[int] = typer.Option(None),
+    max_price: Optional[int] = typer.Option(None),
+    type: Optional[str] = typer.Option(None),
+) -> None:
+    from .http import set_default_log_mode
+    from .planner import SeedTarget, run_plan
+
+    if format not in ("table", "ndjson"):
+        console.print("[red]--format debe ser table o ndjson[/red]")
+        raise typer.Exit(code=2)
+    try:
+        targets = [SeedTarget.parse(t) for t in target]
+        if targets_file is not None:
+            targets.extend(_read_targets(targets_file))
+    except (ValueError, KeyError, OSError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=2)
+    if not targets:
+        console.print("[red]Indicá al menos un --target o --targets-file[/red]")
+        raise typer.Exit(code=2)
+    set_default_log_mode("off")
+    extra = _filters_from_cli(category=category, min_price=min_price, max_price=max_price, type=type)
+    result = run_plan(targets, concurrency=concurrency, max_pages=max_pages, scan_over=scan_over, extra_filters=extra)
+
+    for i, t in enumerate(targets):
+        matches = result.matches.get(i, [])
+        if format == "ndjson":
+            for l in matches:
+                sys.stdout.write(json.dumps({"target": t.label, "listing": json.loads(l.model_dump_json())}) + "\n")
+            continue
+        console.print(f"[bold]{t.label}[/bold] — {len(matches)} coincidencias")
+        if matches:
+            _print_listings_table(matches)
+    err_console.print(
+        f"consultas={len(result.queries)} requests={result.requests} "
+        f"(ingenuo={result.naive_requests}, ahorradas={result.saved})"
+    )
+    if result.truncated:
+        err_console.print(f"[yellow]{result.truncated} consultas cortadas en --max-pages={max_pages}[/yellow]")
+
+
+def _fmt_score(score: str, value: float) -> str:
+    if score == "discount":
+        return f"{value:.1%}"
+    if score == "price_per_float":
+        return f"{-value:.0f}"
+    return f"{value:.0f}"
+
+
+@app.command(name="listings:top")
+def listings_top(
+    k: int = typer.Option(10, "--k", help="Cantidad de listings a conservar"),
+    score: str = typer.Option("discount", "--score", help=f"Score: {'|'.join(TOP_SCORE_CHOICES)}"),
+    pages: Optional[int] = typer.Option(None, help="Máx páginas a recorrer"),
+    prefetch: int = typer.Option(1, help="Páginas a pedir por adelantado (0 = secuencial)"),
+    limit: Optional[int] = typer.Option(None),
+    sort_by: Optional[str] = typer.Option(None),
+    category: Optional[int] = typer.Option(None),
+    def_index: List[int] = typer.Option([]),
+    min_float: Optional[float] = typer.Option(None),
+    max_float: Optional[float] = typer.Option(None),
+    rarity: Optional[int] = typer.Option(None),
+    paint_seed: Optional[int] = typer.Option(None),
+    paint_index: Optional[int] = typer.Option(None),
+    user_id: Optional[str] = typer.Option(None),
+    collection: Optional[str] = typer.Option(None),
+    min_price: Optional[int] = typer.Option(None),
+    max_price: Optional[int] = typer.Option(None),
+    market_hash_name: Optional[str] = typer.Option(None),
+    type: Optional[str] = typer.Option(None),
+    stickers: Optional[str] = typer.Option(None),
+) -> None:
+    from rich.table import Table
+
+    from .http import set_default_log_mode
+    from .utils import TopK, iter_listing_pages
+
+    set_default_log_mode("off")
+    filters = _filters_from_cli(
+        limit=limit,
+        sort_by=sort_by,
+        category=category,
+        def_index=def_index,
+        min_float=min_float,
+        max_float=max_float,
+        rarity=rarity,
+        paint_seed=paint_seed,
+        paint_index=paint_index,
+        user_id=user_id,
+        collection=collection,
+        min_price=min_price,
+        max_price=max_price,
+        market_hash_name=market_hash_name,
+        type=type,
+        stickers=stickers,
+    )
+    try:
+        top = TopK(k, score)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=2)
+
+    progress = _ExportProgress()
+    leader: Optional[str] = None
+    stream = iter_listing_pages(initial_filters=filters, max_pages=pages, prefetch=prefetch)
+    with console.status(progress.line()) as status:
+        for page in progress.track(stream):
+            for l in page.items:
+                top.push(l)
+            best = top.leaders()[:1]
+            if best and best[0][1].id != leader:
+                value, l = best[0]
+                leader = l.id
+                # Líder parcial en stderr: stdout queda solo con la tabla final
+                err_console.print(
+                    f"[cyan]página {progress.pages + 1}[/cyan] líder {l.id} "
+                    f"{_fmt_score(score, value)} {l.item.market_hash_name or ''} price={l.price}"
+                )
+            status.update(f"{progress.line()} en top={len(top)}/{k}")
+
+    table = Table(show_header=True, header_style="bold blue", title=f"Top {k} por {score}")
+    table.add_column("#", justify="right")
+    table.add_column("score", justify="right")
+    table.add_column("id", style="cyan")
+    table.add_column("price")
+    table.add_column("float")
+    table.add_column("name")
+    for rank, (value, l) in enumerate(top.leaders(), 1):
+        table.add_row(
+            str(rank),
+            _fmt_score(score, value),
+            l.id,
+            str(l.price or ""),
+            f"{l.item.float_value:.6f}" if l.item.float_value is not None else "",
+            l.item.market_hash_name or "",
+        )
+    console.print(table)
+    err_console.print(f"Recorridos {top.seen} listings ({top.scored} con score) en {progress.pages} páginas")
+
+
+@app.command(name="listings:stats")
+def listings_stats(
+    by: List[str] = typer.Option(["market_hash_name"], "--by", help=f"Agrupar por: {'|'.join(STAT_GROUP_CHOICES)}. Puede repetirse"),
+    out: Optional[str] = typer.Option(None, "--out", help="Guardar las estadísticas (JSON mergeable)"),
+    merge: List[str] = typer.Option([], "--merge", help="Unir estadísticas guardadas. Puede repetirse"),
+    offline: bool = typer.Option(False, "--offline", help="No consultar la API: solo unir --merge"),
+    format: str = typer.Option("table", "--format", help="table|json|csv"),
+    max_groups: int = typer.Option(50, help="Grupos a mostrar en la tabla (los de más listings)"),
+    k: int = typer.Option(DEFAULT_SKETCH_K, "--k", help="Precisión del sketch (error ~1.7/k)"),
+    pages: Optional[int] = typer.Option(None, help="Máx páginas a recorrer"),
+    prefetch: int = typer.Option(1, help="Páginas a pedir por adelantado (0 = secuencial)"),
+    limit: Optional[int] = typer.Option(None),
+    category: Optional[int] = typer.Option(None),
+    def_index: List[int] = typer.Option([]),
+    min_float: Optional[float] = typer.Option(None),
+    max_float: Optional[float] = typer.Option(None),
+    rarity: Optional[int] = typer.Option(None),
+    paint_seed: Optional[int] = typer.Option(None),
+    paint_index: Optional[int] = typer.Option(None),
+    user_id: Optional[str] = typer.Option(None),
+    collection: Optional[str] = typer.Option(None),
+    min_price: Optional[int] = typer.Option(None),
+    max_price: Optional[int] = typer.Option(None),
+    market_hash_name: Optional[str] = typer.Option(None),
+    type: Optional[str] = typer.Option(None),
+    stickers: Optional[str] = typer.Option(None),
+) -> None:
+    from rich.table import Table
+
+    from .http import set_default_log_mode
+    from .sketch import PriceStatsAggregator
+    from .utils import iter_listing_pages
+
+    if format not in ("table", "json", "csv"):
+        console.print("[red]--format debe ser table, json o csv[/red]")
+        raise typer.Exit(code=2)
+    set_default_log_mode("off")
+    try:
+        agg = PriceStatsAggregator(by, k=k)
+        for path in merge:
+            agg.merge(PriceStatsAggregator.load(path))
+    except (ValueError, KeyError, OSError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=2)
+
+    if not offline:
+        filters = _filters_from_cli(
+            limit=limit,
+            category=category,
+            def_index=def_index,
+            min_float=min_float,
+            max_float=max_float,
+            rarity=rarity,
+            paint_seed=paint_seed,
+            paint_index=paint_index,
+            user_id=user_id,
+            collection=collection,
+            min_price=min_price,
+            max_price=max_price,
+            market_hash_name=market_hash_name,
+            type=type,
+            stickers=stickers,
+        )
+        progress = _ExportProgress()
+        stream = iter_listing_pages(initial_filters=filters, max_pages=pages, prefetch=prefetch)
+        with err_console.status(progress.line()) as status:
+            for page in progress.track(stream, status):
+                agg.update(page.items)
+    if out is not None:
+        agg.save(out)
+
+    rows = agg.summaries()
+    if format == "json":
+        sys.stdout.write(json.dumps(rows, ensure_ascii=False) + "\n")
+    elif format == "csv":
+        columns = [*agg.by, "count", "min", "p10", "p50", "p90", "max", "mean"]
+        writer = csv.DictWriter(sys.stdout, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        table = Table(show_header=True, header_style="bold blue", title="Precios por grupo (centavos)")
+        for b in agg.by:
+            table.add_column(b, style="cyan")
+        for col in ("count", "min", "p10", "p50", "p90", "max"):
+            table.add_column(col, justify="right")
+        for row in rows[:max_groups]:
+            table.add_row(*[str(row[b]) for b in agg.by], str(row["count"]), *[f"{row[c]:.0f}" for c in ("min", "p10", "p50", "p90", "max")])
+        console.print(table)
+    err_console.print(f"grupos={len(agg.groups)} listings={agg.listings} sin_precio={agg.skipped}" + (f" guardado en {out}" if out else ""))
+
+
+@app.command(name="listings:sync")
+def listings_sync(
+    db: str = typer.Option(..., "--db", help="Ruta de la base SQLite"),
+    limit: Optional[int] = typer.Option(None),
+    sort_by: Optional[str] = typer.Option(None),
+    cursor: Optional[str] = typer.Option(None),
+    category: Optional[int] = typer.Option(None),
+    def_index: List[int] = typer.Option([]),
+    min_float: Optional[float] = typer.Option(None),
+    max_float: Optional[float] = typer.Option(None),
+    rarity: Optional[int] = typer.Option(None),
+    paint_seed: Optional[int] = typer.Option(None),
+    paint_index: Optional[int] = typer.Option(None),
+    user_id: Optional[str] = typer.Option(None),
+    collection: Optional[str] = typer.Option(None),
+    min_price: Optional[int] = typer.Option(None),
+    max_price: Optional[int] = typer.Option(None),
+    market_hash_name: Optional[str] = typer.Option(None),
+    type: Optional[str] = typer.Option(None),
+    stickers: Optional[str] = typer.Option(None),
+    pages: Optional[int] = typer.Option(None, help="Máx páginas a recorrer"),
+    prefetch: int = typer.Option(1, help="Páginas a pedir por adelantado (0 = secuencial)"),
+) -> None:
+    from .http import set_default_log_mode
+    from .store import MarketStore
+    from .utils import iter_listing_pages
+
+    # Comando bulk: sin log por request salvo que se pida (--log / CSFLOAT_LOG)
+    set_default_log_mode("off")
+    filters = _filters_from_cli(
+        limit=limit,
+        sort_by=sort_by,
+        cursor=cursor,
+        category=category,
+        def_index=def_index,
+        min_float=min_float,
+        max_float=max_float,
+        rarity=rarity,
+        paint_seed=paint_seed,
+        paint_index=paint_index,
+        user_id=user_id,
+        collection=collection,
+        min_price=min_price,
+        max_price=max_price,
+        market_hash_name=market_hash_name,
+        type=type,
+        stickers=stickers,
+    )
+
+    progress = _ExportProgress()
+    stream = iter_listing_pages(initial_filters=filters, max_pages=pages, prefetch=prefetch)
+    with MarketStore(db) as store, console.status(progress.line()) as status:
+        for page in progress.track(stream, status):
+            store.upsert_listings(page.items)
+        total = store.count()
+    console.print(f"Sincronizadas {progress.rows} filas en {db} (total en base: {total}) — {progress.line()}")
+
+
+@app.command(name="listings:query")
+def listings_query(
+    db: str = typer.Option(..., "--db", help="Ruta de la base SQLite"),
+    limit: Optional[int] = typer.Option(None, help="Default 50"),
+    sort_by: Optional[str] = typer.Option(None, help=f"Orden: {', '.join(SORT_VALUES)}"),
+    category: Optional[int] = typer.Option(None),
+    def_index: List[int] = typer.Option([], help="Puede repetirse"),
+    min_float: Optional[float] = typer.Option(None),
+    max_float: Optional[float] = typer.Option(None),
+    rarity: Optional[int] = typer.Option(None),
+    paint_seed: Optional[int] = typer.Option(None),
+    paint_index: Optional[int] = typer.Option(None),
+    user_id: Optional[str] = typer.Option(None),
+    collection: Optional[str] = typer.Option(None),
+    min_price: Optional[int] = typer.Option(None, help="Centavos"),
+    max_price: Optional[int] = typer.Option(None, help="Centavos"),
+    market_hash_name: Optional[str] = typer.Option(None),
+    type: Optional[str] = typer.Option(None, help="buy_now|auction"),
+    stickers: Optional[str] = typer.Option(None, help="ID|POSITION?[,ID|POSITION?...]"),
+) -> None:
+    from .store import MarketStore
+
+    filters = _filters_from_cli(
+        limit=limit,
+        sort_by=sort_by,
+        category=category,
+        def_index=def_index,
+        min_float=min_float,
+        max_float=max_float,
+        rarity=rarity,
+        paint_seed=paint_seed,
+        paint_index=paint_index,
+        user_id=user_id,
+        collection=collection,
+        min_price=min_price,
+        max_price=max_price,
+        market_hash_name=market_hash_name,
+        type=type,
+        stickers=stickers,
+    )
+
+    start = time.perf_counter()
+    try:
+        with MarketStore(db) as store:
+            listings = store.query(**filters)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1)
+    _print_listings_table(listings)
+    console.print(f"{len(listings)} resultados en {(time.perf_counter() - start) * 1000:.1f}ms (offline)")
+
+
 def main() -> None:
     app()
 
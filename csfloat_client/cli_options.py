@@ -0,0 +1,38 @@
+"""Metadata liviana de las opciones del CLI: defaults y valores para `--help`.
+
+`cli.py` declara sus comandos con estos valores sin importar los módulos que
+implementan cada comando (y con ellos httpx/pydantic/rich), así `csf --help`
+arranca rápido. Son los defaults *del CLI*: cada comando los pasa explícitos a
+la API de Python, cuyos defaults viven en su propio módulo. Las listas de
+opciones solo se usan en los textos de ayuda; la validación la hace el módulo
+dueño (`exporters.EXPORT_FORMATS`, `crawl.CRAWL_STRATEGIES`, ...). La excepción
+es `SORT_VALUES`: el orden lo resuelve el servidor, así que esta lista es la
+fuente (también la usa `fakeserver`).
+"""
+from __future__ import annotations
+
+# Defaults de opciones
+DEFAULT_BULK_CONCURRENCY = 8  # listing:get con muchos IDs
+DEFAULT_POST_CONCURRENCY = 4  # listing:list-bulk
+DEFAULT_WATCH_MIN_INTERVAL = 2.0  # listings:watch
+DEFAULT_WATCH_MAX_INTERVAL = 60.0
+DEFAULT_PLAN_MAX_PAGES = 5  # listings:seeds
+DEFAULT_SKETCH_K = 200  # listings:stats
+
+# Valores mostrados en --help
+SORT_VALUES = (
+    "lowest_price",
+    "highest_price",
+    "most_recent",
+    "expires_soon",
+    "lowest_float",
+    "highest_float",
+    "best_deal",
+    "highest_discount",
+    "float_rank",
+    "num_bids",
+)
+EXPORT_FORMAT_CHOICES = ("csv", "ndjson", "parquet", "arrow")
+CRAWL_STRATEGY_CHOICES = ("price", "float", "def_index")
+TOP_SCORE_CHOICES = ("discount", "price_per_float", "sticker_value")
+STAT_GROUP_CHOICES = ("market_hash_name", "item_name", "wear", "def_index", "paint_index")
@@ -0,0 +1,275 @@
+"""Representación compacta de listings para colecciones grandes.
+
+Un `Listing` de pydantic ocupa varios KB: modelos anidados (`Item`, `Seller`,
+`SellerStats`, `Sticker`, `SCM`) con su `__dict__` cada uno, y las mismas
+cadenas (vendedor, colección, `market_hash_name`, avatar) repetidas en cada
+listing. `CompactListing` es un registro plano con `__slots__` y `CompactPool`
+guarda las partes compartidas una sola vez:
+
+- cadenas repetidas internadas (nombres, colección, estado, wear, iconos),
+- un `CompactSeller` por `steam_id`, compartido por todos sus listings,
+- un `StickerInfo` por `stickerId`; cada listing guarda solo `(id, slot, wear)`.
+
+Se construye directo desde los dicts crudos del API, sin pasar por pydantic:
+
+    pool = CompactPool()
+    for l in paginate_listings(initial_filters=..., compact=pool):
+        ...
+
+Se descartan campos de presentación poco usados (descripción, `d_param`,
+badges, `auction_details`, ...). `to_listing()` reconstruye un `Listing` con los
+campos retenidos para reutilizar funciones que esperan el modelo completo.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .models import Listing
+
+# (stickerId, slot, wear)
+StickerRef = Tuple[int, int, Optional[float]]
+
+
+class CompactSeller:
+    __slots__ = (
+        "steam_id",
+        "username",
+        "avatar",
+        "flags",
+        "online",
+        "stall_public",
+        "obfuscated_id",
+        "median_trade_time",
+        "total_trades",
+        "total_verified_trades",
+        "total_failed_trades",
+    )
+
+    def __init__(self, **fields: Any) -> None:
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+class StickerInfo:
+    __slots__ = ("sticker_id", "name", "icon_url", "scm_price", "scm_volume")
+
+    def __init__(self, sticker_id: int, name: Optional[str], icon_url: Optional[str], scm_price: Optional[int], scm_volume: Optional[int]) -> None:
+        self.sticker_id = sticker_id
+        self.name = name
+        self.icon_url = icon_url
+        self.scm_price = scm_price
+        self.scm_volume = scm_volume
+
+
+class CompactListing:
+    """Listing plano con `__slots__`; `seller` es compartido y `stickers` son referencias."""
+
+    __slots__ = (
+        "id",
+        "created_ts",
+        "type",
+        "price",
+        "state",
+        "seller",
+        "asset_id",
+        "def_index",
+        "paint_index",
+        "paint_seed",
+        "float_value",
+        "rarity",
+        "quality",
+        "is_stattrak",
+        "is_souvenir",
+        "market_hash_name",
+        "item_name",
+        "wear_name",
+        "collection",
+        "icon_url",
+        "inspect_link",
+        "stickers",
+        "scm_price",
+        "scm_volume",
+        "watchers",
+        "min_offer_price",
+        "max_offer_discount",
+    )
+
+    def __init__(self, **fields: Any) -> None:
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_ts, timezone.utc)
+
+    def __repr__(self) -> str:
+        return f"CompactListing(id={self.id!r}, price={self.price!r}, market_hash_name={self.market_hash_name!r})"
+
+
+def _parse_ts(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    # El API usa ISO 8601 con "Z" y microsegundos
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+class CompactPool:
+    """Tablas compartidas entre `CompactListing`: cadenas, vendedores y stickers.
+
+    Cuando un vendedor reaparece se actualizan sus campos en el objeto
+    compartido, así que todos sus listings ven el último estado conocido.
+    Los vendedores sin `steam_id` ni `obfuscated_id` no se comparten.
+    """
+
+    def __init__(self) -> None:
+        self.sellers: Dict[str, CompactSeller] = {}
+        self.stickers: Dict[int, StickerInfo] = {}
+        self._strings: Dict[str, str] = {}
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def seller(self, data: Mapping[str, Any]) -> CompactSeller:
+        stats = data.get("statistics") or {}
+        fields = {
+            "steam_id": self.intern(data.get("steam_id")),
+            "username": self.intern(data.get("username")),
+            "avatar": self.intern(data.get("avatar")),
+            "flags": data.get("flags"),
+            "online": data.get("online"),
+            "stall_public": data.get("stall_public"),
+            "obfuscated_id": self.intern(data.get("obfuscated_id")),
+            "median_trade_time": stats.get("median_trade_time"),
+            "total_trades": stats.get("total_trades"),
+            "total_verified_trades": stats.get("total_verified_trades"),
+            "total_failed_trades": stats.get("total_failed_trades"),
+        }
+        key = fields["steam_id"] or fields["obfuscated_id"]
+        if not key:
+            return CompactSeller(**fields)
+        s = self.sellers.get(key)
+        if s is None:
+            s = self.sellers[key] = CompactSeller(**fields)
+        else:
+            for name, value in fields.items():
+                setattr(s, name, value)
+        return s
+
+    def _sticker_refs(self, stickers: Iterable[Mapping[str, Any]]) -> Tuple[StickerRef, ...]:
+        refs: List[StickerRef] = []
+        for st in stickers:
+            sid = int(st["stickerId"])
+            if sid not in self.stickers:
+                scm = st.get("scm") or {}
+                self.stickers[sid] = StickerInfo(
+                    sid, self.intern(st.get("name")), self.intern(st.get("icon_url")), scm.get("price"), scm.get("volume")
+                )
+            refs.append((sid, int(st["slot"]), st.get("wear")))
+        return tuple(refs)
+
+    def listing(self, data: Mapping[str, Any]) -> CompactListing:
+        """`CompactListing` desde el dict crudo de un listing del API."""
+        item = data["item"]
+        scm = item.get("scm") or {}
+        return CompactListing(
+            id=data["id"],
+            created_ts=_parse_ts(data["created_at"]),
+            type=self.intern(data["type"]),
+            price=data.get("price"),
+            state=self.intern(data.get("state")),
+            seller=self.seller(data.get("seller") or {}),
+            asset_id=item["asset_id"],
+            def_index=item["def_index"],
+            paint_index=item.get("paint_index"),
+            paint_seed=item.get("paint_seed"),
+            float_value=item.get("float_value"),
+            rarity=item.get("rarity"),
+            quality=item.get("quality"),
+            is_stattrak=item.get("is_stattrak"),
+            is_souvenir=item.get("is_souvenir"),
+            market_hash_name=self.intern(item.get("market_hash_name")),
+            item_name=self.intern(item.get("item_name")),
+            wear_name=self.intern(item.get("wear_name")),
+            collection=self.intern(item.get("collection")),
+            icon_url=self.intern(item.get("icon_url")),
+            inspect_link=item.get("inspect_link"),
+            stickers=self._sticker_refs(item.get("stickers") or ()),
+            scm_price=scm.get("price"),
+            scm_volume=scm.get("volume"),
+            watchers=data.get("watchers"),
+            min_offer_price=data.get("min_offer_price"),
+            max_offer_discount=data.get("max_offer_discount"),
+        )
+
+    def from_model(self, l: Listing) -> CompactListing:
+        """`CompactListing` desde un `Listing` ya validado."""
+        return self.listing(l.model_dump(exclude_none=True))
+
+    def to_listing(self, c: CompactListing) -> Listing:
+        """Reconstruye un `Listing` con los campos retenidos."""
+        s = c.seller
+        stickers = []
+        for sid, slot, wear in c.stickers:
+            info = self.stickers[sid]
+            stickers.append(
+                {
+                    "stickerId": sid,
+                    "slot": slot,
+                    "wear": wear,
+                    "name": info.name,
+                    "icon_url": info.icon_url,
+                    "scm": {"price": info.scm_price, "volume": info.scm_volume},
+                }
+            )
+        return Listing.model_validate(
+            {
+                "id": c.id,
+                "created_at": c.created_at,
+                "type": c.type,
+                "price": c.price,
+                "state": c.state,
+                "seller": {
+                    "steam_id": s.steam_id,
+                    "username": s.username,
+                    "avatar": s.avatar,
+                    "flags": s.flags,
+                    "online": s.online,
+                    "stall_public": s.stall_public,
+                    "obfuscated_id": s.obfuscated_id,
+                    "statistics": {
+                        "median_trade_time": s.median_trade_time,
+                        "total_trades": s.total_trades,
+                        "total_verified_trades": s.total_verified_trades,
+                        "total_failed_trades": s.total_failed_trades,
+                    },
+                },
+                "item": {
+                    "asset_id": c.asset_id,
+                    "def_index": c.def_index,
+                    "paint_index": c.paint_index,
+                    "paint_seed": c.paint_seed,
+                    "float_value": c.float_value,
+                    "rarity": c.rarity,
+                    "quality": c.quality,
+                    "is_stattrak": c.is_stattrak,
+                    "is_souvenir": c.is_souvenir,
+                    "market_hash_name": c.market_hash_name,
+                    "item_name": c.item_name,
+                    "wear_name": c.wear_name,
+                    "collection": c.collection,
+                    "icon_url": c.icon_url,
+                    "inspect_link": c.inspect_link,
+                    "stickers": stickers,
+                    "scm": {"price": c.scm_price, "volume": c.scm_volume},
+                },
+                "watchers": c.watchers,
+                "min_offer_price": c.min_offer_price,
+                "max_offer_discount": c.max_offer_discount,
+            }
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {"sellers": len(self.sellers), "stickers": len(self.stickers), "strings": len(self._strings)}
@@ -6,13 +6,22 @@ from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse
 
-from dotenv import load_dotenv
+DEFAULT_ENTITY_TTL = 30.0  # segundos que un listing activo vive en el identity map
+LOG_MODES = ("rich", "jsonl", "off")
 
 
 @dataclass(frozen=True)
 class Settings:
     base_url: str
     api_key: Optional[str]
+    rate_limit: Optional[float] = None  # req/s iniciales; None = se activa ante un 429, 0 = off
+    rate_limit_file: Optional[str] = None
+    cache_dir: Optional[str] = None
+    cache_ttl_search: Optional[float] = None  # None = cache.DEFAULT_TTLS
+    cache_ttl_detail: Optional[float] = None
+    entity_ttl: float = DEFAULT_ENTITY_TTL
+    log_mode: Optional[str] = None  # None = automático (ver http._log_mode)
+    log_sample: float = 1.0
 
 
 def _validate_base_url(url: str) -> str:
@@ -24,16 +33,77 @@ def _validate_base_url(url: str) -> str:
     return url.rstrip("/")
 
 
+def _parse_rate_limit(raw: Optional[str]) -> Optional[float]:
+    if raw is None or raw.strip() == "" or raw.strip().lower() == "auto":
+        return None
+    if raw.strip().lower() in {"off", "none"}:
+        return 0.0
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValueError(f"CSFLOAT_RATE_LIMIT debe ser un número (req/s), 'auto' u 'off'. Valor recibido: {raw}")
+    return max(value, 0.0)
+
+
+def _parse_seconds(name: str) -> Optional[float]:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return None
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        raise ValueError(f"{name} debe ser un número de segundos. Valor recibido: {raw}")
+
+
+def _parse_log_mode(raw: Optional[str]) -> Optional[str]:
+    if raw is None or raw.strip() == "" or raw.strip().lower() == "auto":
+        return None
+    mode = raw.strip().lower()
+    if mode not in LOG_MODES:
+        raise ValueError(f"CSFLOAT_LOG debe ser rich, jsonl, off o auto. Valor recibido: {raw}")
+    return mode
+
+
+def _parse_log_sample(raw: Optional[str]) -> float:
+    if raw is None or raw.strip() == "":
+        return 1.0
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValueError(f"CSFLOAT_LOG_SAMPLE debe ser un número entre 0 y 1. Valor recibido: {raw}")
+    return min(max(value, 0.0), 1.0)
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Carga variables desde .env y entorno, con defaults seguros."""
     # Cargar .env si existe, salvo que se pida ignorarlo (útil en tests)
     if os.getenv("CSFLOAT_IGNORE_DOTENV") != "1":
+        from dotenv import load_dotenv
+
         load_dotenv(override=False)
 
     base = os.getenv("CSFLOAT_BASE", "https://csfloat.com")
     api_key = os.getenv("CSFLOAT_API_KEY")
 
     base = _validate_base_url(base)
+    rate_limit = _parse_rate_limit(os.getenv("CSFLOAT_RATE_LIMIT"))
+    rate_limit_file = os.getenv("CSFLOAT_RATE_LIMIT_FILE") or None
+    cache_dir = os.getenv("CSFLOAT_CACHE_DIR") or None
+    try:
+        entity_ttl = float(os.getenv("CSFLOAT_ENTITY_TTL") or DEFAULT_ENTITY_TTL)
+    except ValueError:
+        raise ValueError(f"CSFLOAT_ENTITY_TTL debe ser un número de segundos. Valor recibido: {os.getenv('CSFLOAT_ENTITY_TTL')}")
 
-    return Settings(base_url=base, api_key=api_key)
+    return Settings(
+        base_url=base,
+        api_key=api_key,
+        rate_limit=rate_limit,
+        rate_limit_file=rate_limit_file,
+        cache_dir=cache_dir,
+        cache_ttl_search=_parse_seconds("CSFLOAT_CACHE_TTL_SEARCH"),
+        cache_ttl_detail=_parse_seconds("CSFLOAT_CACHE_TTL_DETAIL"),
+        entity_ttl=max(entity_ttl, 0.0),
+        log_mode=_parse_log_mode(os.getenv("CSFLOAT_LOG")),
+        log_sample=_parse_log_sample(os.getenv("CSFLOAT_LOG_SAMPLE")),
+    )
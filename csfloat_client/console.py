@@ -0,0 +1,42 @@
+"""Consolas Rich perezosas.
+
+Importar `rich.console` cuesta decenas de ms; `LazyConsole` difiere la
+creación de la `Console` (y el import) hasta el primer uso real, así que
+`import csfloat_client` y comandos que no imprimen con Rich no lo pagan.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from typing import Any
+
+
+class LazyConsole:
+    """Proxy de `rich.console.Console(**kwargs)` que la crea al primer acceso."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._kwargs = kwargs
+        self._console: Any = None
+
+    def _get(self) -> Any:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(**self._kwargs)
+        return self._console
+
+    @property
+    def is_terminal(self) -> bool:
+        # Sin forzar el import de rich: misma heurística básica (FORCE_COLOR o TTY)
+        if self._console is not None:
+            return bool(self._console.is_terminal)
+        if os.environ.get("FORCE_COLOR"):
+            return True
+        stream = sys.stderr if self._kwargs.get("stderr") else sys.stdout
+        try:
+            return stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
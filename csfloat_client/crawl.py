@@ -0,0 +1,225 @@
+"""Crawl en paralelo particionando el espacio de búsqueda.
+
+La paginación por cursor es secuencial: una sola página en vuelo. El crawler
+divide los filtros en particiones disjuntas (bandas de precio, de float o una
+partición por `def_index`) y recorre varias a la vez. Cada partición se pide
+ordenada por su propia clave (`lowest_price` o `lowest_float`), así que tras
+`split_after` páginas se sabe hasta dónde llegó: si el rango restante todavía
+es divisible, se parte en dos particiones nuevas que arrancan desde ese punto.
+Los listings repetidos en los bordes se descartan por id.
+
+    crawler = ShardedCrawler({"def_index": [7]}, by="price", concurrency=4)
+    for page in crawler.pages():
+        ...
+    crawler.stats
+"""
+from __future__ import annotations
+
+import math
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from . import endpoints as _ep
+from .http import CSFloatSession
+from .models import Listing, ListingsPage
+
+CRAWL_STRATEGIES = ("price", "float", "def_index")
+DEFAULT_MAX_PRICE = 100_000_000  # centavos (USD 1M): tope si no se indica max_price
+PAGE_LIMIT = 50
+MIN_FLOAT_WIDTH = 1e-6
+
+
+@dataclass
+class Partition:
+    """Subconjunto disjunto de la búsqueda: `filters` más un rango `[low, high]` de `key`."""
+
+    filters: Dict[str, Any]
+    key: str  # "price" o "float"
+    low: float
+    high: float
+    cursor: Optional[str] = None
+    pages: int = 0
+
+    @property
+    def sort_by(self) -> str:
+        return "lowest_price" if self.key == "price" else "lowest_float"
+
+    def query(self) -> Dict[str, Any]:
+        q = dict(self.filters)
+        if self.key == "price":
+            q["min_price"], q["max_price"] = int(self.low), int(self.high)
+        else:
+            q["min_float"], q["max_float"] = self.low, self.high
+        q["sort_by"] = self.sort_by
+        q["limit"] = PAGE_LIMIT
+        if self.cursor:
+            q["cursor"] = self.cursor
+        return q
+
+    def split_from(self, start: float) -> Optional[Tuple["Partition", "Partition"]]:
+        """Divide el rango restante `[start, high]` en dos; None si ya no es divisible."""
+        if self.key == "price":
+            start = int(start)
+            if self.high - start < 2:
+                return None
+            mid = (start + int(self.high)) // 2
+            return (
+                Partition(self.filters, self.key, start, mid),
+                Partition(self.filters, self.key, mid + 1, self.high),
+            )
+        if self.high - start < 2 * MIN_FLOAT_WIDTH:
+            return None
+        mid = (start + self.high) / 2
+        # Bordes solapados en floats: los repetidos se descartan por id
+        return Partition(self.filters, self.key, start, mid), Partition(self.filters, self.key, mid, self.high)
+
+
+@dataclass
+class CrawlStats:
+    partitions: int = 0
+    splits: int = 0
+    pages: int = 0
+    listings: int = 0
+    duplicates: int = 0
+
+
+def _bands(low: float, high: float, n: int, *, geometric: bool) -> List[Tuple[float, float]]:
+    if n <= 1 or high <= low:
+        return [(low, high)]
+    if geometric:
+        # Los precios se concentran en valores bajos: bandas de ancho creciente
+        a, b = math.log1p(low), math.log1p(high)
+        edges = [math.expm1(a + (b - a) * k / n) for k in range(n + 1)]
+    else:
+        edges = [low + (high - low) * k / n for k in range(n + 1)]
+    edges[0], edges[-1] = low, high
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def plan_partitions(filters: Mapping[str, Any], *, by: str = "price", shards: int = 8) -> List[Partition]:
+    """Particiones iniciales disjuntas que cubren `filters`.
+
+    - `price`: `shards` bandas geométricas entre `min_price` y `max_price`.
+    - `float`: `shards` bandas iguales entre `min_float` y `max_float` (0-1).
+    - `def_index`: una partición por valor de `filters["def_index"]`, cada una
+      sobre todo el rango de precio (se sigue dividiendo por precio).
+    """
+    if by not in CRAWL_STRATEGIES:
+        raise ValueError(f"by debe ser uno de {CRAWL_STRATEGIES}")
+    base = {k: v for k, v in filters.items() if k not in ("cursor", "sort_by", "limit") and v is not None}
+    if by == "float":
+        low_f = float(base.pop("min_float", 0.0))
+        high_f = float(base.pop("max_float", 1.0))
+        return [Partition(base, "float", lo, hi) for lo, hi in _bands(low_f, high_f, shards, geometric=False)]
+    low_p = int(base.pop("min_price", 0))
+    high_p = int(base.pop("max_price", DEFAULT_MAX_PRICE))
+    if by == "def_index":
+        values = base.pop("def_index", None)
+        if not values:
+            raise ValueError("by=def_index requiere filters['def_index'] con uno o más valores")
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        return [Partition({**base, "def_index": [d]}, "price", low_p, high_p) for d in sorted(set(values))]
+    parts: List[Partition] = []
+    prev = low_p - 1
+    for _, hi in _bands(low_p, high_p, shards, geometric=True):
+        hi = max(int(round(hi)), prev + 1)
+        if hi > high_p:
+            break
+        parts.append(Partition(base, "price", prev + 1, hi))
+        prev = hi
+    if prev < high_p:
+        parts.append(Partition(base, "price", prev + 1, high_p))
+    return parts
+
+
+class ShardedCrawler:
+    """Recorre particiones en paralelo (una página en vuelo por partición).
+
+    - `concurrency`: particiones con request en vuelo a la vez (todas pasan
+      por el rate limiter de la sesión).
+    - `split_after`: páginas de una partición antes de intentar dividirla.
+    - `max_listings`: corta el crawl al llegar a esa cantidad de únicos.
+    """
+
+    def __init__(
+        self,
+        filters: Optional[Mapping[str, Any]] = None,
+        *,
+        by: str = "price",
+        shards: int = 8,
+        concurrency: int = 4,
+        split_after: int = 4,
+        max_listings: Optional[int] = None,
+        session: Optional[CSFloatSession] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency debe ser >= 1")
+        self.partitions = plan_partitions(filters or {}, by=by, shards=shards)
+        self.concurrency = concurrency
+        self.split_after = max(split_after, 1)
+        self.max_listings = max_listings
+        self.session = session
+        self.stats = CrawlStats(partitions=len(self.partitions))
+        self._seen: Set[str] = set()
+
+    def _fetch(self, part: Partition) -> ListingsPage:
+        return _ep.get_listings_page(session=self.session, **part.query())
+
+    def _next(self, part: Partition, page: ListingsPage) -> List[Partition]:
+        """Particiones a seguir tras recibir `page` de `part`."""
+        if not page.items or not page.next_cursor:
+            return []
+        part.pages += 1
+        if part.pages >= self.split_after:
+            last = page.items[-1]
+            start = last.price if part.key == "price" else last.item.float_value
+            halves = part.split_from(start) if start is not None else None
+            if halves is not None:
+                self.stats.splits += 1
+                self.stats.partitions += 1
+                return list(halves)
+        return [Partition(part.filters, part.key, part.low, part.high, cursor=page.next_cursor, pages=part.pages)]
+
+    def _unique(self, items: Iterable[Listing]) -> List[Listing]:
+        out = []
+        for l in items:
+            if l.id in self._seen:
+                self.stats.duplicates += 1
+                continue
+            self._seen.add(l.id)
+            out.append(l)
+        return out
+
+    def pages(self) -> Iterator[ListingsPage]:
+        """Páginas (solo listings nuevos) en orden de llegada; `next_cursor` es None."""
+        todo: List[Partition] = list(self.partitions)
+        running: Dict[Future, Partition] = {}
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="csfloat-crawl")
+        try:
+            while todo or running:
+                while todo and len(running) < self.concurrency:
+                    part = todo.pop(0)
+                    running[pool.submit(self._fetch, part)] = part
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    part = running.pop(fut)
+                    page = fut.result()
+                    self.stats.pages += 1
+                    todo.extend(self._next(part, page))
+                    items = self._unique(page.items)
+                    if self.max_listings is not None:
+                        items = items[: max(self.max_listings - self.stats.listings, 0)]
+                    self.stats.listings += len(items)
+                    if items:
+                        yield ListingsPage(items=items, next_cursor=None)
+                    if self.max_listings is not None and self.stats.listings >= self.max_listings:
+                        return
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def crawl_listings(filters: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> Iterator[Listing]:
+    """Atajo: listings únicos de `ShardedCrawler(filters, **kwargs)`."""
+    for page in ShardedCrawler(filters, **kwargs).pages():
+        yield from page.items
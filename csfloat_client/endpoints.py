@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Mapping, Optional, Tuple
+import json as _json
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from .http import request
+from pydantic import TypeAdapter
+
+from .entities import get_entity_cache
+from .http import CSFloatHTTPError, CSFloatSession, request
+from .metrics import get_metrics
 from .models import Listing, ListingsPage
-from .utils import build_query
+from .query import build_query
 
 
 LISTINGS_PATH = "/api/v1/listings"
@@ -22,20 +29,36 @@ def _extract_next_cursor(headers: Mapping[str, str]) -> Optional[str]:
     return None
 
 
-def get_listings_page(**filters: Any) -> ListingsPage:
-    """Obtiene una página de listados y el cursor para la siguiente.
+def _remember(listings: List[Listing]) -> None:
+    cache = get_entity_cache()
+    if cache is not None:
+        cache.put_many(listings)
 
-    Acepta todos los filtros documentados como kwargs.
-    """
+
+def _clamp_filters(filters: Mapping[str, Any]) -> Mapping[str, Any]:
     # Cap de seguridad para limit
     limit = filters.get("limit")
     if isinstance(limit, int) and limit > 50:
         filters = dict(filters)
         filters["limit"] = 50
+    return filters
+
+
+try:  # backend JSON opcional más rápido
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    _orjson = None
+
+_LISTINGS_ADAPTER: TypeAdapter[List[Listing]] = TypeAdapter(List[Listing])
+
+
+def _loads(content: bytes) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(content)
+    return _json.loads(content)
+
 
-    params = build_query(filters)
-    res = request("GET", LISTINGS_PATH, params=params)
-    data = res.response.json()
+def _find_items_payload(data: Any) -> list:
     items_payload: Optional[list] = None
     if isinstance(data, list):
         items_payload = data
@@ -59,26 +82,148 @@ def get_listings_page(**filters: Any) -> ListingsPage:
                 items_payload = inner
     if items_payload is None:
         raise ValueError("Respuesta inesperada: se esperaba una lista de listings")
-    items = [Listing.model_validate(obj) for obj in items_payload]
+    return items_payload
 
-    next_cursor = _extract_next_cursor(res.response.headers)
-    return ListingsPage(items=items, next_cursor=next_cursor)
 
+def _parse_listings_page(data: Any, headers: Mapping[str, str]) -> ListingsPage:
+    items = _LISTINGS_ADAPTER.validate_python(_find_items_payload(data))
+    return ListingsPage(items=items, next_cursor=_extract_next_cursor(headers))
 
-def get_listings(**filters: Any) -> List[Listing]:
+
+def _decode_listings_page(content: bytes, headers: Mapping[str, str]) -> ListingsPage:
+    """Decodifica una página desde bytes crudos.
+
+    Si el sobre es un array JSON (forma habitual), valida la página entera en
+    una sola pasada con `validate_json` (sin `json.loads` intermedio ni loop
+    Python por ítem). Para sobres dict se parsea y valida con el mismo adapter.
+    """
+    if content.lstrip()[:1] == b"[":
+        items = _LISTINGS_ADAPTER.validate_json(content)
+        page = ListingsPage(items=items, next_cursor=_extract_next_cursor(headers))
+    else:
+        page = _parse_listings_page(_loads(content), headers)
+    get_metrics().observe_items(len(page.items))
+    return page
+
+
+@dataclass
+class RawListingsPage:
+    """Página sin construir modelos: `items` son los dicts tal como llegan del API."""
+
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+def get_listings_page(*, session: Optional[CSFloatSession] = None, **filters: Any) -> ListingsPage:
+    """Obtiene una página de listados y el cursor para la siguiente.
+
+    Acepta todos los filtros documentados como kwargs. `session` permite reutilizar
+    una `CSFloatSession` explícita (por defecto se usa la sesión compartida).
+    """
+    params = build_query(_clamp_filters(filters))
+    res = request("GET", LISTINGS_PATH, params=params, session=session)
+    page = _decode_listings_page(res.response.content, res.response.headers)
+    _remember(page.items)
+    return page
+
+
+def get_listings_page_raw(*, session: Optional[CSFloatSession] = None, **filters: Any) -> RawListingsPage:
+    """Como `get_listings_page` pero sin validar ni construir `Listing`.
+
+    Útil cuando solo se necesitan unos pocos campos: evita el costo de pydantic.
+    """
+    params = build_query(_clamp_filters(filters))
+    res = request("GET", LISTINGS_PATH, params=params, session=session)
+    items = _find_items_payload(_loads(res.response.content))
+    get_metrics().observe_items(len(items))
+    return RawListingsPage(items=items, next_cursor=_extract_next_cursor(res.response.headers))
+
+
+def get_listings(*, session: Optional[CSFloatSession] = None, **filters: Any) -> List[Listing]:
     """Lista los listados activos con filtros/orden. Retorna lista tipada."""
-    page = get_listings_page(**filters)
+    page = get_listings_page(session=session, **filters)
     return page.items
 
 
-def get_listing(listing_id: str) -> Listing:
-    """Detalle completo de un listing, incluso si state != listed."""
+def get_listing(
+    listing_id: str,
+    *,
+    session: Optional[CSFloatSession] = None,
+    use_cache: bool = True,
+) -> Listing:
+    """Detalle completo de un listing, incluso si state != listed.
+
+    Si el listing está fresco en el identity map (ver `entities`), se responde
+    desde memoria; `use_cache=False` fuerza la request.
+    """
+    cache = get_entity_cache()
+    if use_cache and cache is not None:
+        hit = cache.get(listing_id)
+        if hit is not None:
+            return hit
     path = f"{LISTINGS_PATH}/{listing_id}"
-    res = request("GET", path)
-    return Listing.model_validate(res.response.json())
+    res = request("GET", path, session=session)
+    listing = Listing.model_validate(res.response.json())
+    _remember([listing])
+    return listing
 
 
-def post_listing(
+DEFAULT_BULK_CONCURRENCY = 8
+
+
+@dataclass
+class ListingLookup:
+    """Resultado de un id en `get_listings_by_ids`: `listing` o `error`."""
+
+    id: str
+    listing: Optional[Listing] = None
+    error: Optional[Exception] = None
+
+
+def get_listings_by_ids(
+    ids: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    session: Optional[CSFloatSession] = None,
+    use_cache: bool = True,
+) -> Iterator[ListingLookup]:
+    """Obtiene muchos listings por id con concurrencia acotada.
+
+    Los ids se deduplican (se ignoran vacíos) y se consumen de forma perezosa,
+    así que `ids` puede ser un stream largo. Como mucho `concurrency` requests
+    quedan en vuelo y todas pasan por el rate limiter de la sesión. Los
+    resultados salen en orden de finalización; un error HTTP o de validación
+    queda en `ListingLookup.error` sin cortar el resto.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency debe ser >= 1")
+
+    def fetch(listing_id: str) -> ListingLookup:
+        try:
+            return ListingLookup(listing_id, get_listing(listing_id, session=session, use_cache=use_cache))
+        except (CSFloatHTTPError, ValueError) as e:
+            return ListingLookup(listing_id, error=e)
+
+    seen: set = set()
+    pending: set[Future] = set()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="csfloat-bulk") as pool:
+        for raw in ids:
+            listing_id = raw.strip()
+            if not listing_id or listing_id in seen:
+                continue
+            seen.add(listing_id)
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+            pending.add(pool.submit(fetch, listing_id))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+
+def _build_listing_body(
     *,
     asset_id: str,
     type: str = "buy_now",
@@ -89,14 +234,8 @@ def post_listing(
     description: Optional[str] = None,
     private: Optional[bool] = None,
     **kwargs: Any,
-) -> Listing:
-    """Publica un ítem. Requiere Authorization.
-
-    - `type`: "buy_now" | "auction"
-    - Si `type == buy_now`, `price` es obligatorio (centavos).
-    - Campos opcionales: `max_offer_discount`, `reserve_price`, `duration_days` (1|3|5|7|14),
-      `description` (<=180), `private` (bool).
-    """
+) -> dict[str, Any]:
+    """Valida los parámetros de publicación y arma el body JSON de POST /listings."""
     if type not in {"buy_now", "auction"}:
         raise ValueError("type debe ser 'buy_now' o 'auction'")
     if type == "buy_now" and price is None:
@@ -128,5 +267,41 @@ def post_listing(
         if v is not None and k not in body:
             body[k] = v
 
-    res = request("POST", LISTINGS_PATH, json=body)
-    return Listing.model_validate(res.response.json())
+    return body
+
+
+def post_listing(
+    *,
+    asset_id: str,
+    type: str = "buy_now",
+    price: Optional[int] = None,
+    max_offer_discount: Optional[int] = None,
+    reserve_price: Optional[int] = None,
+    duration_days: Optional[int] = None,
+    description: Optional[str] = None,
+    private: Optional[bool] = None,
+    session: Optional[CSFloatSession] = None,
+    **kwargs: Any,
+) -> Listing:
+    """Publica un ítem. Requiere Authorization.
+
+    - `type`: "buy_now" | "auction"
+    - Si `type == buy_now`, `price` es obligatorio (centavos).
+    - Campos opcionales: `max_offer_discount`, `reserve_price`, `duration_days` (1|3|5|7|14),
+      `description` (<=180), `private` (bool).
+    """
+    body = _build_listing_body(
+        asset_id=asset_id,
+        type=type,
+        price=price,
+        max_offer_discount=max_offer_discount,
+        reserve_price=reserve_price,
+        duration_days=duration_days,
+        description=description,
+        private=private,
+        **kwargs,
+    )
+    res = request("POST", LISTINGS_PATH, json=body, session=session)
+    listing = Listing.model_validate(res.response.json())
+    _remember([listing])
+    return listing
@@ -0,0 +1,113 @@
+"""Identity map en proceso para `Listing`, indexado por id.
+
+Se alimenta de las páginas (`get_listings_page`) y de los detalles
+(`get_listing`/`post_listing`), y permite que `get_listing(id)` responda desde
+memoria si la entrada sigue fresca. La vida útil depende de `Listing.state`:
+los listados cerrados (vendidos, cancelados, etc.) ya no cambian y se guardan
+sin vencimiento; los activos solo por unos segundos. La memoria está acotada
+(LRU por cantidad de entradas).
+
+Un `Listing` trae campos que dependen de quién consulta (`is_seller`,
+`is_watchlisted`): el identity map del proceso es por API key y se descarta
+al cambiarla.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .config import get_settings
+from .models import Listing
+
+# ~8 KB por Listing: 2000 entradas acotan el identity map a ~16 MB (ver bench/run_bench.py)
+DEFAULT_MAX_ENTRIES = 2_000
+# Estados terminales: el listing ya no cambia
+FINAL_STATES = frozenset({"sold", "delisted", "cancelled", "canceled", "refunded", "expired"})
+
+
+class ListingEntityCache:
+    """Cache LRU de `Listing` por id con TTL según estado y contadores hit/miss."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        listed_ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.listed_ttl = listed_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Listing, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, listing: Listing) -> float:
+        if (listing.state or "").lower() in FINAL_STATES:
+            return math.inf
+        return self.listed_ttl
+
+    def put(self, listing: Listing) -> None:
+        expires = self.clock() + self.ttl_for(listing)
+        with self._lock:
+            self._entries[listing.id] = (listing, expires)
+            self._entries.move_to_end(listing.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_many(self, listings: Iterable[Listing]) -> None:
+        for l in listings:
+            self.put(l)
+
+    def get(self, listing_id: str) -> Optional[Listing]:
+        """Listing fresco para `listing_id`, o None (cuenta hit/miss)."""
+        with self._lock:
+            entry = self._entries.get(listing_id)
+            if entry is not None and entry[1] > self.clock():
+                self._entries.move_to_end(listing_id)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[listing_id]
+            self.misses += 1
+            return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_default_cache: Optional[ListingEntityCache] = None
+_default_key: Optional[Tuple[str, str, float]] = None
+_default_lock = threading.Lock()
+
+
+def get_entity_cache() -> Optional[ListingEntityCache]:
+    """Identity map compartido del proceso; None si `CSFLOAT_ENTITY_TTL=0`.
+
+    Se recrea si cambian `base_url` (los ids son de un servidor concreto), la
+    API key (campos por usuario) o el TTL.
+    """
+    global _default_cache, _default_key
+    s = get_settings()
+    auth = hashlib.sha256(s.api_key.encode()).hexdigest()[:16] if s.api_key else "-"
+    key = (s.base_url, auth, s.entity_ttl)
+    with _default_lock:
+        if key != _default_key:
+            _default_cache = ListingEntityCache(listed_ttl=s.entity_ttl) if s.entity_ttl else None
+            _default_key = key
+        return _default_cache
@@ -0,0 +1,227 @@
+"""Writers de export por página: CSV, NDJSON, Parquet y Arrow.
+
+CSV y NDJSON son formatos de texto "append-friendly": admiten checkpoints por
+offset y reanudación (`--resume`). Parquet y Arrow (IPC/Feather v2) escriben
+columnas tipadas y comprimidas en row groups/batches a medida que llegan las
+páginas; requieren `pyarrow` y no se pueden reanudar.
+"""
+from __future__ import annotations
+
+import csv
+import os
+import typing
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from .models import Item, Listing, ListingsPage, Seller
+from .utils import CSV_HEADERS, ExportCheckpoint, _csv_row
+
+EXPORT_FORMATS = ("csv", "ndjson", "parquet", "arrow")
+APPENDABLE_FORMATS = frozenset({"csv", "ndjson"})
+DEFAULT_BATCH_ROWS = 10_000
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:  # pragma: no cover - depende del entorno
+        raise ImportError("Los formatos parquet/arrow requieren pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def _arrow_type(pa: Any, annotation: Any) -> Any:
+    origin = typing.get_origin(annotation)
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    if origin is typing.Union:
+        return _arrow_type(pa, args[0])
+    if origin in (list, List):
+        return pa.list_(_arrow_type(pa, args[0]))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return pa.struct([pa.field(name, _arrow_type(pa, f.annotation)) for name, f in annotation.model_fields.items()])
+    if annotation is bool:
+        return pa.bool_()
+    if annotation is int:
+        return pa.int64()
+    if annotation is float:
+        return pa.float64()
+    if annotation is datetime:
+        return pa.timestamp("us", tz="UTC")
+    return pa.string()
+
+
+@lru_cache(maxsize=1)
+def listing_arrow_schema() -> Any:
+    """Schema Arrow derivado de `Listing`, con `item_*` y `seller_*` aplanados.
+
+    Los campos anidados de segundo nivel se conservan tipados: `item_stickers`
+    es `list<struct>` y `item_scm`/`seller_statistics` son `struct`.
+    """
+    pa = _require_pyarrow()
+    fields = []
+    for name, f in Listing.model_fields.items():
+        if name in ("item", "seller"):
+            model = Item if name == "item" else Seller
+            for sub, sf in model.model_fields.items():
+                fields.append(pa.field(f"{name}_{sub}", _arrow_type(pa, sf.annotation)))
+        else:
+            fields.append(pa.field(name, _arrow_type(pa, f.annotation)))
+    return pa.schema(fields)
+
+
+def _flat_row(l: Listing) -> Dict[str, Any]:
+    row = l.model_dump()
+    for prefix in ("item", "seller"):
+        for k, v in row.pop(prefix).items():
+            row[f"{prefix}_{k}"] = v
+    return row
+
+
+class _TextWriter(ABC):
+    def __init__(self, path: Path, offset: Optional[int]) -> None:
+        resuming = offset is not None and path.exists()
+        if resuming:
+            with path.open("r+b") as fb:
+                fb.truncate(offset)
+        self.f = path.open("a" if resuming else "w", newline="", encoding="utf-8")
+        self.start(write_header=not resuming)
+
+    def start(self, *, write_header: bool) -> None:
+        pass
+
+    @abstractmethod
+    def write_page(self, items: Sequence[Listing]) -> None: ...
+
+    def commit(self) -> int:
+        self.f.flush()
+        return os.fstat(self.f.fileno()).st_size
+
+    def close(self) -> None:
+        self.f.close()
+
+
+class _CsvWriter(_TextWriter):
+    def start(self, *, write_header: bool) -> None:
+        self.writer = csv.writer(self.f)
+        if write_header:
+            self.writer.writerow(CSV_HEADERS)
+
+    def write_page(self, items: Sequence[Listing]) -> None:
+        self.writer.writerows(_csv_row(l) for l in items)
+
+
+class _NdjsonWriter(_TextWriter):
+    def write_page(self, items: Sequence[Listing]) -> None:
+        self.f.writelines(l.model_dump_json() + "\n" for l in items)
+
+
+class _ColumnarWriter(ABC):
+    def __init__(self, path: Path, batch_rows: int) -> None:
+        self.pa = _require_pyarrow()
+        self.schema = listing_arrow_schema()
+        self.batch_rows = batch_rows
+        self.rows: List[Dict[str, Any]] = []
+        self.open(path)
+
+    @abstractmethod
+    def open(self, path: Path) -> None: ...
+
+    @abstractmethod
+    def write_table(self, table: Any) -> None: ...
+
+    def _flush_batch(self) -> None:
+        if self.rows:
+            self.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def write_page(self, items: Sequence[Listing]) -> None:
+        self.rows.extend(_flat_row(l) for l in items)
+        if len(self.rows) >= self.batch_rows:
+            self._flush_batch()
+
+    def commit(self) -> int:
+        return 0
+
+    def close(self) -> None:
+        self._flush_batch()
+        self.writer.close()
+
+
+class _ParquetWriter(_ColumnarWriter):
+    def open(self, path: Path) -> None:
+        import pyarrow.parquet as pq
+
+        self.writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+
+    def write_table(self, table: Any) -> None:
+        self.writer.write_table(table, row_group_size=self.batch_rows)
+
+
+class _ArrowIpcWriter(_ColumnarWriter):
+    def open(self, path: Path) -> None:
+        options = self.pa.ipc.IpcWriteOptions(compression="zstd")
+        self.writer = self.pa.ipc.new_file(str(path), self.schema, options=options)
+
+    def write_table(self, table: Any) -> None:
+        self.writer.write_table(table, max_chunksize=self.batch_rows)
+
+
+def export_pages(
+    pages: Iterable[ListingsPage],
+    out_path: str | Path,
+    *,
+    format: str = "csv",
+    checkpoint: Optional[ExportCheckpoint] = None,
+    checkpoint_path: Optional[str | Path] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> int:
+    """Exporta páginas en `format` (csv|ndjson|parquet|arrow). Retorna filas totales.
+
+    Para formatos de texto, si `checkpoint` trae un `offset` > 0 se reanuda: el
+    archivo se trunca a ese offset y se abre en append; tras cada página se
+    guarda el checkpoint. Los formatos columnares no admiten `checkpoint`.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"format debe ser uno de {EXPORT_FORMATS}")
+    if checkpoint is not None and format not in APPENDABLE_FORMATS:
+        raise ValueError(f"El formato {format} no admite checkpoints/reanudación")
+    if checkpoint is not None and checkpoint.offset > 0 and checkpoint.format != format:
+        raise ValueError(f"El checkpoint es de un export {checkpoint.format}; no se puede reanudar como {format}")
+
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    resuming = checkpoint is not None and checkpoint.offset > 0 and path.exists()
+    if checkpoint is not None:
+        checkpoint.format = format
+    if checkpoint is not None and checkpoint_path is None:
+        checkpoint_path = ExportCheckpoint.path_for(path)
+
+    writer: Any
+    if format == "csv":
+        writer = _CsvWriter(path, checkpoint.offset if resuming else None)  # type: ignore[union-attr]
+    elif format == "ndjson":
+        writer = _NdjsonWriter(path, checkpoint.offset if resuming else None)  # type: ignore[union-attr]
+    elif format == "parquet":
+        writer = _ParquetWriter(path, batch_rows)
+    else:
+        writer = _ArrowIpcWriter(path, batch_rows)
+
+    count = checkpoint.rows if resuming else 0  # type: ignore[union-attr]
+    try:
+        for page in pages:
+            writer.write_page(page.items)
+            count += len(page.items)
+            offset = writer.commit()
+            if checkpoint is not None:
+                checkpoint.cursor = page.next_cursor
+                checkpoint.rows = count
+                checkpoint.pages += 1
+                checkpoint.offset = offset
+                checkpoint.save(checkpoint_path)  # type: ignore[arg-type]
+    finally:
+        writer.close()
+    return count
@@ -0,0 +1,581 @@
+"""Servidor HTTP local que imita `/api/v1/listings` de CSFloat.
+
+Sirve un mercado sintético y determinista (por `seed`) con la misma forma de
+JSON que la API real, paginado por cursor en `X-Next-Cursor`, con los filtros
+de `listings:find` y los órdenes de `cli_options.SORT_VALUES`. Los atributos se guardan
+en columnas compactas (`array`) y el JSON de cada listing se genera a demanda,
+así que admite millones de listings. Los índices por `def_index`,
+`paint_index` y `paint_seed` y el orden por cada `sort_by` se construyen la
+primera vez que se usan.
+
+Para ejercitar los reintentos de `http.request` puede inyectar fallas:
+rate limit por cliente (429 + `Retry-After`), ráfagas de 5xx, respuestas
+lentas y latencia fija. Solo usa la librería estándar.
+
+    with FakeCSFloatServer(total=5000) as srv:
+        os.environ["CSFLOAT_BASE"] = srv.url
+        ...
+
+    python -m csfloat_client.fakeserver --listings 1000000 --rate-limit 20 --fail-every 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .cli_options import SORT_VALUES
+
+LISTINGS_PATH = "/api/v1/listings"
+MAX_LIMIT = 50
+ID_BASE = 324288155723370196
+ASSET_BASE = 22547095285
+STEAM_BASE = 76561198000000000
+
+# (def_index, arma, paint_index, skin, colección, rareza)
+CATALOG: Tuple[Tuple[int, str, int, str, str, int], ...] = (
+    (16, "M4A4", 449, "Poseidon", "The Gods and Monsters Collection", 5),
+    (16, "M4A4", 309, "Howl", "The Huntsman Collection", 7),
+    (7, "AK-47", 44, "Case Hardened", "The Arms Deal Collection", 4),
+    (7, "AK-47", 180, "Fire Serpent", "The Bravo Collection", 5),
+    (7, "AK-47", 302, "Vulcan", "The Huntsman Collection", 5),
+    (9, "AWP", 344, "Dragon Lore", "The Cobblestone Collection", 6),
+    (9, "AWP", 51, "Lightning Strike", "The Arms Deal Collection", 5),
+    (60, "M4A1-S", 430, "Hyper Beast", "The Falchion Collection", 5),
+    (61, "USP-S", 504, "Kill Confirmed", "The Shadow Collection", 5),
+    (1, "Desert Eagle", 37, "Blaze", "The Dust Collection", 4),
+    (4, "Glock-18", 38, "Fade", "The Assault Collection", 4),
+    (500, "★ Bayonet", 38, "Fade", "The Arms Deal Collection", 6),
+)
+WEARS = ((0.07, "Factory New"), (0.15, "Minimal Wear"), (0.38, "Field-Tested"), (0.45, "Well-Worn"), (1.0, "Battle-Scarred"))
+# category: 1 = normal, 2 = StatTrak™, 3 = souvenir
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _wear(fv: float) -> str:
+    for bound, name in WEARS:
+        if fv < bound:
+            return name
+    return WEARS[-1][1]
+
+
+def _iso(seconds: float) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class MarketData:
+    """Mercado sintético de `total` listings en columnas compactas.
+
+    El listing `i` tiene id `ID_BASE + i` y `created_at` creciente con `i`
+    (los más nuevos tienen índice mayor). Todo es determinista para un `seed`.
+    """
+
+    def __init__(self, total: int, *, seed: int = 0, sellers: int = 5000) -> None:
+        self.total = total
+        rng = random.Random(seed)
+        self.catalog = array("H")  # índice en CATALOG
+        self.paint_seed = array("H")
+        self.float_value = array("d")
+        self.price = array("l")
+        self.scm_price = array("l")
+        self.category = array("B")
+        self.auction = array("b")
+        self.num_bids = array("H")
+        self.seller = array("l")
+        self.created = array("d")  # segundos desde _EPOCH
+        self.expires = array("d")  # solo subastas; inf en buy_now
+        t = 0.0
+        for _ in range(total):
+            c = rng.randrange(len(CATALOG))
+            rarity = CATALOG[c][5]
+            fv = rng.random()
+            category = 2 if rng.random() < 0.1 else (3 if rng.random() < 0.03 else 1)
+            scm = int(100 * (2.5 ** rarity) * (1.6 if category == 2 else 1.0) * (1.5 - fv))
+            price = max(3, int(scm * rng.uniform(0.75, 1.3)))
+            auction = rng.random() < 0.08
+            t += rng.expovariate(1 / 3.0)
+            self.catalog.append(c)
+            self.paint_seed.append(rng.randrange(1000))
+            self.float_value.append(fv)
+            self.price.append(price)
+            self.scm_price.append(scm)
+            self.category.append(category)
+            self.auction.append(1 if auction else 0)
+            self.num_bids.append(rng.randrange(15) if auction else 0)
+            self.seller.append(rng.randrange(sellers))
+            self.created.append(t)
+            self.expires.append(t + rng.uniform(3600, 7 * 86400) if auction else math.inf)
+        self._postings: Dict[str, Dict[int, array]] = {}
+        self._orders: Dict[str, array] = {}
+        self._candidate_cache: "OrderedDict[Tuple[str, int, str], array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- valores derivados ---------------------------------------------------
+
+    def def_index(self, i: int) -> int:
+        return CATALOG[self.catalog[i]][0]
+
+    def paint_index(self, i: int) -> int:
+        return CATALOG[self.catalog[i]][2]
+
+    def rarity(self, i: int) -> int:
+        return CATALOG[self.catalog[i]][5]
+
+    def market_hash_name(self, i: int) -> str:
+        _, weapon, _, skin, _, _ = CATALOG[self.catalog[i]]
+        prefix = {2: "StatTrak™ ", 3: "Souvenir "}.get(self.category[i], "")
+        return f"{prefix}{weapon} | {skin} ({_wear(self.float_value[i])})"
+
+    def sort_key(self, sort_by: str) -> Callable[[int], float]:
+        """Clave ascendente de `sort_by` (empates por id descendente)."""
+        if sort_by == "lowest_price":
+            return self.price.__getitem__
+        if sort_by == "highest_price":
+            return lambda i: -self.price[i]
+        if sort_by == "expires_soon":
+            return self.expires.__getitem__
+        if sort_by in ("lowest_float", "float_rank"):
+            return self.float_value.__getitem__
+        if sort_by == "highest_float":
+            return lambda i: -self.float_value[i]
+        if sort_by == "best_deal":
+            return lambda i: self.price[i] - self.scm_price[i]
+        if sort_by == "highest_discount":
+            return lambda i: self.price[i] / self.scm_price[i]
+        if sort_by == "num_bids":
+            return lambda i: -self.num_bids[i]
+        return lambda i: -self.created[i]  # most_recent
+
+    # --- índices ---------------------------------------------------------------
+
+    def _column(self, field: str) -> Callable[[int], int]:
+        return {"def_index": self.def_index, "paint_index": self.paint_index, "paint_seed": self.paint_seed.__getitem__}[field]
+
+    def postings(self, field: str) -> Dict[int, array]:
+        """Índice invertido valor -> posiciones (ascendentes) para `field`."""
+        with self._lock:
+            idx = self._postings.get(field)
+            if idx is None:
+                col = self._column(field)
+                idx = {}
+                for i in range(self.total):
+                    idx.setdefault(col(i), array("l")).append(i)
+                self._postings[field] = idx
+            return idx
+
+    def order(self, sort_by: str) -> array:
+        with self._lock:
+            order = self._orders.get(sort_by)
+        if order is None:
+            key = self.sort_key(sort_by)
+            order = array("l", sorted(range(self.total - 1, -1, -1), key=key))
+            with self._lock:
+                self._orders[sort_by] = order
+        return order
+
+    def candidates(self, query: Dict[str, List[str]], sort_by: str) -> Sequence[int]:
+        """Posiciones a recorrer, ya ordenadas por `sort_by`.
+
+        Si hay un filtro por igualdad indexado se parte de la lista más corta;
+        si no, del orden global.
+        """
+        best: Optional[Tuple[str, int, array]] = None
+        for field in ("paint_seed", "paint_index", "def_index"):
+            values = query.get(field)
+            if not values or len(values) != 1:
+                continue
+            value = int(values[0])
+            posting = self.postings(field).get(value, array("l"))
+            if best is None or len(posting) < len(best[2]):
+                best = (field, value, posting)
+        if best is None:
+            return self.order(sort_by)
+        cache_key = (best[0], best[1], sort_by)
+        with self._lock:
+            hit = self._candidate_cache.get(cache_key)
+            if hit is not None:
+                self._candidate_cache.move_to_end(cache_key)
+                return hit
+        ordered = array("l", sorted(reversed(best[2]), key=self.sort_key(sort_by)))
+        with self._lock:
+            self._candidate_cache[cache_key] = ordered
+            while len(self._candidate_cache) > 256:
+                self._candidate_cache.popitem(last=False)
+        return ordered
+
+    # --- filtros y JSON -------------------------------------------------------
+
+    def predicate(self, query: Dict[str, List[str]]) -> Callable[[int], bool]:
+        """Función `i -> bool` con todos los filtros de `listings:find` presentes."""
+        checks: List[Callable[[int], bool]] = []
+
+        def first(name: str, cast: Callable[[str], Any]) -> Any:
+            return cast(query[name][0]) if name in query else None
+
+        defs = {int(v) for v in query.get("def_index", [])}
+        if defs:
+            checks.append(lambda i: self.def_index(i) in defs)
+        for name, col in (("paint_index", self.paint_index), ("rarity", self.rarity), ("paint_seed", self.paint_seed.__getitem__)):
+            value = first(name, int)
+            if value is not None:
+                checks.append(lambda i, col=col, value=value: col(i) == value)
+        category = first("category", int)
+        if category:
+            checks.append(lambda i: self.category[i] == category)
+        for name, col, op in (
+            ("min_price", self.price, lambda a, b: a >= b),
+            ("max_price", self.price, lambda a, b: a <= b),
+            ("min_float", self.float_value, lambda a, b: a >= b),
+            ("max_float", self.float_value, lambda a, b: a <= b),
+        ):
+            value = first(name, float)
+            if value is not None:
+                checks.append(lambda i, col=col, op=op, value=value: op(col[i], value))
+        listing_type = first("type", str)
+        if listing_type:
+            want = 1 if listing_type == "auction" else 0
+            checks.append(lambda i: self.auction[i] == want)
+        name = first("market_hash_name", str)
+        if name:
+            checks.append(lambda i: self.market_hash_name(i) == name)
+        collection = first("collection", str)
+        if collection:
+            checks.append(lambda i: CATALOG[self.catalog[i]][4] == collection)
+        user_id = first("user_id", str)
+        if user_id:
+            checks.append(lambda i: str(STEAM_BASE + self.seller[i]) == user_id)
+        return lambda i: all(c(i) for c in checks)
+
+    def listing(self, i: int) -> Dict[str, Any]:
+        def_index, weapon, paint_index, skin, collection, rarity = CATALOG[self.catalog[i]]
+        fv = self.float_value[i]
+        seller = self.seller[i]
+        auction = bool(self.auction[i])
+        data: Dict[str, Any] = {
+            "id": str(ID_BASE + i),
+            "created_at": _iso(self.created[i]),
+            "type": "auction" if auction else "buy_now",
+            "price": self.price[i],
+            "state": "listed",
+            "seller": {
+                "avatar": "https://steamcdn-a.akamaihd.net/steamcommunity/public/images/avatars/97/974f0a94f47f50a1a6a769fc8ff093cb93a49066_full.jpg",
+                "flags": 435,
+                "online": seller % 3 != 0,
+                "stall_public": True,
+                "statistics": {"median_trade_time": 236, "total_failed_trades": 0, "total_trades": 24, "total_verified_trades": 24},
+                "steam_id": str(STEAM_BASE + seller),
+                "username": f"seller{seller}",
+            },
+            "item": {
+                "asset_id": str(ASSET_BASE + i),
+                "def_index": def_index,
+                "paint_index": paint_index,
+                "paint_seed": self.paint_seed[i],
+                "float_value": fv,
+                "icon_url": "-9a81dlW...",
+                "d_param": str(17054198177995786400 + i),
+                "is_stattrak": self.category[i] == 2,
+                "is_souvenir": self.category[i] == 3,
+                "rarity": rarity,
+                "quality": 9 if self.category[i] == 2 else 4,
+                "market_hash_name": self.market_hash_name(i),
+                "stickers": [
+                    {
+                        "stickerId": 1060,
+                        "slot": 3,
+                        "icon_url": "columbus2016/nv_holo.png",
+                        "name": "Sticker | Team EnVyUs (Holo) | MLG Columbus 2016",
+                        "scm": {"price": 736, "volume": 1},
+                    }
+                ] if i % 4 == 0 else [],
+                "tradable": 0,
+                "inspect_link": "steam://rungame/730/...",
+                "has_screenshot": True,
+                "scm": {"price": self.scm_price[i], "volume": 10},
+                "item_name": f"{weapon} | {skin}",
+                "wear_name": _wear(fv),
+                "description": "Synthetic listing",
+                "collection": collection,
+                "badges": [],
+            },
+            "is_seller": False,
+            "min_offer_price": int(self.price[i] * 0.85),
+            "max_offer_discount": 1500,
+            "is_watchlisted": False,
+            "watchers": (i * 7) % 11,
+        }
+        if auction:
+            data["auction_details"] = {
+                "reserve_price": int(self.price[i] * 0.8),
+                "expires_at": _iso(self.expires[i]),
+                "min_next_bid": self.price[i] + 10,
+            }
+        return data
+
+    def page(self, query: Dict[str, List[str]]) -> Tuple[List[int], Optional[str]]:
+        """Posiciones de la página y cursor siguiente (posición dentro de `candidates`)."""
+        limit = min(int(query.get("limit", ["50"])[0]), MAX_LIMIT)
+        sort_by = query.get("sort_by", ["most_recent"])[0]
+        if sort_by not in SORT_VALUES:
+            raise ValueError(f"sort_by inválido: {sort_by}")
+        start = int(query.get("cursor", ["0"])[0])
+        candidates = self.candidates(query, sort_by)
+        pred = self.predicate(query)
+        out: List[int] = []
+        pos = start
+        while pos < len(candidates) and len(out) < limit:
+            i = candidates[pos]
+            pos += 1
+            if pred(i):
+                out.append(i)
+        return out, (str(pos) if pos < len(candidates) and out else None)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """0 si hay token; si no, segundos hasta el próximo."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"  # keep-alive, como la API real
+    disable_nagle_algorithm = True  # headers y body van en writes separados
+
+    def log_message(self, format: str, *args: Any) -> None:  # silenciar stderr
+        pass
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        fake = self.server.fake
+        fault = fake._fault(self.client_address[0])
+        if fault is not None:
+            self._send(*fault)
+            return
+        url = urlparse(self.path)
+        if url.path == LISTINGS_PATH:
+            self._send(*fake._listings_page(parse_qs(url.query)))
+        elif url.path.startswith(LISTINGS_PATH + "/"):
+            self._send(*fake._listing_detail(url.path[len(LISTINGS_PATH) + 1:]))
+        else:
+            self._send(404, b'{"message":"not found"}')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeCSFloatServer"
+
+
+class FakeCSFloatServer:
+    """Servidor en un hilo de fondo sobre un `MarketData` de `total` listings.
+
+    Fallas configurables (todas desactivadas por defecto):
+    - `latency`: segundos de espera fija por request.
+    - `slow_rate` / `slow_seconds`: fracción de requests que tardan `slow_seconds` extra.
+    - `rate_limit` / `rate_burst`: token bucket por IP de cliente; al excederlo
+      responde 429 con `Retry-After` (segundos enteros, mínimo `retry_after_min`).
+    - `error_429_every`: cada N-ésima request responde 429 (`Retry-After: 0`).
+    - `fail_every` / `fail_burst`: tras cada `fail_every` requests, las
+      siguientes `fail_burst` responden `fail_status` (503 por defecto).
+
+    `port=0` elige un puerto libre; la URL base queda en `.url`.
+    """
+
+    def __init__(
+        self,
+        *,
+        total: int = 1000,
+        seed: int = 0,
+        latency: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_seconds: float = 1.0,
+        rate_limit: Optional[float] = None,
+        rate_burst: Optional[float] = None,
+        retry_after_min: int = 0,
+        error_429_every: int = 0,
+        fail_every: int = 0,
+        fail_burst: int = 1,
+        fail_status: int = 503,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.data = MarketData(total, seed=seed)
+        self.latency = latency
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst if rate_burst is not None else (rate_limit or 0)
+        self.retry_after_min = retry_after_min
+        self.error_429_every = error_429_every
+        self.fail_every = fail_every
+        self.fail_burst = fail_burst
+        self.fail_status = fail_status
+        self.requests = 0
+        self.faults: Dict[str, int] = {"429": 0, "5xx": 0, "slow": 0}
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # El JSON de cada listing se genera una vez y se reutiliza (acotado)
+        self._encoded = lru_cache(maxsize=100_000)(self._encode)
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def total(self) -> int:
+        return self.data.total
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _fault(self, client: str) -> Optional[tuple]:
+        """Decide (bajo lock) si esta request falla; duerme fuera del lock."""
+        with self._lock:
+            self.requests += 1
+            n = self.requests
+            slow = self.slow_rate > 0 and self._rng.random() < self.slow_rate
+            wait = 0.0
+            if self.rate_limit:
+                bucket = self._buckets.get(client)
+                if bucket is None:
+                    bucket = self._buckets[client] = _TokenBucket(self.rate_limit, max(self.rate_burst, 1.0))
+                wait = bucket.take()
+            if wait > 0 or (self.error_429_every and n % self.error_429_every == 0):
+                self.faults["429"] += 1
+                retry_after = max(self.retry_after_min, math.ceil(wait))
+                return 429, b'{"message":"rate limited"}', {"Retry-After": str(retry_after)}
+            if self.fail_every and (n - 1) % (self.fail_every + self.fail_burst) >= self.fail_every:
+                self.faults["5xx"] += 1
+                return self.fail_status, b'{"message":"upstream error"}'
+            if slow:
+                self.faults["slow"] += 1
+        delay = self.latency + (self.slow_seconds if slow else 0.0)
+        if delay:
+            time.sleep(delay)
+        return None
+
+    def _encode(self, i: int) -> bytes:
+        return json.dumps(self.data.listing(i), separators=(",", ":")).encode()
+
+    def _listings_page(self, query: Dict[str, List[str]]) -> tuple:
+        try:
+            positions, next_cursor = self.data.page(query)
+        except ValueError as e:
+            return 400, json.dumps({"message": str(e)}).encode()
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return 200, b"[" + b",".join(self._encoded(i) for i in positions) + b"]", headers
+
+    def _listing_detail(self, listing_id: str) -> tuple:
+        try:
+            i = int(listing_id) - ID_BASE
+        except ValueError:
+            i = -1
+        if not 0 <= i < self.total:
+            return 404, b'{"message":"listing not found"}'
+        return 200, self._encoded(i)
+
+    def start(self) -> "FakeCSFloatServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="csfloat-fakeserver", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def close(self) -> None:
+        """Libera el socket; para cuando `serve_forever` ya terminó."""
+        self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self.close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeCSFloatServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor local que imita la API de listings de CSFloat")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--listings", type=int, default=100_000, help="Cantidad de listings sintéticos")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Segundos de latencia fija por request")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fracción de respuestas lentas")
+    parser.add_argument("--slow-seconds", type=float, default=1.0)
+    parser.add_argument("--rate-limit", type=float, default=None, help="req/s por cliente antes de responder 429")
+    parser.add_argument("--rate-burst", type=float, default=None)
+    parser.add_argument("--retry-after-min", type=int, default=0, help="Mínimo de Retry-After en los 429")
+    parser.add_argument("--error-429-every", type=int, default=0)
+    parser.add_argument("--fail-every", type=int, default=0, help="Requests OK entre ráfagas de 5xx")
+    parser.add_argument("--fail-burst", type=int, default=1, help="Largo de cada ráfaga de 5xx")
+    parser.add_argument("--fail-status", type=int, default=503)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    srv = FakeCSFloatServer(
+        total=args.listings,
+        seed=args.seed,
+        latency=args.latency,
+        slow_rate=args.slow_rate,
+        slow_seconds=args.slow_seconds,
+        rate_limit=args.rate_limit,
+        rate_burst=args.rate_burst,
+        retry_after_min=args.retry_after_min,
+        error_429_every=args.error_429_every,
+        fail_every=args.fail_every,
+        fail_burst=args.fail_burst,
+        fail_status=args.fail_status,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"{args.listings:,} listings generados en {time.perf_counter() - start:.1f}s")
+    print(f"Escuchando en {srv.url} (CSFLOAT_BASE={srv.url}); Ctrl+C para terminar")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.close()
+        print(f"requests={srv.requests} fallas={srv.faults}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""`ListingsFrame`: columnas NumPy para filtrar/ordenar muchos listados sin loops Python.
+
+Convierte un stream de `Listing` (o de dicts crudos de `get_listings_page_raw`)
+en arrays por columna; los filtros, ordenamientos, top-k y group-by operan
+vectorizados sobre esos arrays. Los valores ausentes son `NaN` (o `NaT` en
+`created_at`), por lo que nunca cumplen una comparación.
+
+Requiere `numpy`.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depende del entorno
+    raise ImportError("ListingsFrame requiere numpy: pip install numpy") from e
+
+from .models import Listing
+
+NUMERIC_COLUMNS = (
+    "price",
+    "float_value",
+    "paint_seed",
+    "paint_index",
+    "def_index",
+    "rarity",
+    "watchers",
+    "scm_price",
+)
+TEXT_COLUMNS = ("id", "market_hash_name", "collection")
+_AGGREGATIONS = ("count", "sum", "mean", "min", "max")
+
+
+def _row_from_listing(l: Listing) -> tuple:
+    it = l.item
+    return (
+        l.id,
+        it.market_hash_name,
+        it.collection,
+        l.price,
+        it.float_value,
+        it.paint_seed,
+        it.paint_index,
+        it.def_index,
+        it.rarity,
+        l.watchers,
+        it.scm.price if it.scm else None,
+        l.created_at.isoformat(),
+    )
+
+
+def _row_from_dict(d: Mapping[str, Any]) -> tuple:
+    it = d.get("item") or {}
+    scm = it.get("scm") or {}
+    return (
+        d.get("id"),
+        it.get("market_hash_name"),
+        it.get("collection"),
+        d.get("price"),
+        it.get("float_value"),
+        it.get("paint_seed"),
+        it.get("paint_index"),
+        it.get("def_index"),
+        it.get("rarity"),
+        d.get("watchers"),
+        scm.get("price"),
+        d.get("created_at"),
+    )
+
+
+def _to_float(values: Sequence[Any]) -> "np.ndarray":
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _to_datetime(values: Sequence[Optional[str]]) -> "np.ndarray":
+    # numpy no entiende sufijos de zona: los timestamps del API vienen en UTC ("Z" / "+00:00")
+    cleaned = [
+        "NaT" if v is None else v.replace("Z", "").replace("+00:00", "")
+        for v in values
+    ]
+    return np.array(cleaned, dtype="datetime64[us]")
+
+
+def _sort_keys(values: "np.ndarray", descending: bool) -> "np.ndarray":
+    """Claves float ascendentes para ordenar; ausentes (NaN/NaT/None) mapeados a +inf.
+
+    Las columnas de texto se ordenan por el rango de cada valor presente
+    (`np.unique`), así `None` nunca se compara con `str`.
+    """
+    if values.dtype == object:
+        missing = np.array([v is None for v in values], dtype=bool)
+        keys = np.zeros(len(values), dtype=np.float64)
+        if (~missing).any():
+            _, ranks = np.unique(values[~missing], return_inverse=True)
+            keys[~missing] = ranks
+    elif values.dtype.kind == "M":
+        missing = np.isnat(values)
+        keys = values.astype(np.int64).astype(np.float64)
+    else:
+        keys = values.astype(np.float64)
+        missing = np.isnan(keys)
+    if descending:
+        keys = -keys
+    keys[missing] = np.inf
+    return keys
+
+
+class ListingsFrame:
+    """Conjunto columnar e inmutable de listados.
+
+    - Columnas numéricas (`float64`, NaN = ausente): price, float_value, paint_seed,
+      paint_index, def_index, rarity, watchers, scm_price.
+    - Columnas de texto (`object`): id, market_hash_name, collection.
+    - `created_at`: `datetime64[us]` (UTC).
+    """
+
+    def __init__(self, columns: Mapping[str, "np.ndarray"]) -> None:
+        self.columns: Dict[str, np.ndarray] = dict(columns)
+
+    @classmethod
+    def from_listings(cls, listings: Iterable[Union[Listing, Mapping[str, Any]]]) -> "ListingsFrame":
+        """Construye el frame consumiendo el iterable una sola vez."""
+        rows = [
+            _row_from_listing(l) if isinstance(l, Listing) else _row_from_dict(l)
+            for l in listings
+        ]
+        cols: List[Sequence[Any]] = list(zip(*rows)) if rows else [()] * 12
+        (ids, names, collections, price, fv, seed, paint, defidx, rarity, watchers, scm, created) = cols
+        return cls({
+            "id": np.array(ids, dtype=object),
+            "market_hash_name": np.array(names, dtype=object),
+            "collection": np.array(collections, dtype=object),
+            "price": _to_float(price),
+            "float_value": _to_float(fv),
+            "paint_seed": _to_float(seed),
+            "paint_index": _to_float(paint),
+            "def_index": _to_float(defidx),
+            "rarity": _to_float(rarity),
+            "watchers": _to_float(watchers),
+            "scm_price": _to_float(scm),
+            "created_at": _to_datetime(created),
+        })
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, column: str) -> "np.ndarray":
+        if column == "discount":
+            return self.discount()
+        return self.columns[column]
+
+    def take(self, index: "np.ndarray") -> "ListingsFrame":
+        """Nuevo frame con las filas de `index` (máscara booleana o posiciones)."""
+        return ListingsFrame({k: v[index] for k, v in self.columns.items()})
+
+    def discount(self) -> "np.ndarray":
+        """Descuento relativo vs `item.scm.price` (0.2 = 20% por debajo de SCM)."""
+        scm = self.columns["scm_price"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = 1.0 - self.columns["price"] / scm
+        out[~(scm > 0)] = np.nan
+        return out
+
+    def filter(
+        self,
+        mask: Optional["np.ndarray"] = None,
+        *,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_float: Optional[float] = None,
+        max_float: Optional[float] = None,
+        def_index: Optional[Iterable[int]] = None,
+        paint_index: Optional[int] = None,
+        paint_seed: Optional[Iterable[int] | int] = None,
+        rarity: Optional[int] = None,
+        market_hash_name: Optional[str] = None,
+    ) -> "ListingsFrame":
+        """Filtra con una máscara explícita y/o criterios con nombres de la API."""
+        m = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool).copy()
+        c = self.columns
+        if min_price is not None:
+            m &= c["price"] >= min_price
+        if max_price is not None:
+            m &= c["price"] <= max_price
+        if min_float is not None:
+            m &= c["float_value"] >= min_float
+        if max_float is not None:
+            m &= c["float_value"] <= max_float
+        if def_index is not None:
+            m &= np.isin(c["def_index"], list(def_index))
+        if paint_index is not None:
+            m &= c["paint_index"] == paint_index
+        if paint_seed is not None:
+            seeds = [paint_seed] if np.isscalar(paint_seed) else list(paint_seed)
+            m &= np.isin(c["paint_seed"], seeds)
+        if rarity is not None:
+            m &= c["rarity"] == rarity
+        if market_hash_name is not None:
+            m &= c["market_hash_name"] == market_hash_name
+        return self.take(m)
+
+    def sort(self, by: str, *, descending: bool = False) -> "ListingsFrame":
+        """Orden estable por `by`; los valores ausentes quedan al final."""
+        return self.take(np.argsort(_sort_keys(self[by], descending), kind="stable"))
+
+    def top_k(self, by: str, k: int, *, largest: bool = False) -> "ListingsFrame":
+        """Las `k` filas con menor (o mayor) `by`, ordenadas; O(n) vía `argpartition`."""
+        keys = _sort_keys(self[by], largest)
+        if k < len(keys):
+            idx = np.argpartition(keys, k)[:k]
+        else:
+            idx = np.arange(len(keys))
+        idx = idx[np.argsort(keys[idx], kind="stable")]
+        return self.take(idx)
+
+    def group_by(self, key: str, column: str = "price", agg: str = "min") -> Dict[Any, float]:
+        """Agrega `column` por cada valor de `key` (`count|sum|mean|min|max`), ignorando NaN."""
+        if agg not in _AGGREGATIONS:
+            raise ValueError(f"agg debe ser uno de {_AGGREGATIONS}")
+        keys = self[key]
+        values = self[column]
+        valid = ~np.isnan(values) if values.dtype.kind == "f" else np.ones(len(values), dtype=bool)
+        if keys.dtype == object:
+            valid &= np.array([k is not None for k in keys], dtype=bool)
+        else:
+            valid &= ~np.isnan(keys)
+        uniq, inverse = np.unique(keys[valid], return_inverse=True)
+        vals = values[valid].astype(np.float64)
+        counts = np.bincount(inverse, minlength=len(uniq)).astype(np.float64)
+        if agg == "count":
+            out = counts
+        elif agg in ("sum", "mean"):
+            out = np.bincount(inverse, weights=vals, minlength=len(uniq))
+            if agg == "mean":
+                out = out / counts
+        elif agg == "min":
+            out = np.full(len(uniq), np.inf)
+            np.minimum.at(out, inverse, vals)
+        else:
+            out = np.full(len(uniq), -np.inf)
+            np.maximum.at(out, inverse, vals)
+        return {k.item() if hasattr(k, "item") else k: float(v) for k, v in zip(uniq, out)}
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Filas como dicts (útil para imprimir resultados chicos)."""
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*(self.columns[n].tolist() for n in names))]
@@ -1,23 +1,56 @@
 from __future__ import annotations
 
+import atexit
 import json as _json
 import random
+import threading
 import time
 import os
+import sys
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, Mapping, Optional
 
 import httpx
-from rich.console import Console
-from rich.table import Table
 
-from .config import get_settings
+from .config import LOG_MODES, Settings, get_settings
+from .metrics import get_metrics
+from .console import LazyConsole
+from .cache import CacheEntry, ResponseCache, get_response_cache
+from .ratelimit import RateLimiter, get_rate_limiter
 
-console = Console()
+# Rich se importa recién si se loguea en modo `rich`
+console: Any = LazyConsole()
 
 
 DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
 RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+class _Disabled:
+    """Valor de `rate_limiter`/`cache` que desactiva el del proceso en una sesión."""
+
+    def __repr__(self) -> str:
+        return "DISABLED"
+
+
+# `None` (el default) usa el limitador/cache del proceso (`get_rate_limiter` /
+# `get_response_cache`); `DISABLED` los desactiva para esa sesión
+DISABLED: Any = _Disabled()
+
+
+def _resolve_limiter(value: Optional[RateLimiter]) -> Optional[RateLimiter]:
+    if value is DISABLED:
+        return None
+    return value if value is not None else get_rate_limiter()
+
+
+def _resolve_cache(value: Optional[ResponseCache]) -> Optional[ResponseCache]:
+    if value is DISABLED:
+        return None
+    return value if value is not None else get_response_cache()
 
 
 @dataclass
@@ -41,38 +74,115 @@ def _default_headers() -> Dict[str, str]:
     return headers
 
 
-def create_client(timeout: httpx.Timeout | float | None = None) -> httpx.Client:
+def create_client(
+    timeout: httpx.Timeout | float | None = None,
+    *,
+    limits: Optional[httpx.Limits] = None,
+    http2: bool = False,
+) -> httpx.Client:
     s = get_settings()
     return httpx.Client(
         base_url=s.base_url,
         headers=_default_headers(),
         timeout=timeout or DEFAULT_TIMEOUT,
+        limits=limits or httpx.Limits(
+            max_connections=DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections=DEFAULT_MAX_KEEPALIVE,
+            keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2,
     )
 
 
-def _sleep_backoff(attempt: int, retry_after: Optional[str]) -> None:
-    # Respeta Retry-After (segundos) si está presente
+def _backoff_delay(attempt: int, retry_after: Optional[str]) -> float:
+    """Segundos a esperar antes del reintento `attempt` (0 en modo test)."""
     if os.getenv("CSFLOAT_TEST_NO_SLEEP") == "1":
-        return
+        return 0.0
+    # Respeta Retry-After (segundos) si está presente
     if retry_after:
         try:
-            delay = float(retry_after)
-            time.sleep(delay)
-            return
+            return float(retry_after)
         except ValueError:
             pass
     # Exponential backoff con jitter
     base = min(0.5 * (2 ** attempt), 8.0)  # cap
-    delay = base + random.uniform(0, 0.25)
-    time.sleep(delay)
+    return base + random.uniform(0, 0.25)
+
+
+def _sleep_backoff(attempt: int, retry_after: Optional[str], *, method: str, path: str) -> None:
+    delay = _backoff_delay(attempt, retry_after)
+    get_metrics().observe_retry(method, path, delay)
+    if delay > 0:
+        time.sleep(delay)
+
+
+_log_override: Optional[str] = None
+_log_sample_override: Optional[float] = None
+_log_default: Optional[str] = None
+
+
+def _check_log_mode(mode: Optional[str]) -> None:
+    if mode is not None and mode not in LOG_MODES:
+        raise ValueError(f"Modo de log inválido: {mode}. Opciones: {', '.join(LOG_MODES)}")
+
+
+def set_log_mode(mode: Optional[str], *, sample: Optional[float] = None) -> None:
+    """Override explícito del log de requests (`rich`, `jsonl` u `off`) y su muestreo.
+
+    Gana sobre `CSFLOAT_LOG`/`CSFLOAT_LOG_SAMPLE`; `None` vuelve a usar el entorno.
+    """
+    global _log_override, _log_sample_override
+    _check_log_mode(mode)
+    _log_override = mode
+    _log_sample_override = None if sample is None else min(max(sample, 0.0), 1.0)
+
+
+def set_default_log_mode(mode: Optional[str]) -> None:
+    """Modo usado si no hay override ni `CSFLOAT_LOG` (los comandos bulk usan `off`)."""
+    global _log_default
+    _check_log_mode(mode)
+    _log_default = mode
+
+
+def _log_mode() -> str:
+    # Override explícito > CSFLOAT_LOG > default del comando > rich en TTY, jsonl si no
+    if _log_override is not None:
+        return _log_override
+    s = get_settings()
+    if s.log_mode is not None:
+        return s.log_mode
+    if _log_default is not None:
+        return _log_default
+    return "rich" if console.is_terminal else "jsonl"
 
 
 def _log_request(method: str, url: httpx.URL, status: Optional[int], latency_ms: Optional[float], request_id: Optional[str], filters_preview: Optional[Mapping[str, Any]] = None) -> None:
+    mode = _log_mode()
+    if mode == "off":
+        return
+    # El muestreo solo descarta requests exitosas: los errores se loguean siempre
+    sample = _log_sample_override if _log_sample_override is not None else get_settings().log_sample
+    if sample < 1.0 and status is not None and status < 400 and random.random() >= sample:
+        return
+    if mode == "jsonl":
+        # Una línea por request en stderr, sin tocar stdout (apto para pipes)
+        sys.stderr.write(_json.dumps({
+            "ts": round(time.time(), 3),
+            "method": method.upper(),
+            "path": url.raw_path.decode(),
+            "status": status,
+            "latency_ms": round(latency_ms, 1) if latency_ms is not None else None,
+            "request_id": request_id,
+        }, separators=(",", ":")) + "\n")
+        return
+
     method = method.upper()
     path = url.raw_path.decode()
     status_str = str(status) if status is not None else "-"
     latency_str = f"{latency_ms:.1f}ms" if latency_ms is not None else "-"
 
+    from rich.table import Table
+
     table = Table(show_header=True, header_style="bold blue")
     table.add_column("method", style="cyan")
     table.add_column("path")
@@ -94,54 +204,148 @@ def _log_request(method: str, url: httpx.URL, status: Optional[int], latency_ms:
             pass
 
 
-def request(
-    method: str,
-    path: str,
-    *,
-    params: Optional[Iterable[tuple[str, Any]] | Mapping[str, Any]] = None,
-    json: Optional[Mapping[str, Any]] = None,
-    max_retries: int = 3,
-    timeout: httpx.Timeout | float | None = None,
-) -> HTTPResult:
-    """Realiza una solicitud HTTP con reintentos/backoff y logging.
+class CSFloatSession:
+    """Sesión HTTP de larga vida que reutiliza un pool de conexiones.
 
-    - Reintenta en 429/5xx hasta `max_retries`.
-    - Respeta Retry-After si el servidor lo provee.
-    - Lanza CSFloatHTTPError con contexto claro en errores definitivos.
+    Mantiene un único `httpx.Client` (keep-alive) entre requests para evitar
+    pagar un handshake TCP+TLS por cada página. Si cambian los settings
+    (base_url/API key), el cliente se recrea en la siguiente request.
+
+    Cada intento pasa por `rate_limiter` (por defecto, el limitador compartido
+    del proceso; ver `ratelimit.get_rate_limiter`). Los GET pasan por `cache`
+    si hay uno (por defecto, `cache.get_response_cache`, opt-in vía
+    `CSFLOAT_CACHE_DIR`). `rate_limiter=DISABLED` / `cache=DISABLED` los
+    desactivan para esta sesión aunque el proceso tenga uno configurado.
     """
-    client = create_client(timeout=timeout)
-    try:
+
+    def __init__(
+        self,
+        *,
+        timeout: httpx.Timeout | float | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._client: Optional[httpx.Client] = None
+        self._settings: Optional[Settings] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        s = get_settings()
+        with self._lock:
+            if self._client is None or self._settings != s:
+                if self._client is not None:
+                    self._client.close()
+                self._client = create_client(timeout=self.timeout, limits=self.limits, http2=self.http2)
+                self._settings = s
+            return self._client
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+                self._settings = None
+
+    def __enter__(self) -> "CSFloatSession":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Iterable[tuple[str, Any]] | Mapping[str, Any]] = None,
+        json: Optional[Mapping[str, Any]] = None,
+        max_retries: int = 3,
+        timeout: httpx.Timeout | float | None = None,
+    ) -> HTTPResult:
+        """Realiza una solicitud HTTP con reintentos/backoff y logging.
+
+        - Reintenta en 429/5xx hasta `max_retries`.
+        - Respeta Retry-After si el servidor lo provee.
+        - Lanza CSFloatHTTPError con contexto claro en errores definitivos.
+        - Con cache: sirve GET frescos sin red y revalida vencidos con ETag.
+        """
+        client = self.client
+        limiter = _resolve_limiter(self.rate_limiter)
+        metrics = get_metrics()
+        extra: Dict[str, Any] = {}
+        if timeout is not None:
+            extra["timeout"] = timeout
+        cache = _resolve_cache(self.cache)
+        cache_key: Optional[str] = None
+        cached: Optional[CacheEntry] = None
+        if cache is not None and method.upper() == "GET":
+            cache_key = cache.key(method, path, params)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                if cached.fresh:
+                    metrics.observe_cache_hit()
+                    req = client.build_request(method, path, params=params)
+                    return HTTPResult(response=cached.to_response(req), latency_ms=0.0)
+                if cached.etag:
+                    extra["headers"] = {"If-None-Match": cached.etag}
         last_exc: Optional[Exception] = None
         for attempt in range(max_retries + 1):
             start = time.perf_counter()
             status: Optional[int] = None
             try:
-                resp = client.request(method, path, params=params, json=json)
+                if limiter is not None:
+                    limiter.acquire()
+                    now = time.perf_counter()
+                    metrics.observe_throttle(now - start)
+                    start = now
+                resp = client.request(method, path, params=params, json=json, **extra)
                 latency_ms = (time.perf_counter() - start) * 1000.0
                 status = resp.status_code
+                metrics.observe_response(method, path, status, latency_ms, len(resp.content))
+                if limiter is not None:
+                    limiter.feedback(status, resp.headers.get("Retry-After"))
 
                 req_id = resp.headers.get("x-request-id") or resp.headers.get("request-id")
                 _log_request(method, resp.request.url, status, latency_ms, req_id, filters_preview=params if method.upper()=="GET" else None)
 
+                if status == 304 and cached is not None:
+                    cache.refresh(cache_key, path, resp)  # type: ignore[union-attr,arg-type]
+                    return HTTPResult(response=cached.to_response(resp.request), latency_ms=latency_ms)
+
                 if status in RETRY_STATUSES and attempt < max_retries:
-                    _sleep_backoff(attempt, resp.headers.get("Retry-After"))
+                    if status == 429 and limiter is not None:
+                        # El limitador ya absorbió el 429 (pausa por Retry-After y tasa
+                        # reducida): la espera la hace el próximo acquire, no un backoff
+                        metrics.observe_retry(method, path, 0.0)
+                    else:
+                        _sleep_backoff(attempt, resp.headers.get("Retry-After"), method=method, path=path)
                     continue
 
                 resp.raise_for_status()
+                if cache_key is not None:
+                    cache.put(cache_key, path, resp)  # type: ignore[union-attr]
                 return HTTPResult(response=resp, latency_ms=latency_ms)
             except httpx.HTTPStatusError as e:
-                latency_ms = (time.perf_counter() - start) * 1000.0
+                # La respuesta ya se logueó arriba, antes de raise_for_status
                 status = e.response.status_code if e.response else None
-                req_id = None
-                try:
-                    req_id = e.response.headers.get("x-request-id") if e.response else None
-                except Exception:
-                    pass
-                _log_request(method, e.request.url if e.request else httpx.URL(path), status, latency_ms, req_id)
 
                 # Si es reintetable y nos quedan intentos, backoff
                 if status in RETRY_STATUSES and attempt < max_retries:
-                    _sleep_backoff(attempt, e.response.headers.get("Retry-After") if e.response else None)
+                    _sleep_backoff(attempt, e.response.headers.get("Retry-After") if e.response else None, method=method, path=path)
                     continue
 
                 # No reintetable o sin intentos -> error definitivo
@@ -155,15 +359,43 @@ def request(
                 ) from e
             except httpx.RequestError as e:
                 latency_ms = (time.perf_counter() - start) * 1000.0
+                metrics.observe_response(method, path, None, latency_ms)
                 _log_request(method, httpx.URL(path), None, latency_ms, None)
                 last_exc = e
                 if attempt < max_retries:
-                    _sleep_backoff(attempt, None)
+                    _sleep_backoff(attempt, None, method=method, path=path)
                     continue
                 raise CSFloatHTTPError(f"Error de red/timeout en {method.upper()} {path}: {e}") from e
         # Si salimos del loop sin retorno, levantar último error
         if last_exc:
             raise CSFloatHTTPError(f"Fallo tras reintentos: {last_exc}")
         raise CSFloatHTTPError("Fallo desconocido tras reintentos")
-    finally:
-        client.close()
+
+
+_default_session: Optional[CSFloatSession] = None
+_default_session_lock = threading.Lock()
+
+
+def get_default_session() -> CSFloatSession:
+    """Sesión compartida del proceso, usada cuando no se pasa una explícita."""
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = CSFloatSession()
+            atexit.register(_default_session.close)
+        return _default_session
+
+
+def request(
+    method: str,
+    path: str,
+    *,
+    params: Optional[Iterable[tuple[str, Any]] | Mapping[str, Any]] = None,
+    json: Optional[Mapping[str, Any]] = None,
+    max_retries: int = 3,
+    timeout: httpx.Timeout | float | None = None,
+    session: Optional[CSFloatSession] = None,
+) -> HTTPResult:
+    """Realiza una solicitud usando `session` o la sesión compartida por defecto."""
+    sess = session or get_default_session()
+    return sess.request(method, path, params=params, json=json, max_retries=max_retries, timeout=timeout)
@@ -0,0 +1,185 @@
+"""Registro de métricas en proceso alimentado por `http.request`.
+
+Por endpoint (método + ruta normalizada, con ids como `{id}`) se guarda un
+histograma de latencia y contadores por código de estado y reintentos; a nivel
+global, segundos dormidos en backoff y esperando al rate limiter, bytes
+recibidos, respuestas servidas desde cache e ítems decodificados.
+
+    from csfloat_client.metrics import get_metrics
+    get_metrics().snapshot()        # dict con todo
+    get_metrics().to_prometheus()   # text format de Prometheus
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Límites superiores (ms) de los buckets del histograma de latencia
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(method: str, path: str) -> str:
+    """`GET /api/v1/listings/123` -> `GET /api/v1/listings/{id}` (sin query)."""
+    path = path.split("?", 1)[0]
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+class Histogram:
+    """Histograma de buckets fijos con suma y conteo."""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimación por interpolación lineal dentro del bucket (NaN si vacío)."""
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(self.bounds, self.counts):
+            if n and seen + n >= rank:
+                if math.isinf(bound):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / n
+            seen += n
+            lower = bound
+        return lower
+
+
+class MetricsRegistry:
+    """Contadores e histogramas thread-safe; ver `get_metrics` para el compartido."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency: Dict[str, Histogram] = {}
+            self.statuses: Counter = Counter()
+            self.retries: Counter = Counter()
+            self.backoff_seconds = 0.0
+            self.throttle_seconds = 0.0
+            self.bytes_received = 0
+            self.cache_hits = 0
+            self.items_parsed = 0
+
+    def observe_response(
+        self,
+        method: str,
+        path: str,
+        status: Optional[int],
+        latency_ms: float,
+        nbytes: int = 0,
+    ) -> None:
+        """Registra un intento HTTP; `status=None` indica error de red/timeout."""
+        ep = endpoint_label(method, path)
+        with self._lock:
+            hist = self.latency.get(ep)
+            if hist is None:
+                hist = self.latency[ep] = Histogram()
+            hist.observe(latency_ms)
+            self.statuses[(ep, str(status) if status is not None else "error")] += 1
+            self.bytes_received += nbytes
+
+    def observe_retry(self, method: str, path: str, delay: float) -> None:
+        with self._lock:
+            self.retries[endpoint_label(method, path)] += 1
+            self.backoff_seconds += delay
+
+    def observe_throttle(self, seconds: float) -> None:
+        with self._lock:
+            self.throttle_seconds += seconds
+
+    def observe_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def observe_items(self, n: int) -> None:
+        with self._lock:
+            self.items_parsed += n
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copia serializable del estado actual."""
+        with self._lock:
+            endpoints: Dict[str, Dict[str, Any]] = {}
+            for ep, hist in sorted(self.latency.items()):
+                endpoints[ep] = {
+                    "requests": hist.count,
+                    "latency_ms_avg": hist.sum / hist.count if hist.count else math.nan,
+                    "latency_ms_p50": hist.quantile(0.5),
+                    "latency_ms_p95": hist.quantile(0.95),
+                    "latency_ms_p99": hist.quantile(0.99),
+                    "statuses": {s: n for (e, s), n in sorted(self.statuses.items()) if e == ep},
+                    "retries": self.retries.get(ep, 0),
+                }
+            return {
+                "endpoints": endpoints,
+                "requests": sum(h.count for h in self.latency.values()),
+                "retries": sum(self.retries.values()),
+                "backoff_seconds": self.backoff_seconds,
+                "throttle_seconds": self.throttle_seconds,
+                "bytes_received": self.bytes_received,
+                "cache_hits": self.cache_hits,
+                "items_parsed": self.items_parsed,
+            }
+
+    def to_prometheus(self, prefix: str = "csfloat") -> str:
+        """Dump en text exposition format de Prometheus."""
+        lines: List[str] = []
+
+        def esc(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"')
+
+        with self._lock:
+            lines.append(f"# TYPE {prefix}_request_duration_ms histogram")
+            for ep, hist in sorted(self.latency.items()):
+                label = f'endpoint="{esc(ep)}"'
+                cumulative = 0
+                for bound, n in zip(hist.bounds, hist.counts):
+                    cumulative += n
+                    le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                    lines.append(f'{prefix}_request_duration_ms_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f"{prefix}_request_duration_ms_sum{{{label}}} {hist.sum:.3f}")
+                lines.append(f"{prefix}_request_duration_ms_count{{{label}}} {hist.count}")
+            lines.append(f"# TYPE {prefix}_responses_total counter")
+            for (ep, status), n in sorted(self.statuses.items()):
+                lines.append(f'{prefix}_responses_total{{endpoint="{esc(ep)}",status="{status}"}} {n}')
+            lines.append(f"# TYPE {prefix}_retries_total counter")
+            for ep, n in sorted(self.retries.items()):
+                lines.append(f'{prefix}_retries_total{{endpoint="{esc(ep)}"}} {n}')
+            for name, value in (
+                ("backoff_seconds_total", self.backoff_seconds),
+                ("throttle_seconds_total", self.throttle_seconds),
+                ("received_bytes_total", self.bytes_received),
+                ("cache_hits_total", self.cache_hits),
+                ("items_parsed_total", self.items_parsed),
+            ):
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Registro compartido del proceso."""
+    return _registry
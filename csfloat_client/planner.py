@@ -0,0 +1,221 @@
+"""Planificador de consultas para búsqueda de seeds/patrones.
+
+Cada `SeedTarget` es un skin (`def_index` + `paint_index`) con una lista de
+seeds y un rango de float opcionales. Consultar cada (skin, seed) por separado
+cuesta una request por combinación; el planner las agrupa:
+
+- Por seed: una sola consulta `paint_seed=S` con la unión de los `def_index`
+  de todos los targets que buscan S (la API acepta varios `def_index`).
+  `paint_index` solo se envía si es común a todo el grupo y el rango de float
+  es la unión de los rangos. Las coincidencias se reparten por target del
+  lado del cliente.
+- Targets sin seeds (solo rango de float): una consulta por `paint_index` y
+  rango, con la unión de sus `def_index`.
+- Con `scan_over=N`, un target con más de N seeds se resuelve recorriendo el
+  skin entero (sin `paint_seed`), que suele ser más barato que N consultas.
+
+Las consultas corren en paralelo bajo el rate limiter de la sesión.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from . import endpoints as _ep
+from .http import CSFloatSession
+from .models import Listing
+
+DEFAULT_MAX_PAGES = 5
+
+
+@dataclass(frozen=True)
+class SeedTarget:
+    def_index: int
+    paint_index: int
+    seeds: Tuple[int, ...] = ()
+    min_float: Optional[float] = None
+    max_float: Optional[float] = None
+    name: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SeedTarget":
+        """Desde JSON: `seeds` puede ser lista de enteros o texto `"661,670,900-910"`."""
+        seeds = data.get("seeds")
+        if seeds is None and data.get("paint_seed") is not None:
+            seeds = [data["paint_seed"]]
+        return cls(
+            def_index=int(data["def_index"]),
+            paint_index=int(data["paint_index"]),
+            seeds=parse_seeds(seeds or ()),
+            min_float=data.get("min_float"),
+            max_float=data.get("max_float"),
+            name=data.get("name"),
+        )
+
+    @classmethod
+    def parse(cls, spec: str) -> "SeedTarget":
+        """Formato corto `DEF:PAINT[:SEEDS[:MIN-MAX]]`, p. ej. `7:44:661,670:0-0.2`."""
+        parts = spec.split(":")
+        if not 2 <= len(parts) <= 4:
+            raise ValueError(f"Target inválido: {spec!r} (esperado DEF:PAINT[:SEEDS[:MIN-MAX]])")
+        min_f = max_f = None
+        if len(parts) == 4 and parts[3]:
+            lo, _, hi = parts[3].partition("-")
+            min_f = float(lo) if lo else None
+            max_f = float(hi) if hi else None
+        return cls(
+            def_index=int(parts[0]),
+            paint_index=int(parts[1]),
+            seeds=parse_seeds(parts[2] if len(parts) > 2 else ()),
+            min_float=min_f,
+            max_float=max_f,
+        )
+
+    @property
+    def label(self) -> str:
+        return self.name or f"{self.def_index}:{self.paint_index}"
+
+    def matches(self, l: Listing) -> bool:
+        it = l.item
+        if it.def_index != self.def_index or it.paint_index != self.paint_index:
+            return False
+        if self.seeds and it.paint_seed not in self.seeds:
+            return False
+        fv = it.float_value
+        if self.min_float is not None and (fv is None or fv < self.min_float):
+            return False
+        if self.max_float is not None and (fv is None or fv > self.max_float):
+            return False
+        return True
+
+
+@dataclass
+class PlannedQuery:
+    filters: Dict[str, Any]
+    targets: List[int]  # posiciones en la lista de targets
+
+
+@dataclass
+class PlanResult:
+    targets: List[SeedTarget]
+    queries: List[PlannedQuery]
+    matches: Dict[int, List[Listing]] = field(default_factory=dict)
+    requests: int = 0
+    naive_requests: int = 0
+    truncated: int = 0  # consultas que llegaron a max_pages con páginas pendientes
+
+    @property
+    def saved(self) -> int:
+        return self.naive_requests - self.requests
+
+    def by_label(self) -> Dict[str, List[Listing]]:
+        return {self.targets[i].label: self.matches.get(i, []) for i in range(len(self.targets))}
+
+
+def parse_seeds(value: Any) -> Tuple[int, ...]:
+    """Seeds ordenados y sin repetir desde una lista o texto con rangos (`"1,5,10-12"`)."""
+    if isinstance(value, str):
+        value = [v for v in value.split(",") if v.strip()]
+    seeds: Set[int] = set()
+    for v in value:
+        if isinstance(v, str) and "-" in v.strip()[1:]:
+            lo, hi = v.split("-", 1)
+            seeds.update(range(int(lo), int(hi) + 1))
+        else:
+            seeds.add(int(v))
+    return tuple(sorted(seeds))
+
+
+def naive_request_count(targets: Sequence[SeedTarget]) -> int:
+    """Requests de la estrategia ingenua: una consulta por (target, seed)."""
+    return sum(max(len(t.seeds), 1) for t in targets)
+
+
+def _float_union(targets: Iterable[SeedTarget]) -> Dict[str, float]:
+    ts = list(targets)
+    out: Dict[str, float] = {}
+    if all(t.min_float is not None for t in ts):
+        out["min_float"] = min(t.min_float for t in ts)  # type: ignore[type-var]
+    if all(t.max_float is not None for t in ts):
+        out["max_float"] = max(t.max_float for t in ts)  # type: ignore[type-var]
+    return out
+
+
+def _group_query(targets: Sequence[SeedTarget], idx: List[int], extra: Mapping[str, Any]) -> Dict[str, Any]:
+    group = [targets[i] for i in idx]
+    q: Dict[str, Any] = dict(extra)
+    q["def_index"] = sorted({t.def_index for t in group})
+    paints = {t.paint_index for t in group}
+    if len(paints) == 1:
+        q["paint_index"] = paints.pop()
+    q.update(_float_union(group))
+    q["limit"] = 50
+    return q
+
+
+def plan_queries(
+    targets: Sequence[SeedTarget],
+    *,
+    scan_over: Optional[int] = None,
+    extra_filters: Optional[Mapping[str, Any]] = None,
+) -> List[PlannedQuery]:
+    """Mínimo de consultas que cubren todos los targets (ver docstring del módulo)."""
+    extra = {k: v for k, v in (extra_filters or {}).items() if k not in ("cursor", "paint_seed", "def_index", "paint_index")}
+    by_seed: Dict[int, List[int]] = defaultdict(list)
+    plain: Dict[Tuple[int, Optional[float], Optional[float]], List[int]] = defaultdict(list)
+    for i, t in enumerate(targets):
+        if t.seeds and (scan_over is None or len(t.seeds) <= scan_over):
+            for s in t.seeds:
+                by_seed[s].append(i)
+        else:
+            plain[(t.paint_index, t.min_float, t.max_float)].append(i)
+
+    queries: List[PlannedQuery] = []
+    for seed in sorted(by_seed):
+        q = _group_query(targets, by_seed[seed], extra)
+        q["paint_seed"] = seed
+        queries.append(PlannedQuery(q, by_seed[seed]))
+    for key in sorted(plain, key=str):
+        queries.append(PlannedQuery(_group_query(targets, plain[key], extra), plain[key]))
+    return queries
+
+
+def run_plan(
+    targets: Sequence[SeedTarget],
+    *,
+    concurrency: int = 4,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    scan_over: Optional[int] = None,
+    extra_filters: Optional[Mapping[str, Any]] = None,
+    session: Optional[CSFloatSession] = None,
+) -> PlanResult:
+    """Planifica, ejecuta en paralelo y agrupa las coincidencias por target."""
+    targets = list(targets)
+    queries = plan_queries(targets, scan_over=scan_over, extra_filters=extra_filters)
+    result = PlanResult(targets=targets, queries=queries, naive_requests=naive_request_count(targets))
+
+    def run_query(pq: PlannedQuery) -> Tuple[PlannedQuery, List[Listing], int, bool]:
+        items: List[Listing] = []
+        filters = dict(pq.filters)
+        for n in range(1, max_pages + 1):
+            page = _ep.get_listings_page(session=session, **filters)
+            items.extend(page.items)
+            if not page.next_cursor:
+                return pq, items, n, False
+            filters["cursor"] = page.next_cursor
+        return pq, items, max_pages, True
+
+    seen: Dict[int, Set[str]] = defaultdict(set)
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix="csfloat-plan") as pool:
+        for fut in as_completed([pool.submit(run_query, pq) for pq in queries]):
+            pq, items, pages, truncated = fut.result()
+            result.requests += pages
+            result.truncated += int(truncated)
+            for l in items:
+                for i in pq.targets:
+                    if l.id not in seen[i] and targets[i].matches(l):
+                        seen[i].add(l.id)
+                        result.matches.setdefault(i, []).append(l)
+    return result
@@ -0,0 +1,39 @@
+"""Serialización determinística de filtros a query string.
+
+Módulo hoja (sin imports del paquete): lo usan `endpoints`, `aio`, `cache` y
+`utils` sin crear ciclos de import.
+"""
+from __future__ import annotations
+
+from typing import Any, List, Mapping, Tuple
+
+
+def build_query(filters: Mapping[str, Any] | None) -> List[Tuple[str, str]]:
+    """Construye la query en orden determinístico (alfabético por clave, luego por valor).
+
+    - Omite claves con valor None.
+    - Para secuencias, repite la clave por cada valor (p.ej. def_index=1&def_index=2).
+    - Convierte valores a str de forma segura.
+    """
+    if not filters:
+        return []
+    pairs: List[Tuple[str, str]] = []
+    for k, v in filters.items():
+        if v is None:
+            continue
+        if isinstance(v, (list, tuple, set)):
+            for vv in v:
+                if vv is None:
+                    continue
+                pairs.append((k, _to_str(vv)))
+        else:
+            pairs.append((k, _to_str(v)))
+    pairs.sort(key=lambda kv: (kv[0], kv[1]))
+    return pairs
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, float):
+        # Evitar notación científica y normalizar
+        return format(value, ".10g")
+    return str(value)
@@ -0,0 +1,259 @@
+"""Limitador de tasa del lado cliente (token bucket + AIMD).
+
+Todas las requests que pasan por `http.request` (y `aio.request`) reservan un
+token antes de salir. La tasa se ajusta sola: sube de forma aditiva mientras
+el servidor responde bien y baja de forma multiplicativa ante un 429; un
+`Retry-After` pausa a todos los consumidores a la vez en lugar de que cada
+worker descubra el límite por separado.
+
+Sin `CSFLOAT_RATE_LIMIT` el limitador del proceso arranca inactivo: no frena
+ninguna request y solo mide el tráfico. Recién ante el primer 429 se activa,
+con una tasa inicial por debajo de la observada (`decrease`).
+
+`FileRateLimiter` guarda el estado del bucket en un archivo con lock, de modo
+que varios procesos `csf` en el mismo host compartan un único presupuesto.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from .config import get_settings
+
+
+@dataclass
+class _BucketState:
+    tokens: float
+    rate: float
+    updated: float
+    paused_until: float = 0.0
+    last_decrease: float = 0.0
+    # Modo automático (rate == 0): requests enviadas desde window_start
+    sent: float = 0.0
+    window_start: float = 0.0
+
+
+OBSERVE_WINDOW = 10.0  # segundos de tráfico con que se estima la tasa al primer 429
+
+
+def _sleep(delay: float) -> None:
+    if os.getenv("CSFLOAT_TEST_NO_SLEEP") == "1":
+        return
+    time.sleep(delay)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """Token bucket thread-safe con ajuste AIMD de la tasa.
+
+    - `rate`: tokens por segundo iniciales; None = inactivo hasta el primer
+      429, que fija la tasa en `decrease` veces la observada.
+    - `burst`: capacidad del bucket (por defecto, un segundo de tasa).
+    - `min_rate` / `max_rate`: límites del ajuste adaptativo (por defecto
+      `max_rate` es 4 veces la tasa inicial).
+    - `increase`: req/s sumadas por cada segundo de respuestas exitosas.
+    - `decrease`: factor multiplicativo aplicado ante un 429.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        *,
+        burst: Optional[float] = None,
+        min_rate: float = 0.2,
+        max_rate: Optional[float] = None,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = _sleep,
+    ) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError("rate debe ser > 0")
+        self._burst = burst
+        self._max_rate = max_rate
+        self.burst = 1.0
+        self.max_rate = 0.0
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        now = clock()
+        self._state = _BucketState(tokens=0.0, rate=0.0, updated=now, window_start=now)
+        if rate is not None:
+            self._start(self._state, rate)
+            self._state.tokens = self.burst
+
+    def _start(self, st: _BucketState, rate: float) -> None:
+        st.rate = rate
+        self._sync_limits(rate)
+
+    def _sync_limits(self, rate: float) -> None:
+        # burst/max_rate por defecto dependen de la tasa inicial, que en modo
+        # automático se conoce recién al activarse (quizás en otro proceso)
+        if not self.max_rate:
+            self.burst = self._burst if self._burst is not None else max(1.0, rate)
+            self.max_rate = self._max_rate if self._max_rate is not None else rate * 4
+
+    @contextmanager
+    def _locked(self) -> Iterator[_BucketState]:
+        with self._lock:
+            yield self._state
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Tasa actual en req/s; None mientras el limitador está inactivo."""
+        with self._locked() as st:
+            return st.rate or None
+
+    def reserve(self) -> float:
+        """Consume un token y retorna los segundos a esperar antes de usarlo."""
+        with self._locked() as st:
+            now = self.clock()
+            if not st.rate:
+                # Inactivo: no frena, solo cuenta el tráfico reciente
+                elapsed = now - st.window_start
+                if elapsed > OBSERVE_WINDOW:
+                    st.sent *= OBSERVE_WINDOW / 2 / elapsed
+                    st.window_start = now - OBSERVE_WINDOW / 2
+                st.sent += 1.0
+                return 0.0
+            self._sync_limits(st.rate)
+            # Durante un Retry-After el bucket no se rellena: al terminar la pausa
+            # los consumidores salen espaciados a 1/rate, no todos juntos
+            refill_from = max(st.updated, st.paused_until)
+            if now > refill_from:
+                st.tokens = min(self.burst, st.tokens + (now - refill_from) * st.rate)
+            st.updated = max(st.updated, now)
+            st.tokens -= 1.0
+            wait = -st.tokens / st.rate if st.tokens < 0 else 0.0
+            return max(0.0, st.paused_until - now) + wait
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self.reserve()
+        if wait > 0 and os.getenv("CSFLOAT_TEST_NO_SLEEP") != "1":
+            await asyncio.sleep(wait)
+
+    def feedback(self, status: Optional[int], retry_after: Optional[str] = None) -> None:
+        """Ajusta la tasa según la respuesta del servidor (AIMD)."""
+        if status is None:
+            return
+        with self._locked() as st:
+            now = self.clock()
+            if status == 429:
+                if not st.rate:
+                    observed = st.sent / max(now - st.window_start, 1.0)
+                    self._start(st, max(self.min_rate, observed * self.decrease))
+                    st.updated = st.last_decrease = now
+                # Un solo decremento por ventana: varios 429 simultáneos son el mismo evento
+                elif now - st.last_decrease >= 1.0 / st.rate:
+                    st.rate = max(self.min_rate, st.rate * self.decrease)
+                    st.last_decrease = now
+                delay = _parse_retry_after(retry_after)
+                if delay is not None:
+                    st.paused_until = max(st.paused_until, now + delay)
+                st.tokens = min(st.tokens, 0.0)
+            elif status < 500 and st.rate:
+                self._sync_limits(st.rate)
+                st.rate = min(self.max_rate, st.rate + self.increase / st.rate)
+
+
+class FileRateLimiter(RateLimiter):
+    """`RateLimiter` cuyo estado vive en un archivo compartido entre procesos.
+
+    Usa el reloj de pared (`time.time`) para que todos los procesos midan igual.
+    """
+
+    def __init__(self, path: str | Path, rate: Optional[float] = None, **kwargs: Any) -> None:
+        kwargs.setdefault("clock", time.time)
+        super().__init__(rate, **kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _locked(self) -> Iterator[_BucketState]:
+        with self._lock, self.path.open("a+", encoding="utf-8") as f:
+            _lock_file(f)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = _BucketState(**json.loads(raw)) if raw.strip() else self._state
+                except (ValueError, TypeError):
+                    state = self._state
+                yield state
+                self._state = state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(asdict(state)))
+                f.flush()
+            finally:
+                _unlock_file(f)
+
+
+if os.name == "nt":  # pragma: no cover - depende de la plataforma
+    import msvcrt
+
+    def _lock_file(f: Any) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f: Any) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(f: Any) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f: Any) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_key: Optional[tuple[Optional[float], Optional[str]]] = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Limitador compartido del proceso según `CSFLOAT_RATE_LIMIT(_FILE)`.
+
+    Sin `CSFLOAT_RATE_LIMIT` retorna un limitador inactivo hasta el primer
+    429; None si está desactivado (`CSFLOAT_RATE_LIMIT=off`).
+    """
+    global _default_limiter, _default_key
+    s = get_settings()
+    key = (s.rate_limit, s.rate_limit_file)
+    with _default_lock:
+        if key != _default_key:
+            if s.rate_limit == 0:
+                _default_limiter = None
+            elif s.rate_limit_file:
+                _default_limiter = FileRateLimiter(s.rate_limit_file, s.rate_limit)
+            else:
+                _default_limiter = RateLimiter(s.rate_limit)
+            _default_key = key
+        return _default_limiter
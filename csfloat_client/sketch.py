@@ -0,0 +1,300 @@
+"""Estadísticas de precio en streaming con sketches de cuantiles mergeables.
+
+`KLLSketch` implementa el sketch KLL (Karnin, Lang, Liberty): una pila de
+compactores donde el nivel `h` guarda ítems con peso `2**h`. Cuando un nivel
+se llena se ordena y se promueve la mitad (pares o impares, al azar) al nivel
+siguiente. El tamaño es O(k) sin importar cuántos valores entren, el error de
+rango es ~1.7/k (≈1% con k=200) y dos sketches se combinan concatenando sus
+niveles, así que corridas parciales se pueden unir después.
+
+`PriceStatsAggregator` mantiene un sketch y contadores (n, min, max, suma)
+por grupo (`market_hash_name`, desgaste, ...) alimentado desde cualquier stream
+de `Listing` (`paginate_listings`, `crawl_listings`) y se persiste en JSON:
+
+    agg = PriceStatsAggregator(by=("market_hash_name",))
+    agg.update(paginate_listings(initial_filters={"def_index": [7]}))
+    agg.save("ak.json")
+    PriceStatsAggregator.load("ak.json").merge(PriceStatsAggregator.load("awp.json"))
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import Listing
+from .utils import WEAR_RANGES
+
+DEFAULT_K = 200
+WEAR_NAMES = ("Factory New", "Minimal Wear", "Field-Tested", "Well-Worn", "Battle-Scarred")
+STATS_FORMAT_VERSION = 1
+
+
+class KLLSketch:
+    """Sketch KLL de cuantiles sobre floats (mergeable y serializable)."""
+
+    def __init__(self, k: int = DEFAULT_K, *, c: float = 2 / 3, rng: Optional[random.Random] = None) -> None:
+        if k < 8:
+            raise ValueError("k debe ser >= 8")
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.compactors: List[List[float]] = [[]]
+        self._rng = rng or random.Random()
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.compactors) - h - 1
+        return int(math.ceil(self.c**depth * self.k)) + 1
+
+    def _grow(self) -> None:
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _compress(self) -> None:
+        for h in range(len(self.compactors)):
+            level = self.compactors[h]
+            if len(level) < self._capacity(h):
+                continue
+            if h + 1 >= len(self.compactors):
+                self._grow()
+            level.sort()
+            # Si el largo es impar, el menor queda en el nivel actual
+            odd = len(level) % 2
+            start = odd + self._rng.randint(0, 1)
+            self.compactors[h + 1].extend(level[start::2])
+            del level[odd:]
+            self._size = sum(len(lv) for lv in self.compactors)
+            if self._size < self._max_size:
+                break
+
+    def update(self, value: float) -> None:
+        self.compactors[0].append(float(value))
+        self.n += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Incorpora `other` en este sketch (in place) y lo devuelve."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for h, level in enumerate(other.compactors):
+            self.compactors[h].extend(level)
+        self.n += other.n
+        self._size = sum(len(lv) for lv in self.compactors)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _weighted(self) -> Tuple[List[float], List[int]]:
+        pairs = sorted((v, 1 << h) for h, level in enumerate(self.compactors) for v in level)
+        return [v for v, _ in pairs], list(accumulate(w for _, w in pairs))
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Valores aproximados de los cuantiles `qs` (0-1); None si está vacío."""
+        values, cum = self._weighted()
+        if not values:
+            return [None for _ in qs]
+        total = cum[-1]
+        out: List[Optional[float]] = []
+        for q in qs:
+            i = min(bisect_right(cum, q * total - 1e-9), len(values) - 1)
+            out.append(values[i])
+        return out
+
+    def rank(self, value: float) -> float:
+        """Fracción aproximada de valores <= `value`."""
+        values, cum = self._weighted()
+        if not values:
+            return 0.0
+        i = bisect_right(values, value)
+        return cum[i - 1] / cum[-1] if i else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "c": self.c, "n": self.n, "compactors": self.compactors}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KLLSketch":
+        sk = cls(int(data["k"]), c=float(data.get("c", 2 / 3)))
+        sk.compactors = [[float(v) for v in level] for level in data["compactors"]] or [[]]
+        sk.n = int(data["n"])
+        sk._size = sum(len(lv) for lv in sk.compactors)
+        sk._max_size = sum(sk._capacity(h) for h in range(len(sk.compactors)))
+        return sk
+
+
+@dataclass
+class GroupStats:
+    """Contadores exactos más el sketch de precios de un grupo."""
+
+    sketch: KLLSketch
+    count: int = 0
+    total: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.sketch.update(value)
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "GroupStats") -> None:
+        self.sketch.merge(other.sketch)
+        self.count += other.count
+        self.total += other.total
+        for attr, pick in (("min", min), ("max", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+
+    def summary(self, quantiles: Sequence[float] = (0.1, 0.5, 0.9)) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"count": self.count, "min": self.min, "max": self.max}
+        out["mean"] = self.total / self.count if self.count else None
+        for q, v in zip(quantiles, self.sketch.quantiles(quantiles)):
+            out[f"p{round(q * 100)}"] = v
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "total": self.total, "min": self.min, "max": self.max, "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GroupStats":
+        return cls(
+            sketch=KLLSketch.from_dict(data["sketch"]),
+            count=int(data["count"]),
+            total=float(data["total"]),
+            min=data.get("min"),
+            max=data.get("max"),
+        )
+
+
+def wear_bucket(l: Listing) -> str:
+    """Desgaste del ítem: `wear_name` de la API o, si falta, derivado del float."""
+    if l.item.wear_name:
+        return l.item.wear_name
+    fv = l.item.float_value
+    if fv is None:
+        return "-"
+    for (_, high), name in zip(WEAR_RANGES, WEAR_NAMES):
+        if fv < high:
+            return name
+    return WEAR_NAMES[-1]
+
+
+def _item_name(l: Listing) -> str:
+    name = l.item.market_hash_name or "-"
+    # "AK-47 | Redline (Field-Tested)" -> "AK-47 | Redline"
+    return name.rsplit(" (", 1)[0] if name.endswith(")") else name
+
+
+STAT_GROUP_KEYS: Dict[str, Callable[[Listing], str]] = {
+    "market_hash_name": lambda l: l.item.market_hash_name or "-",
+    "item_name": _item_name,
+    "wear": wear_bucket,
+    "def_index": lambda l: str(l.item.def_index),
+    "paint_index": lambda l: str(l.item.paint_index),
+}
+
+
+class PriceStatsAggregator:
+    """Sketch de precios y contadores por grupo, en memoria O(grupos * k).
+
+    - `by`: claves de `STAT_GROUP_KEYS` que forman el grupo (en orden).
+    - Listings sin precio se cuentan en `skipped` y no entran a ningún grupo.
+    """
+
+    def __init__(self, by: Sequence[str] = ("market_hash_name",), *, k: int = DEFAULT_K) -> None:
+        unknown = [b for b in by if b not in STAT_GROUP_KEYS]
+        if unknown or not by:
+            raise ValueError(f"by debe combinar valores de {tuple(STAT_GROUP_KEYS)}")
+        self.by = tuple(by)
+        self.k = k
+        self.groups: Dict[Tuple[str, ...], GroupStats] = {}
+        self.listings = 0
+        self.skipped = 0
+        self._keys = [STAT_GROUP_KEYS[b] for b in self.by]
+
+    def _group(self, key: Tuple[str, ...]) -> GroupStats:
+        g = self.groups.get(key)
+        if g is None:
+            g = self.groups[key] = GroupStats(KLLSketch(self.k))
+        return g
+
+    def add(self, l: Listing) -> None:
+        self.listings += 1
+        if l.price is None:
+            self.skipped += 1
+            return
+        self._group(tuple(f(l) for f in self._keys)).add(l.price)
+
+    def update(self, listings: Iterable[Listing]) -> int:
+        """Consume un stream de listings; devuelve cuántos se leyeron."""
+        n = 0
+        for l in listings:
+            self.add(l)
+            n += 1
+        return n
+
+    def merge(self, other: "PriceStatsAggregator") -> "PriceStatsAggregator":
+        if other.by != self.by:
+            raise ValueError(f"No se pueden unir estadísticas agrupadas por {other.by} y {self.by}")
+        for key, g in other.groups.items():
+            mine = self.groups.get(key)
+            if mine is None:
+                self.groups[key] = GroupStats.from_dict(g.to_dict())
+            else:
+                mine.merge(g)
+        self.listings += other.listings
+        self.skipped += other.skipped
+        return self
+
+    def summaries(self, quantiles: Sequence[float] = (0.1, 0.5, 0.9)) -> List[Dict[str, Any]]:
+        """Una fila por grupo (claves de `by` + count/min/max/mean/pXX), por count descendente."""
+        rows = []
+        for key, g in sorted(self.groups.items(), key=lambda kv: (-kv[1].count, kv[0])):
+            rows.append({**dict(zip(self.by, key)), **g.summary(quantiles)})
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": STATS_FORMAT_VERSION,
+            "by": list(self.by),
+            "k": self.k,
+            "listings": self.listings,
+            "skipped": self.skipped,
+            "groups": [{"key": list(key), **g.to_dict()} for key, g in self.groups.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PriceStatsAggregator":
+        if data.get("version") != STATS_FORMAT_VERSION:
+            raise ValueError(f"Versión de estadísticas no soportada: {data.get('version')}")
+        agg = cls(data["by"], k=int(data["k"]))
+        agg.listings = int(data["listings"])
+        agg.skipped = int(data["skipped"])
+        for g in data["groups"]:
+            agg.groups[tuple(g["key"])] = GroupStats.from_dict(g)
+        return agg
+
+    def save(self, path: str | Path) -> None:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, p)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PriceStatsAggregator":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
@@ -0,0 +1,351 @@
+"""Store SQLite local de listados para análisis offline.
+
+`MarketStore.upsert_listings` guarda resultados paginados en tablas normalizadas
+(listings, items, sellers, stickers) usando WAL y transacciones por lote.
+`MarketStore.query` responde los mismos filtros que `listings:find` sin red.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .models import Listing
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sellers (
+    seller_key TEXT PRIMARY KEY,
+    steam_id TEXT,
+    obfuscated_id TEXT,
+    username TEXT,
+    avatar TEXT,
+    flags INTEGER,
+    online INTEGER,
+    stall_public INTEGER,
+    median_trade_time INTEGER,
+    total_failed_trades INTEGER,
+    total_trades INTEGER,
+    total_verified_trades INTEGER
+);
+CREATE TABLE IF NOT EXISTS items (
+    asset_id TEXT PRIMARY KEY,
+    def_index INTEGER NOT NULL,
+    paint_index INTEGER,
+    paint_seed INTEGER,
+    float_value REAL,
+    icon_url TEXT,
+    d_param TEXT,
+    is_stattrak INTEGER,
+    is_souvenir INTEGER,
+    rarity INTEGER,
+    quality INTEGER,
+    market_hash_name TEXT,
+    tradable INTEGER,
+    inspect_link TEXT,
+    has_screenshot INTEGER,
+    scm_price INTEGER,
+    scm_volume INTEGER,
+    item_name TEXT,
+    wear_name TEXT,
+    description TEXT,
+    collection TEXT,
+    badges TEXT
+);
+CREATE TABLE IF NOT EXISTS listings (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    type TEXT NOT NULL,
+    price INTEGER,
+    description TEXT,
+    state TEXT,
+    seller_key TEXT REFERENCES sellers(seller_key),
+    asset_id TEXT NOT NULL REFERENCES items(asset_id),
+    is_seller INTEGER,
+    min_offer_price INTEGER,
+    max_offer_discount INTEGER,
+    is_watchlisted INTEGER,
+    watchers INTEGER,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stickers (
+    asset_id TEXT NOT NULL REFERENCES items(asset_id),
+    slot INTEGER NOT NULL,
+    sticker_id INTEGER NOT NULL,
+    wear REAL,
+    icon_url TEXT,
+    name TEXT,
+    scm_price INTEGER,
+    scm_volume INTEGER,
+    PRIMARY KEY (asset_id, slot)
+);
+CREATE INDEX IF NOT EXISTS ix_items_def_index ON items(def_index);
+CREATE INDEX IF NOT EXISTS ix_items_paint_index ON items(paint_index);
+CREATE INDEX IF NOT EXISTS ix_items_paint_seed ON items(paint_seed);
+CREATE INDEX IF NOT EXISTS ix_items_float_value ON items(float_value);
+CREATE INDEX IF NOT EXISTS ix_items_collection ON items(collection);
+CREATE INDEX IF NOT EXISTS ix_listings_price ON listings(price);
+CREATE INDEX IF NOT EXISTS ix_listings_asset_id ON listings(asset_id);
+CREATE INDEX IF NOT EXISTS ix_stickers_sticker_id ON stickers(sticker_id);
+"""
+
+_SELLER_COLS = (
+    "seller_key", "steam_id", "obfuscated_id", "username", "avatar", "flags", "online", "stall_public",
+    "median_trade_time", "total_failed_trades", "total_trades", "total_verified_trades",
+)
+_ITEM_COLS = (
+    "asset_id", "def_index", "paint_index", "paint_seed", "float_value", "icon_url", "d_param", "is_stattrak",
+    "is_souvenir", "rarity", "quality", "market_hash_name", "tradable", "inspect_link", "has_screenshot",
+    "scm_price", "scm_volume", "item_name", "wear_name", "description", "collection", "badges",
+)
+_LISTING_COLS = (
+    "id", "created_at", "type", "price", "description", "state", "seller_key", "asset_id", "is_seller",
+    "min_offer_price", "max_offer_discount", "is_watchlisted", "watchers", "synced_at",
+)
+_STICKER_COLS = ("asset_id", "slot", "sticker_id", "wear", "icon_url", "name", "scm_price", "scm_volume")
+
+# Órdenes de `cli_options.SORT_VALUES` que se pueden responder offline
+_ORDER_BY = {
+    "lowest_price": "l.price ASC",
+    "highest_price": "l.price DESC",
+    "most_recent": "l.created_at DESC",
+    "lowest_float": "i.float_value ASC",
+    "highest_float": "i.float_value DESC",
+    "best_deal": "(CAST(i.scm_price - l.price AS REAL) / i.scm_price) DESC",
+    "highest_discount": "(CAST(i.scm_price - l.price AS REAL) / i.scm_price) DESC",
+}
+
+
+def _upsert_sql(table: str, cols: Sequence[str], key: str) -> str:
+    placeholders = ", ".join("?" for _ in cols)
+    updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c != key)
+    return (
+        f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders}) "
+        f"ON CONFLICT({key}) DO UPDATE SET {updates}"
+    )
+
+
+def _parse_stickers_filter(raw: str) -> List[Tuple[int, Optional[int]]]:
+    out: List[Tuple[int, Optional[int]]] = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        sid, _, pos = part.partition("|")
+        out.append((int(sid), int(pos) if pos else None))
+    return out
+
+
+class MarketStore:
+    """Base SQLite con listados, ítems, vendedores y stickers."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=OFF")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "MarketStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # Escritura
+
+    def _rows(self, l: Listing, now: float) -> Tuple[Optional[tuple], tuple, tuple, List[tuple]]:
+        s, it = l.seller, l.item
+        seller_key = s.steam_id or s.obfuscated_id
+        seller_row = None
+        if seller_key:
+            st = s.statistics
+            seller_row = (
+                seller_key, s.steam_id, s.obfuscated_id, s.username, s.avatar, s.flags, s.online, s.stall_public,
+                st.median_trade_time if st else None, st.total_failed_trades if st else None,
+                st.total_trades if st else None, st.total_verified_trades if st else None,
+            )
+        item_row = (
+            it.asset_id, it.def_index, it.paint_index, it.paint_seed, it.float_value, it.icon_url, it.d_param,
+            it.is_stattrak, it.is_souvenir, it.rarity, it.quality, it.market_hash_name, it.tradable,
+            it.inspect_link, it.has_screenshot, it.scm.price if it.scm else None, it.scm.volume if it.scm else None,
+            it.item_name, it.wear_name, it.description, it.collection, json.dumps(it.badges),
+        )
+        listing_row = (
+            l.id, l.created_at.isoformat(), l.type, l.price, l.description, l.state, seller_key, it.asset_id,
+            l.is_seller, l.min_offer_price, l.max_offer_discount, l.is_watchlisted, l.watchers, now,
+        )
+        sticker_rows = [
+            (
+                it.asset_id, st.slot, st.stickerId, st.wear, st.icon_url, st.name,
+                st.scm.price if st.scm else None, st.scm.volume if st.scm else None,
+            )
+            for st in it.stickers
+        ]
+        return seller_row, item_row, listing_row, sticker_rows
+
+    def _write_batch(self, batch: Sequence[Listing]) -> None:
+        now = time.time()
+        sellers: List[tuple] = []
+        items: List[tuple] = []
+        listings: List[tuple] = []
+        stickers: List[tuple] = []
+        for l in batch:
+            seller_row, item_row, listing_row, sticker_rows = self._rows(l, now)
+            if seller_row is not None:
+                sellers.append(seller_row)
+            items.append(item_row)
+            listings.append(listing_row)
+            stickers.extend(sticker_rows)
+        with self.conn:
+            self.conn.executemany(_upsert_sql("sellers", _SELLER_COLS, "seller_key"), sellers)
+            self.conn.executemany(_upsert_sql("items", _ITEM_COLS, "asset_id"), items)
+            self.conn.executemany(_upsert_sql("listings", _LISTING_COLS, "id"), listings)
+            self.conn.executemany("DELETE FROM stickers WHERE asset_id = ?", [(r[0],) for r in items])
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO stickers ({', '.join(_STICKER_COLS)}) VALUES ({', '.join('?' for _ in _STICKER_COLS)})",
+                stickers,
+            )
+
+    def upsert_listings(self, listings: Iterable[Listing], *, batch_size: int = 500) -> int:
+        """Inserta/actualiza listados en transacciones de `batch_size`. Retorna cantidad."""
+        batch: List[Listing] = []
+        count = 0
+        for l in listings:
+            batch.append(l)
+            if len(batch) >= batch_size:
+                self._write_batch(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch)
+            count += len(batch)
+        return count
+
+    # Lectura
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def query(self, **filters: Any) -> List[Listing]:
+        """Consulta offline con los mismos filtros que `get_listings_page`.
+
+        Soporta `limit` (default 50), `sort_by` (ver `_ORDER_BY`) y los filtros
+        category, def_index, min/max_float, rarity, paint_seed, paint_index,
+        user_id, collection, min/max_price, market_hash_name, type y stickers.
+        """
+        where: List[str] = []
+        args: List[Any] = []
+
+        def _eq(col: str, key: str) -> None:
+            if filters.get(key) is not None:
+                where.append(f"{col} = ?")
+                args.append(filters[key])
+
+        category = filters.get("category")
+        if category == 1:
+            where.append("COALESCE(i.is_stattrak, 0) = 0 AND COALESCE(i.is_souvenir, 0) = 0")
+        elif category == 2:
+            where.append("i.is_stattrak = 1")
+        elif category == 3:
+            where.append("i.is_souvenir = 1")
+
+        def_index = filters.get("def_index")
+        if def_index is not None and def_index != []:
+            values = list(def_index) if isinstance(def_index, (list, tuple, set)) else [def_index]
+            where.append(f"i.def_index IN ({', '.join('?' for _ in values)})")
+            args.extend(values)
+
+        if filters.get("min_float") is not None:
+            where.append("i.float_value >= ?")
+            args.append(filters["min_float"])
+        if filters.get("max_float") is not None:
+            where.append("i.float_value <= ?")
+            args.append(filters["max_float"])
+        if filters.get("min_price") is not None:
+            where.append("l.price >= ?")
+            args.append(filters["min_price"])
+        if filters.get("max_price") is not None:
+            where.append("l.price <= ?")
+            args.append(filters["max_price"])
+        _eq("i.rarity", "rarity")
+        _eq("i.paint_seed", "paint_seed")
+        _eq("i.paint_index", "paint_index")
+        _eq("s.steam_id", "user_id")
+        _eq("i.collection", "collection")
+        _eq("i.market_hash_name", "market_hash_name")
+        _eq("l.type", "type")
+
+        if filters.get("stickers"):
+            for sid, slot in _parse_stickers_filter(filters["stickers"]):
+                cond = "EXISTS (SELECT 1 FROM stickers st WHERE st.asset_id = i.asset_id AND st.sticker_id = ?"
+                args.append(sid)
+                if slot is not None:
+                    cond += " AND st.slot = ?"
+                    args.append(slot)
+                where.append(cond + ")")
+
+        sort_by = filters.get("sort_by")
+        if sort_by is not None and sort_by not in _ORDER_BY:
+            raise ValueError(f"sort_by={sort_by} no está soportado offline. Opciones: {', '.join(_ORDER_BY)}")
+        order = _ORDER_BY.get(sort_by or "most_recent")
+        limit = int(filters.get("limit") or 50)
+
+        sql = (
+            "SELECT l.id, l.created_at, l.type, l.price, l.description, l.state, l.is_seller, l.min_offer_price, "
+            "l.max_offer_discount, l.is_watchlisted, l.watchers, "
+            f"{', '.join('i.' + c for c in _ITEM_COLS)}, "
+            f"{', '.join('s.' + c for c in _SELLER_COLS[1:])} "
+            "FROM listings l JOIN items i ON i.asset_id = l.asset_id "
+            "LEFT JOIN sellers s ON s.seller_key = l.seller_key"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order}, l.id LIMIT ?"
+        args.append(limit)
+
+        rows = self.conn.execute(sql, args).fetchall()
+        stickers = self._stickers_for([r[11] for r in rows])
+        return [self._to_listing(r, stickers) for r in rows]
+
+    def _stickers_for(self, asset_ids: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        if not asset_ids:
+            return out
+        sql = (
+            f"SELECT {', '.join(_STICKER_COLS)} FROM stickers "
+            f"WHERE asset_id IN ({', '.join('?' for _ in asset_ids)}) ORDER BY asset_id, slot"
+        )
+        for row in self.conn.execute(sql, list(asset_ids)):
+            asset_id, slot, sid, wear, icon_url, name, scm_price, scm_volume = row
+            out.setdefault(asset_id, []).append({
+                "stickerId": sid, "slot": slot, "wear": wear, "icon_url": icon_url, "name": name,
+                "scm": {"price": scm_price, "volume": scm_volume} if scm_price is not None or scm_volume is not None else None,
+            })
+        return out
+
+    @staticmethod
+    def _to_listing(row: Sequence[Any], stickers: Mapping[str, List[Dict[str, Any]]]) -> Listing:
+        listing = dict(zip(
+            ("id", "created_at", "type", "price", "description", "state", "is_seller", "min_offer_price",
+             "max_offer_discount", "is_watchlisted", "watchers"),
+            row[:11],
+        ))
+        item = dict(zip(_ITEM_COLS, row[11:11 + len(_ITEM_COLS)]))
+        seller_vals = dict(zip(_SELLER_COLS[1:], row[11 + len(_ITEM_COLS):]))
+        scm_price, scm_volume = item.pop("scm_price"), item.pop("scm_volume")
+        item["scm"] = {"price": scm_price, "volume": scm_volume} if scm_price is not None or scm_volume is not None else None
+        item["badges"] = json.loads(item["badges"]) if item["badges"] else []
+        item["stickers"] = stickers.get(item["asset_id"], [])
+        stats_keys = ("median_trade_time", "total_failed_trades", "total_trades", "total_verified_trades")
+        stats = {k: seller_vals.pop(k) for k in stats_keys}
+        seller_vals["statistics"] = stats if any(v is not None for v in stats.values()) else None
+        listing["item"] = item
+        listing["seller"] = seller_vals
+        return Listing.model_validate(listing)
@@ -1,71 +1,339 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import asdict
+import heapq
+import itertools
+import json
+import os
+import queue
+import threading
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Literal, Mapping, MutableMapping, Optional, Sequence, Set, Tuple, Union, overload
 
+from .compact import CompactListing, CompactPool
+from .query import build_query
 from .models import Listing, ListingsPage
 from . import endpoints as _ep
 
+if TYPE_CHECKING:
+    from .http import CSFloatSession
 
-def build_query(filters: Mapping[str, Any] | None) -> List[Tuple[str, str]]:
-    """Construye la query en orden determinístico (alfabético por clave, luego por valor).
 
-    - Omite claves con valor None.
-    - Para secuencias, repite la clave por cada valor (p.ej. def_index=1&def_index=2).
-    - Convierte valores a str de forma segura.
+def _fetch_pages(
+    filters: Dict[str, Any],
+    max_pages: Optional[int],
+    session: Optional["CSFloatSession"],
+    fetch: Optional[Callable[..., Any]] = None,
+) -> Iterator[Any]:
+    fetch = fetch or _ep.get_listings_page
+    pages = 0
+    while True:
+        page = fetch(session=session, **filters)
+        yield page
+        pages += 1
+        if max_pages is not None and pages >= max_pages:
+            break
+        if not page.next_cursor:
+            break
+        filters = dict(filters)
+        filters["cursor"] = page.next_cursor
+
+
+class _PrefetchError:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+_PREFETCH_DONE = object()
+# Espera máxima por la request en curso del worker al cerrar el generador
+_PREFETCH_JOIN_TIMEOUT = 15.0
+
+
+def _prefetch_pages(pages: Iterator[ListingsPage], depth: int) -> Iterator[ListingsPage]:
+    """Consume `pages` en un hilo de fondo, con hasta `depth` páginas adelantadas.
+
+    Si el consumidor deja de iterar (break, excepción o `close()`), el worker se
+    detiene tras la request en curso y no pide más páginas; el cierre espera a
+    que el hilo termine (hasta `_PREFETCH_JOIN_TIMEOUT`).
     """
-    if not filters:
-        return []
-    pairs: List[Tuple[str, str]] = []
-    for k, v in filters.items():
-        if v is None:
-            continue
-        if isinstance(v, (list, tuple, set)):
-            for vv in v:
-                if vv is None:
-                    continue
-                pairs.append((k, _to_str(vv)))
-        else:
-            pairs.append((k, _to_str(v)))
-    pairs.sort(key=lambda kv: (kv[0], kv[1]))
-    return pairs
+    q: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker() -> None:
+        try:
+            for page in pages:
+                if not _put(page):
+                    return
+            _put(_PREFETCH_DONE)
+        except BaseException as e:  # propagar al consumidor
+            _put(_PrefetchError(e))
+        finally:
+            pages.close()  # type: ignore[attr-defined]
+
+    t = threading.Thread(target=_worker, name="csfloat-prefetch", daemon=True)
+    t.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _PREFETCH_DONE:
+                return
+            if isinstance(item, _PrefetchError):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        t.join(timeout=_PREFETCH_JOIN_TIMEOUT)
+
+
+def iter_listing_pages(
+    *,
+    initial_filters: Optional[Mapping[str, Any]] = None,
+    max_pages: Optional[int] = None,
+    session: Optional["CSFloatSession"] = None,
+    prefetch: int = 0,
+) -> Iterator[ListingsPage]:
+    """Itera páginas completas (`ListingsPage`) siguiendo el cursor.
+
+    Con `prefetch > 0`, un hilo de fondo pide la página siguiente apenas se
+    conoce su cursor, manteniendo hasta `prefetch` páginas en cola mientras el
+    consumidor procesa la actual.
+    """
+    pages = _fetch_pages(dict(initial_filters or {}), max_pages, session)
+    if prefetch > 0:
+        return _prefetch_pages(pages, prefetch)
+    return pages
+
+
+@overload
+def paginate_listings(
+    *,
+    initial_filters: Optional[Mapping[str, Any]] = ...,
+    max_pages: Optional[int] = ...,
+    session: Optional["CSFloatSession"] = ...,
+    prefetch: int = ...,
+    compact: Literal[False] = ...,
+) -> Iterator[Listing]: ...
 
 
-def _to_str(value: Any) -> str:
-    if isinstance(value, float):
-        # Evitar notación científica y normalizar
-        return format(value, ".10g")
-    return str(value)
+@overload
+def paginate_listings(
+    *,
+    initial_filters: Optional[Mapping[str, Any]] = ...,
+    max_pages: Optional[int] = ...,
+    session: Optional["CSFloatSession"] = ...,
+    prefetch: int = ...,
+    compact: Union[Literal[True], CompactPool],
+) -> Iterator[CompactListing]: ...
 
 
 def paginate_listings(
     *,
     initial_filters: Optional[Mapping[str, Any]] = None,
     max_pages: Optional[int] = None,
-) -> Iterator[Listing]:
+    session: Optional["CSFloatSession"] = None,
+    prefetch: int = 0,
+    compact: Union[bool, CompactPool] = False,
+) -> Iterator[Union[Listing, CompactListing]]:
     """Itera listados usando cursor hasta agotar páginas o alcanzar `max_pages`.
 
     Nota: requiere que el servidor devuelva un cursor (p.ej. en header `X-Next-Cursor`).
+    Todas las páginas se piden sobre la misma `session` (o la compartida por defecto),
+    reutilizando conexiones keep-alive. `prefetch` activa la lectura anticipada de
+    páginas (ver `iter_listing_pages`).
+
+    Con `compact=True` (o un `CompactPool` a compartir entre llamadas) se emiten
+    `CompactListing` construidos desde el JSON crudo, sin modelos pydantic (ver
+    `compact`); pensado para retener muchos listings en memoria.
     """
-    filters: Dict[str, Any] = dict(initial_filters or {})
-    pages = 0
-    while True:
-        page: ListingsPage = _ep.get_listings_page(**filters)
-        for it in page.items:
-            yield it
-        pages += 1
-        if max_pages is not None and pages >= max_pages:
-            break
-        if not page.next_cursor:
-            break
-        filters = dict(filters)
-        filters["cursor"] = page.next_cursor
+    if compact is not False:
+        pool = compact if isinstance(compact, CompactPool) else CompactPool()
+        raw = _fetch_pages(dict(initial_filters or {}), max_pages, session, _ep.get_listings_page_raw)
+        for raw_page in _prefetch_pages(raw, prefetch) if prefetch > 0 else raw:
+            for data in raw_page.items:
+                yield pool.listing(data)
+        return
+    for page in iter_listing_pages(
+        initial_filters=initial_filters, max_pages=max_pages, session=session, prefetch=prefetch
+    ):
+        yield from page.items
+
+
+# Rangos de float por desgaste (FN, MW, FT, WW, BS)
+WEAR_RANGES: Tuple[Tuple[float, float], ...] = ((0.0, 0.07), (0.07, 0.15), (0.15, 0.38), (0.38, 0.45), (0.45, 1.0))
+
 
+def wear_position(float_value: float) -> float:
+    """Posición relativa del float dentro de su rango de desgaste (0 = el mejor posible)."""
+    for low, high in WEAR_RANGES:
+        if float_value < high or high == 1.0:
+            return min(max((float_value - low) / (high - low), 0.0), 1.0)
+    return 1.0
 
-def export_listings_csv(listings: Sequence[Listing], out_path: str | Path) -> int:
-    """Exporta listados a CSV. Retorna cantidad de filas escritas.
+
+def score_discount(l: Listing) -> Optional[float]:
+    """Descuento vs `item.scm.price` (0.2 = 20% por debajo de SCM)."""
+    scm = l.item.scm.price if l.item.scm is not None else None
+    if not scm or l.price is None:
+        return None
+    return 1.0 - l.price / scm
+
+
+def score_price_per_float(l: Listing) -> Optional[float]:
+    """Precio por calidad de float, negado (mayor = mejor).
+
+    La calidad va de 2 (mejor float de su desgaste) a 1 (peor), así que un float
+    de punta de rango "vale" hasta el doble que uno del borde malo.
+    """
+    fv = l.item.float_value
+    if l.price is None or fv is None:
+        return None
+    return -l.price / (2.0 - wear_position(fv))
+
+
+def score_sticker_value(l: Listing) -> Optional[float]:
+    """Suma de `Sticker.scm.price` (centavos) de los stickers aplicados."""
+    values = [s.scm.price for s in l.item.stickers if s.scm is not None and s.scm.price]
+    return float(sum(values)) if values else None
+
+
+ListingScore = Callable[[Listing], Optional[float]]
+
+TOP_SCORES: Dict[str, ListingScore] = {
+    "discount": score_discount,
+    "price_per_float": score_price_per_float,
+    "sticker_value": score_sticker_value,
+}
+
+
+class TopK:
+    """Los `k` listings de mayor score vistos hasta ahora, en memoria O(k).
+
+    Min-heap de tamaño `k`: cada listing nuevo se compara contra el peor del
+    top y solo entra si lo supera (O(log k)). Los listings sin score (None) se
+    ignoran y los ids ya presentes en el top no se duplican.
+    """
+
+    def __init__(self, k: int, score: Union[str, ListingScore] = "discount") -> None:
+        if k < 1:
+            raise ValueError("k debe ser >= 1")
+        if isinstance(score, str):
+            if score not in TOP_SCORES:
+                raise ValueError(f"score debe ser uno de {tuple(TOP_SCORES)}")
+            score = TOP_SCORES[score]
+        self.k = k
+        self.score = score
+        self.seen = 0
+        self.scored = 0
+        self._heap: List[Tuple[float, int, Listing]] = []
+        self._ids: Set[str] = set()
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, l: Listing) -> bool:
+        """Ofrece un listing; True si entró al top."""
+        self.seen += 1
+        value = self.score(l)
+        if value is None:
+            return False
+        self.scored += 1
+        if l.id in self._ids:
+            return False
+        # Desempate: ante igual score queda el que llegó primero
+        entry = (value, -next(self._seq), l)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            self._ids.discard(heapq.heapreplace(self._heap, entry)[2].id)
+        else:
+            return False
+        self._ids.add(l.id)
+        return True
+
+    def leaders(self) -> List[Tuple[float, Listing]]:
+        """(score, listing) del top, de mayor a menor score."""
+        return [(v, l) for v, _, l in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+def top_listings(
+    listings: Iterable[Listing],
+    k: int = 10,
+    *,
+    score: Union[str, ListingScore] = "discount",
+    on_enter: Optional[Callable[[TopK, Listing], None]] = None,
+) -> List[Tuple[float, Listing]]:
+    """Top-`k` por `score` de un stream (p.ej. `paginate_listings(...)`) sin retenerlo.
+
+    `score` es un nombre de `TOP_SCORES` o una función `Listing -> float | None`
+    (mayor = mejor). `on_enter(top, listing)` se llama cada vez que un listing
+    entra al top, para mostrar líderes parciales.
+    """
+    top = TopK(k, score)
+    for l in listings:
+        if top.push(l) and on_enter is not None:
+            on_enter(top, l)
+    return top.leaders()
+
+
+CSV_HEADERS = [
+    "id",
+    "created_at",
+    "type",
+    "price",
+    "state",
+    "market_hash_name",
+    "float_value",
+    "paint_seed",
+    "paint_index",
+    "def_index",
+    "inspect_link",
+    "seller_steam_id",
+    "watchers",
+    "min_offer_price",
+]
+
+
+def _csv_row(l: Listing) -> List[Any]:
+    return [
+        l.id,
+        l.created_at.isoformat(),
+        l.type,
+        l.price if l.price is not None else "",
+        l.state or "",
+        l.item.market_hash_name or "",
+        l.item.float_value if l.item.float_value is not None else "",
+        l.item.paint_seed if l.item.paint_seed is not None else "",
+        l.item.paint_index if l.item.paint_index is not None else "",
+        l.item.def_index,
+        l.item.inspect_link or "",
+        l.seller.steam_id or "",
+        l.watchers if l.watchers is not None else "",
+        l.min_offer_price if l.min_offer_price is not None else "",
+    ]
+
+
+def export_listings_csv(
+    listings: Iterable[Listing],
+    out_path: str | Path,
+    *,
+    flush_every: int = 50,
+) -> int:
+    """Exporta listados a CSV en streaming. Retorna cantidad de filas escritas.
+
+    `listings` puede ser cualquier iterable (p.ej. `paginate_listings(...)`): las filas
+    se escriben a medida que llegan y el archivo se vacía a disco cada `flush_every`
+    filas, sin retener los `Listing` en memoria.
 
     Columnas principales: id, created_at, type, price, state, market_hash_name, float_value,
     paint_seed, paint_index, def_index, inspect_link, seller_steam_id, watchers, min_offer_price.
@@ -73,44 +341,56 @@ def export_listings_csv(listings: Sequence[Listing], out_path: str | Path) -> in
     path = Path(out_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    headers = [
-        "id",
-        "created_at",
-        "type",
-        "price",
-        "state",
-        "market_hash_name",
-        "float_value",
-        "paint_seed",
-        "paint_index",
-        "def_index",
-        "inspect_link",
-        "seller_steam_id",
-        "watchers",
-        "min_offer_price",
-    ]
-
     with path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(headers)
+        writer.writerow(CSV_HEADERS)
         count = 0
         for l in listings:
-            row = [
-                l.id,
-                l.created_at.isoformat(),
-                l.type,
-                l.price if l.price is not None else "",
-                l.state or "",
-                l.item.market_hash_name or "",
-                l.item.float_value if l.item.float_value is not None else "",
-                l.item.paint_seed if l.item.paint_seed is not None else "",
-                l.item.paint_index if l.item.paint_index is not None else "",
-                l.item.def_index,
-                l.item.inspect_link or "",
-                l.seller.steam_id or "",
-                l.watchers if l.watchers is not None else "",
-                l.min_offer_price if l.min_offer_price is not None else "",
-            ]
-            writer.writerow(row)
+            writer.writerow(_csv_row(l))
             count += 1
+            if flush_every and count % flush_every == 0:
+                f.flush()
         return count
+
+
+@dataclass
+class ExportCheckpoint:
+    """Estado confirmado de un export, guardado en un sidecar JSON tras cada página.
+
+    - `cursor`: próximo cursor a pedir (None si no quedan páginas).
+    - `offset`: bytes del archivo de salida confirmados; al reanudar se trunca ahí,
+      descartando filas escritas después del último checkpoint.
+    - `format`: formato del archivo (csv|ndjson); solo se reanuda con el mismo.
+    """
+
+    filters: Dict[str, Any]
+    cursor: Optional[str] = None
+    rows: int = 0
+    pages: int = 0
+    offset: int = 0
+    format: str = "csv"  # checkpoints previos a ndjson no lo guardaban: eran csv
+
+    @staticmethod
+    def path_for(out_path: str | Path) -> Path:
+        return Path(f"{out_path}.checkpoint.json")
+
+    @classmethod
+    def load(cls, path: str | Path) -> Optional["ExportCheckpoint"]:
+        p = Path(path)
+        if not p.exists():
+            return None
+        data = json.loads(p.read_text(encoding="utf-8"))
+        return cls(**data)
+
+    def save(self, path: str | Path) -> None:
+        p = Path(path)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(self), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def matches(self, filters: Mapping[str, Any]) -> bool:
+        """True si `filters` (sin cursor) equivale a los filtros guardados."""
+        def _norm(f: Mapping[str, Any]) -> List[Tuple[str, str]]:
+            return build_query({k: v for k, v in f.items() if k != "cursor"})
+        return _norm(self.filters) == _norm(filters)
+
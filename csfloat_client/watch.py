@@ -0,0 +1,189 @@
+"""Feed incremental de listings nuevos (`csf listings:watch`).
+
+Consulta `most_recent` en ciclos y solo pagina hasta alcanzar la marca de
+agua (el listing más nuevo visto en el ciclo anterior, por `created_at` e id):
+en régimen normal es una request por ciclo. El intervalo se adapta: baja a la
+mitad cuando aparecen listings nuevos y crece un 50% cuando no hay novedades,
+dentro de `[min_interval, max_interval]`.
+
+Opcionalmente detecta cambios de precio de los listings que siguen en las
+páginas recorridas (se recuerda el último precio visto de un número acotado
+de ids).
+
+Sin `session` explícita, el watcher consulta con una sesión propia sin cache
+HTTP: con `CSFLOAT_CACHE_DIR` activo cada ciclo vería la página cacheada y los
+listings nuevos llegarían recién al vencer el TTL.
+
+Un error HTTP en un ciclo no corta el feed: `run` lo reporta por `on_error`,
+lleva el intervalo a `max_interval` y sigue consultando.
+"""
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from . import endpoints as _ep
+from .http import DISABLED, CSFloatHTTPError, CSFloatSession
+from .models import Listing
+
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 60.0
+DEFAULT_MAX_PAGES_PER_CYCLE = 10
+_KNOWN_PRICES_MAX = 20_000
+
+
+@dataclass
+class WatchEvent:
+    """Evento del feed: `new` (listing nuevo) o `price_change`."""
+
+    event: str
+    listing: Listing
+    old_price: Optional[int] = None
+
+    def to_json(self) -> str:
+        data: Dict[str, Any] = {"event": self.event, "ts": round(time.time(), 3), "id": self.listing.id}
+        if self.event == "price_change":
+            data["old_price"] = self.old_price
+            data["new_price"] = self.listing.price
+        data["listing"] = json.loads(self.listing.model_dump_json())
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+class ListingWatcher:
+    """Detecta listings nuevos comparando contra una marca de agua.
+
+    - `filters`: mismos filtros que `listings:find` (`sort_by`/`cursor` se ignoran).
+    - `emit_initial`: si es False (default), el primer ciclo solo fija la marca.
+    - `track_prices`: emitir `price_change` para listings ya vistos.
+    - `max_pages_per_cycle`: tope de páginas si hubo una avalancha de nuevos.
+    - `session`: por defecto una sesión propia sin cache (se cierra con `close`
+      o al terminar `run`); una sesión explícita se usa tal cual.
+    - `on_error`: recibe cada `CSFloatHTTPError` de un ciclo fallido en `run`.
+    """
+
+    def __init__(
+        self,
+        filters: Optional[Mapping[str, Any]] = None,
+        *,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        emit_initial: bool = False,
+        track_prices: bool = False,
+        max_pages_per_cycle: int = DEFAULT_MAX_PAGES_PER_CYCLE,
+        session: Optional[CSFloatSession] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        on_error: Optional[Callable[[CSFloatHTTPError], None]] = None,
+    ) -> None:
+        self.filters = {k: v for k, v in (filters or {}).items() if k not in ("sort_by", "cursor")}
+        self.filters["sort_by"] = "most_recent"
+        self.filters.setdefault("limit", 50)
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.interval = min_interval
+        self.emit_initial = emit_initial
+        self.track_prices = track_prices
+        self.max_pages_per_cycle = max(max_pages_per_cycle, 1)
+        self._owns_session = session is None
+        self.session = session if session is not None else CSFloatSession(cache=DISABLED)
+        self.sleep = sleep
+        self.on_error = on_error
+        self.cycles = 0
+        self.requests = 0
+        self.errors = 0
+        # Marca de agua: created_at más nuevo visto y los ids con ese created_at
+        self._mark: Optional[datetime] = None
+        self._mark_ids: Set[str] = set()
+        self._prices: "OrderedDict[str, Optional[int]]" = OrderedDict()
+
+    def _reached(self, l: Listing) -> bool:
+        if self._mark is None:
+            return False
+        return l.created_at < self._mark or (l.created_at == self._mark and l.id in self._mark_ids)
+
+    def _price_event(self, l: Listing) -> Optional[WatchEvent]:
+        old = self._prices.get(l.id, l.price)
+        self._prices[l.id] = l.price
+        self._prices.move_to_end(l.id)
+        while len(self._prices) > _KNOWN_PRICES_MAX:
+            self._prices.popitem(last=False)
+        if self.track_prices and old != l.price:
+            return WatchEvent("price_change", l, old_price=old)
+        return None
+
+    def poll(self) -> List[WatchEvent]:
+        """Un ciclo: pagina hasta la marca de agua y devuelve los eventos."""
+        first = self._mark is None
+        new: List[Listing] = []
+        changes: List[WatchEvent] = []
+        newest: Optional[Tuple[datetime, Set[str]]] = None
+        filters: Dict[str, Any] = dict(self.filters)
+        for _ in range(self.max_pages_per_cycle):
+            page = _ep.get_listings_page(session=self.session, **filters)
+            self.requests += 1
+            reached = False
+            for l in page.items:
+                if newest is None or l.created_at > newest[0]:
+                    newest = (l.created_at, {l.id})
+                elif l.created_at == newest[0]:
+                    newest[1].add(l.id)
+                if self._reached(l):
+                    reached = True
+                    event = self._price_event(l)
+                    if event is not None:
+                        changes.append(event)
+                    continue
+                self._price_event(l)
+                new.append(l)
+            # La primera vez basta una página para fijar la marca
+            if reached or first or not page.next_cursor:
+                break
+            filters["cursor"] = page.next_cursor
+        if newest is not None and (self._mark is None or newest[0] >= self._mark):
+            if self._mark is not None and newest[0] == self._mark:
+                self._mark_ids |= newest[1]
+            else:
+                self._mark, self._mark_ids = newest
+        self.cycles += 1
+        events = [WatchEvent("new", l) for l in new] if (self.emit_initial or not first) else []
+        events.extend(changes)
+        if not first:
+            self._adapt(bool(new))
+        return events
+
+    def _adapt(self, had_new: bool) -> None:
+        if had_new:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+
+    def close(self) -> None:
+        if self._owns_session:
+            self.session.close()
+
+    def run(self, max_cycles: Optional[int] = None) -> Iterator[WatchEvent]:
+        """Ciclos indefinidos (o `max_cycles`), durmiendo `interval` entre ciclos.
+
+        Un ciclo que falla con `CSFloatHTTPError` cuenta como ciclo, no mueve la
+        marca de agua y espera `max_interval` antes del siguiente.
+        """
+        try:
+            while max_cycles is None or self.cycles < max_cycles:
+                try:
+                    events = self.poll()
+                except CSFloatHTTPError as e:
+                    self.cycles += 1
+                    self.errors += 1
+                    self.interval = self.max_interval
+                    if self.on_error is not None:
+                        self.on_error(e)
+                else:
+                    yield from events
+                if max_cycles is not None and self.cycles >= max_cycles:
+                    return
+                self.sleep(self.interval)
+        finally:
+            self.close()
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from csfloat_client.frame import ListingsFrame
+from csfloat_client.utils import paginate_listings
+
+
+def main() -> None:
+    # Requiere numpy. Recorre varias páginas y filtra/ordena vectorizado en memoria.
+    frame = ListingsFrame.from_listings(
+        paginate_listings(
+            initial_filters={"limit": 50, "market_hash_name": "AK-47 | Redline (Field-Tested)"},
+            max_pages=20,
+            prefetch=1,
+        )
+    )
+    best = frame.filter(max_float=0.2).top_k("price", 10)
+    for row in best.to_records():
+        print(row["id"], row["price"], f"{row['float_value']:.6f}", row["paint_seed"])
+    print("min price por seed:", frame.group_by("paint_seed", "price", "min"))
+
+
+if __name__ == "__main__":
+    main()
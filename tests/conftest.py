@@ -6,6 +6,8 @@ from typing import Any, Dict
 import pytest
 
 from csfloat_client.config import get_settings
+from csfloat_client.entities import get_entity_cache
+from csfloat_client.http import set_default_log_mode, set_log_mode
 
 
 @pytest.fixture(autouse=True)
@@ -18,12 +20,21 @@ def _no_sleep_and_reset_env(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setenv("CSFLOAT_IGNORE_DOTENV", "1")
     # Quitar API key por defecto
     monkeypatch.delenv("CSFLOAT_API_KEY", raising=False)
+    # Logging en modo automático salvo que el test lo cambie
+    monkeypatch.delenv("CSFLOAT_LOG", raising=False)
+    monkeypatch.delenv("CSFLOAT_LOG_SAMPLE", raising=False)
     # Resetear cache de settings en cada test
     try:
         get_settings.cache_clear()  # type: ignore[attr-defined]
     except Exception:
         pass
+    # Vaciar el identity map para que ningún test vea listings de otro
+    cache = get_entity_cache()
+    if cache is not None:
+        cache.clear()
     yield
+    set_log_mode(None)
+    set_default_log_mode(None)
     try:
         get_settings.cache_clear()  # type: ignore[attr-defined]
     except Exception:
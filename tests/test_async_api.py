@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import respx
+from httpx import Response
+
+from csfloat_client import aio
+from csfloat_client.http import CSFloatHTTPError
+
+
+@respx.mock
+def test_async_concurrent_get_listing_with_retry(make_listing):
+    respx.get("https://csfloat.com/api/v1/listings/a").mock(
+        side_effect=[
+            Response(429, headers={"Retry-After": "0"}),
+            Response(200, json=make_listing(id="a")),
+        ]
+    )
+    respx.get("https://csfloat.com/api/v1/listings/b").mock(return_value=Response(200, json=make_listing(id="b")))
+
+    async def _run():
+        async with aio.AsyncCSFloatSession() as session:
+            return await asyncio.gather(
+                aio.get_listing("a", session=session),
+                aio.get_listing("b", session=session),
+            )
+
+    a, b = asyncio.run(_run())
+    assert (a.id, b.id) == ("a", "b")
+
+
+@respx.mock
+def test_async_paginate_follows_cursor_and_400_raises(make_listing):
+    def _callback(request):
+        if request.url.params.get("cursor") is None:
+            return Response(200, json=[make_listing(id="one")], headers={"X-Next-Cursor": "abc"})
+        return Response(200, json={"data": [make_listing(id="two")]})
+
+    respx.get("https://csfloat.com/api/v1/listings").mock(side_effect=_callback)
+    route = respx.post("https://csfloat.com/api/v1/listings").mock(return_value=Response(400, json={"error": "bad"}))
+
+    async def _run():
+        ids = [l.id async for l in aio.paginate_listings(initial_filters={"limit": 1})]
+        with pytest.raises(CSFloatHTTPError):
+            await aio.post_listing(asset_id="1", price=100)
+        shared = aio.get_default_async_session()
+        assert shared._client is not None
+        await aio.aclose_default_session()
+        assert shared._client is None and aio.get_default_async_session() is not shared
+        await aio.aclose_default_session()
+        return ids
+
+    assert asyncio.run(_run()) == ["one", "two"]
+    assert route.call_count == 1
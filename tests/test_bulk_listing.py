@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import csv
+import json
+
+import pytest
+import respx
+from httpx import Response
+from typer.testing import CliRunner
+
+from csfloat_client.bulk import BulkValidationError, post_listings, prepare_listing_posts
+from csfloat_client.cli import app
+from csfloat_client.config import get_settings
+
+LISTINGS_URL = "https://csfloat.com/api/v1/listings"
+
+
+@pytest.fixture(autouse=True)
+def _api_key(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("CSFLOAT_API_KEY", "abc123")
+    monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+
+def test_validation_runs_up_front_and_reports_every_invalid_row():
+    rows = [
+        {"asset_id": "1", "price": "100"},
+        {"asset_id": "2", "type": "buy_now"},  # sin price
+        {"asset_id": "3", "type": "auction", "reserve_price": "50", "duration_days": "2"},
+        {"asset_id": "1", "price": "200"},  # repetido
+        {"asset_id": "4", "price": "abc"},
+    ]
+    with pytest.raises(BulkValidationError) as exc:
+        prepare_listing_posts(rows)
+    assert [p.row for p in exc.value.invalid] == [2, 3, 4, 5]
+
+    posts = prepare_listing_posts([{"asset_id": "5", "price": "300", "private": "true"}, {"asset_id": "6", "type": "auction", "reserve_price": 10, "duration_days": 7}])
+    assert posts[0].body == {"asset_id": 5, "type": "buy_now", "price": 300, "private": True}
+    assert posts[1].body["duration_days"] == 7
+
+
+@respx.mock
+def test_post_listings_keeps_going_after_errors(make_listing):
+    def _callback(request):
+        body = json.loads(request.content)
+        if body["asset_id"] == 2:
+            return Response(400, json={"detail": "item not tradable"})
+        return Response(200, json=make_listing(id=f"L{body['asset_id']}", asset_id=str(body["asset_id"]), fv=0.2, seed=1, price=body["price"]))
+
+    route = respx.post(LISTINGS_URL).mock(side_effect=_callback)
+    posts = prepare_listing_posts([{"asset_id": str(i), "price": 100 * i} for i in range(1, 6)])
+    done = list(post_listings(posts, concurrency=2))
+
+    assert route.call_count == 5
+    assert sorted(p.row for p in done) == [1, 2, 3, 4, 5]
+    assert [p.status for p in posts] == ["ok", "error", "ok", "ok", "ok"]
+    assert posts[3].listing.id == "L4"
+
+
+@respx.mock
+def test_cli_results_file_retries_only_failures(tmp_path, make_listing):
+    attempts: dict[int, int] = {}
+
+    def _callback(request):
+        asset = json.loads(request.content)["asset_id"]
+        attempts[asset] = attempts.get(asset, 0) + 1
+        if asset == 2 and attempts[asset] == 1:
+            return Response(400, json={"detail": "temporarily unavailable"})
+        return Response(200, json=make_listing(id=f"L{asset}", asset_id=str(asset), fv=0.2, seed=1, price=100))
+
+    respx.post(LISTINGS_URL).mock(side_effect=_callback)
+    src = tmp_path / "items.csv"
+    src.write_text("asset_id,type,price,description\n1,buy_now,100,uno\n2,buy_now,100,\n3,buy_now,100,tres\n", encoding="utf-8")
+    results = tmp_path / "items.results.csv"
+
+    first = CliRunner().invoke(app, ["listing:list-bulk", str(src)])
+    assert first.exit_code == 1, first.output
+    with results.open(encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["status"], r["listing_id"]) for r in rows] == [("ok", "L1"), ("error", ""), ("ok", "L3")]
+    assert rows[0]["description"] == "uno" and "400" in rows[1]["error"]
+
+    second = CliRunner().invoke(app, ["listing:list-bulk", str(results), "--results", str(results)])
+    assert second.exit_code == 0, second.output
+    assert attempts == {1: 1, 2: 2, 3: 1}
+    with results.open(encoding="utf-8") as f:
+        assert [(r["status"], r["listing_id"]) for r in csv.DictReader(f)] == [("ok", "L1"), ("ok", "L2"), ("ok", "L3")]
+
+
+def test_cli_invalid_rows_publish_nothing(tmp_path):
+    src = tmp_path / "items.jsonl"
+    src.write_text(json.dumps({"asset_id": "1", "price": 100}) + "\n" + json.dumps({"asset_id": "2", "description": "x" * 181, "price": 1}) + "\n", encoding="utf-8")
+    with respx.mock(assert_all_called=False) as mock:
+        route = mock.post(LISTINGS_URL)
+        result = CliRunner().invoke(app, ["listing:list-bulk", str(src)])
+    assert result.exit_code == 2
+    assert route.call_count == 0
+    assert not (tmp_path / "items.results.jsonl").exists()
+
+
+@respx.mock
+def test_cli_records_published_rows_when_interrupted(tmp_path, make_listing):
+    def _callback(request):
+        asset = json.loads(request.content)["asset_id"]
+        if asset == 2:
+            raise RuntimeError("interrumpido")
+        return Response(200, json=make_listing(id=f"L{asset}", asset_id=str(asset), fv=0.2, seed=1, price=100))
+
+    route = respx.post(LISTINGS_URL).mock(side_effect=_callback)
+    src = tmp_path / "items.jsonl"
+    src.write_text("".join(json.dumps({"asset_id": str(i), "price": 100}) + "\n" for i in (1, 2, 3)), encoding="utf-8")
+
+    result = CliRunner().invoke(app, ["listing:list-bulk", str(src), "--concurrency", "1"])
+    assert isinstance(result.exception, RuntimeError)
+    rows = [json.loads(line) for line in (tmp_path / "items.results.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [(r["status"], r["listing_id"]) for r in rows] == [("ok", "L1"), ("pending", ""), ("pending", "")]
+
+    # Re-alimentar el archivo no vuelve a publicar el asset 1
+    route.side_effect = None
+    route.return_value = Response(200, json=make_listing(id="L", fv=0.2, seed=1, price=100))
+    result = CliRunner().invoke(app, ["listing:list-bulk", str(tmp_path / "items.results.jsonl")])
+    assert result.exit_code == 0, result.output
+    assert [json.loads(c.request.content)["asset_id"] for c in route.calls[2:]] == [2, 3]
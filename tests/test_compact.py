@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from csfloat_client.compact import CompactListing, CompactPool
+from csfloat_client.config import get_settings
+from csfloat_client.fakeserver import FakeCSFloatServer
+from csfloat_client.http import CSFloatSession
+from csfloat_client.models import Listing
+from csfloat_client.utils import paginate_listings
+
+
+def test_pool_shares_sellers_stickers_and_strings(make_listing):
+    pool = CompactPool()
+    a = pool.listing(make_listing(id="1", asset_id="10"))
+    data = make_listing(id="2", asset_id="20", price=123)
+    data["seller"]["online"] = False
+    b = pool.listing(data)
+
+    assert isinstance(a, CompactListing) and not hasattr(a, "__dict__")
+    assert a.seller is b.seller and b.seller.online is False
+    assert a.market_hash_name is b.market_hash_name
+    assert a.stickers and a.stickers[0][0] in pool.stickers
+    assert pool.stats()["sellers"] == 1
+
+    # Sin steam_id/obfuscated_id no hay identidad: cada vendedor queda aparte
+    anon = [make_listing(id=i) for i in ("4", "5")]
+    for data, name in zip(anon, ("x", "y")):
+        data["seller"] = {"username": name}
+    c, d = (pool.listing(data) for data in anon)
+    assert c.seller is not d.seller and (c.seller.username, d.seller.username) == ("x", "y")
+
+    original = Listing.model_validate(make_listing(id="3"))
+    rebuilt = pool.to_listing(pool.from_model(original))
+    assert rebuilt.created_at == original.created_at
+    assert rebuilt.item.stickers[0].name == original.item.stickers[0].name
+    assert (rebuilt.price, rebuilt.seller.steam_id, rebuilt.item.float_value) == (
+        original.price,
+        original.seller.steam_id,
+        original.item.float_value,
+    )
+
+
+def test_paginate_listings_compact_matches_models(monkeypatch: pytest.MonkeyPatch):
+    with FakeCSFloatServer(total=300, seed=9) as srv, CSFloatSession() as session:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+
+        full = list(paginate_listings(initial_filters={"limit": 50}, session=session))
+        pool = CompactPool()
+        compact = list(paginate_listings(initial_filters={"limit": 50}, session=session, prefetch=1, compact=pool))
+
+    assert [c.id for c in compact] == [l.id for l in full]
+    assert [(c.price, c.float_value, c.created_at) for c in compact] == [
+        (l.price, l.item.float_value, l.created_at) for l in full
+    ]
+    assert len(pool.sellers) == len({l.seller.steam_id for l in full})
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+from typer.testing import CliRunner
+
+from csfloat_client.cli import app
+from csfloat_client.config import get_settings
+from csfloat_client.crawl import ShardedCrawler, crawl_listings, plan_partitions
+from csfloat_client.fakeserver import FakeCSFloatServer
+from csfloat_client.http import CSFloatSession
+
+
+def test_plan_partitions_are_disjoint_and_cover_the_range():
+    parts = plan_partitions({"min_price": 100, "max_price": 100_000, "sort_by": "most_recent"}, shards=6)
+    assert parts[0].low == 100 and parts[-1].high == 100_000
+    assert all(a.high + 1 == b.low for a, b in zip(parts, parts[1:]))
+    assert parts[0].query()["sort_by"] == "lowest_price"
+
+    by_def = plan_partitions({"def_index": [9, 7, 9]}, by="def_index")
+    assert [p.filters["def_index"] for p in by_def] == [[7], [9]]
+    with pytest.raises(ValueError):
+        plan_partitions({}, by="def_index")
+
+
+@pytest.mark.parametrize("by,filters", [("price", {}), ("float", {}), ("def_index", {"def_index": [7, 9, 16]})])
+def test_sharded_crawl_matches_the_full_market(monkeypatch: pytest.MonkeyPatch, by, filters):
+    with FakeCSFloatServer(total=1500, seed=1) as srv, CSFloatSession() as session:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        monkeypatch.setenv("CSFLOAT_LOG", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+
+        crawler = ShardedCrawler(filters, by=by, shards=3, concurrency=4, split_after=2, session=session)
+        ids = [l.id for page in crawler.pages() for l in page.items]
+
+        data = srv.data
+        expected = {
+            str(324288155723370196 + i)
+            for i in range(data.total)
+            if not filters or data.def_index(i) in filters["def_index"]
+        }
+        assert len(ids) == len(set(ids))
+        assert set(ids) == expected
+        assert crawler.stats.splits > 0
+
+        first = list(crawl_listings(filters, by=by, max_listings=10, session=session))
+        assert len(first) == 10
+
+
+def test_crawl_cli_writes_unique_rows(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    with FakeCSFloatServer(total=400, seed=2) as srv:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+        out = tmp_path / "crawl.ndjson"
+
+        result = CliRunner().invoke(app, ["listings:crawl", "--out", str(out), "--format", "ndjson", "--shards", "2", "--split-after", "1"])
+
+    assert result.exit_code == 0, result.output
+    assert "Exportados 400 listings únicos" in result.output
+    assert len(out.read_text().splitlines()) == 400
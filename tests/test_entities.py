@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import respx
+from httpx import Response
+
+import csfloat_client.endpoints as ep
+from csfloat_client.config import get_settings
+from csfloat_client.entities import ListingEntityCache, get_entity_cache
+from csfloat_client.models import Listing
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entity_cache_ttl_by_state_and_lru(make_listing):
+    clock = FakeClock()
+    cache = ListingEntityCache(max_entries=2, listed_ttl=10, clock=clock)
+    listed = Listing.model_validate(make_listing(id="a"))
+    sold = Listing.model_validate({**make_listing(id="b"), "state": "sold"})
+    cache.put_many([listed, sold])
+
+    clock.now = 5
+    assert cache.get("a") is listed and cache.get("b") is sold
+    clock.now = 11
+    assert cache.get("a") is None  # activo: venció
+    assert cache.get("b") is sold  # vendido: no vence
+
+    cache.put(Listing.model_validate(make_listing(id="c")))
+    cache.put(Listing.model_validate(make_listing(id="d")))
+    assert cache.get("b") is None  # desalojado por LRU
+    assert cache.stats() == {"entries": 2, "hits": 3, "misses": 2, "evictions": 1}
+
+
+@respx.mock
+def test_get_listing_served_from_page_results(make_listing):
+    respx.get("https://csfloat.com/api/v1/listings").mock(
+        return_value=Response(200, json=[make_listing(id="x"), make_listing(id="y")])
+    )
+    detail = respx.get("https://csfloat.com/api/v1/listings/x").mock(
+        return_value=Response(200, json=make_listing(id="x"))
+    )
+
+    ep.get_listings_page(limit=2)
+    assert ep.get_listing("x").id == "x"
+    assert detail.call_count == 0
+    ep.get_listing("x", use_cache=False)
+    assert detail.call_count == 1
+    assert get_entity_cache().hits == 1
+
+
+@respx.mock
+def test_entity_cache_is_per_api_key(monkeypatch, make_listing):
+    detail = respx.get("https://csfloat.com/api/v1/listings/x").mock(
+        return_value=Response(200, json={**make_listing(id="x"), "is_seller": True})
+    )
+    monkeypatch.setenv("CSFLOAT_API_KEY", "vendedor")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert ep.get_listing("x").is_seller
+
+    # Otra API key no ve los campos por usuario cacheados con la anterior
+    detail.return_value = Response(200, json=make_listing(id="x"))
+    monkeypatch.setenv("CSFLOAT_API_KEY", "comprador")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert not ep.get_listing("x").is_seller
+    assert detail.call_count == 2
+
+
+def test_entity_cache_disabled_with_zero_ttl(monkeypatch):
+    monkeypatch.setenv("CSFLOAT_ENTITY_TTL", "0")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert get_entity_cache() is None
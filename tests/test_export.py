@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import csv
+import json
+
+import pytest
+import respx
+from httpx import Response
+from typer.testing import CliRunner
+
+from csfloat_client.cli import app
+from csfloat_client.exporters import _TextWriter, export_pages
+from csfloat_client.models import Listing, ListingsPage
+from csfloat_client.utils import CSV_HEADERS, ExportCheckpoint, export_listings_csv
+
+
+def test_export_streams_rows_before_iterator_is_exhausted(tmp_path, make_listing):
+    out = tmp_path / "out.csv"
+    seen_on_disk: list[int] = []
+
+    def _gen():
+        for i in range(4):
+            if i == 2:
+                with out.open(encoding="utf-8") as f:
+                    seen_on_disk.append(len(f.read().splitlines()))
+            yield Listing.model_validate(make_listing(id=str(i)))
+
+    n = export_listings_csv(_gen(), out, flush_every=1)
+
+    assert n == 4
+    # header + 2 filas ya vaciadas a disco mientras el generador seguía vivo
+    assert seen_on_disk == [3]
+
+
+@respx.mock
+def test_cli_export_writes_all_pages_and_reports_progress(tmp_path, make_listing):
+    def _callback(request):
+        if request.url.params.get("cursor") is None:
+            return Response(200, json=[make_listing(id="a"), make_listing(id="b")], headers={"X-Next-Cursor": "n"})
+        return Response(200, json=[make_listing(id="c")])
+
+    respx.get("https://csfloat.com/api/v1/listings").mock(side_effect=_callback)
+    out = tmp_path / "export.csv"
+
+    result = CliRunner().invoke(app, ["listings:export", "--out", str(out)])
+
+    assert result.exit_code == 0, result.output
+    assert "páginas=2" in result.output
+    with out.open(encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSV_HEADERS
+    assert [r[0] for r in rows[1:]] == ["a", "b", "c"]
+
+
+@respx.mock
+def test_cli_export_resume_continues_from_checkpoint_without_duplicates(tmp_path, make_listing):
+    state = {"fail": True}
+
+    def _callback(request):
+        cursor = request.url.params.get("cursor")
+        if cursor is None:
+            return Response(200, json=[make_listing(id="a")], headers={"X-Next-Cursor": "p2"})
+        if cursor == "p2":
+            if state["fail"]:
+                return Response(400)
+            return Response(200, json=[make_listing(id="b")], headers={"X-Next-Cursor": "p3"})
+        return Response(200, json=[make_listing(id="c")])
+
+    respx.get("https://csfloat.com/api/v1/listings").mock(side_effect=_callback)
+    out = tmp_path / "export.csv"
+    ckpt = ExportCheckpoint.path_for(out)
+
+    first = CliRunner().invoke(app, ["listings:export", "--out", str(out), "--max-float", "0.5"])
+    assert first.exit_code != 0
+    saved = ExportCheckpoint.load(ckpt)
+    assert saved is not None and saved.cursor == "p2" and saved.rows == 1
+
+    # Basura escrita después del último checkpoint debe descartarse
+    with out.open("a", encoding="utf-8") as f:
+        f.write("partial,row\n")
+
+    mismatch = CliRunner().invoke(app, ["listings:export", "--out", str(out), "--resume"])
+    assert mismatch.exit_code == 1
+    before = out.read_bytes()
+    wrong_format = CliRunner().invoke(app, ["listings:export", "--out", str(out), "--max-float", "0.5", "--format", "ndjson", "--resume"])
+    assert wrong_format.exit_code == 1 and "--format csv" in wrong_format.output
+    assert out.read_bytes() == before  # no se truncó ni se mezclaron formatos
+
+    state["fail"] = False
+    second = CliRunner().invoke(app, ["listings:export", "--out", str(out), "--max-float", "0.5", "--resume"])
+    assert second.exit_code == 0, second.output
+
+    with out.open(encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert [r[0] for r in rows] == ["id", "a", "b", "c"]
+    assert not ckpt.exists()
+
+
+def test_export_pages_ndjson_and_parquet_are_typed(tmp_path, make_listing):
+    pages = [
+        ListingsPage(items=[Listing.model_validate(make_listing(id="a"))], next_cursor="n"),
+        ListingsPage(items=[Listing.model_validate(make_listing(id="b", fv=0.5))]),
+    ]
+
+    nd = tmp_path / "out.ndjson"
+    assert export_pages(pages, nd, format="ndjson") == 2
+    first = json.loads(nd.read_text(encoding="utf-8").splitlines()[0])
+    assert first["item"]["float_value"] == 0.0279 and first["description"] is None
+
+    pq = pytest.importorskip("pyarrow.parquet")
+    out = tmp_path / "out.parquet"
+    assert export_pages(pages, out, format="parquet", batch_rows=1) == 2
+    table = pq.read_table(out)
+    assert table.column("item_float_value").to_pylist() == [0.0279, 0.5]
+    assert table.column("item_stickers").to_pylist()[0][0]["stickerId"] == 1060
+    assert str(table.schema.field("price").type) == "int64"
+    assert pq.ParquetFile(out).num_row_groups == 2
+
+
+def test_writer_without_write_page_fails_at_construction(tmp_path):
+    class _Incomplete(_TextWriter):
+        pass
+
+    with pytest.raises(TypeError, match="write_page"):
+        _Incomplete(tmp_path / "out.txt", None)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from csfloat_client import endpoints as ep
+from csfloat_client.cli_options import SORT_VALUES
+from csfloat_client.config import get_settings
+from csfloat_client.fakeserver import FakeCSFloatServer
+from csfloat_client.http import CSFloatHTTPError, CSFloatSession
+from csfloat_client.metrics import get_metrics
+from csfloat_client.utils import paginate_listings
+
+
+def test_fake_server_paginates_and_injects_429(monkeypatch: pytest.MonkeyPatch):
+    with FakeCSFloatServer(total=120, error_429_every=3) as srv, CSFloatSession() as session:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+        get_metrics().reset()
+
+        listings = list(paginate_listings(initial_filters={"limit": 50}, session=session))
+        assert len({l.id for l in listings}) == 120
+        assert get_metrics().snapshot()["retries"] == 1  # 3 páginas + 1 reintento
+
+        assert ep.get_listing(listings[7].id, session=session, use_cache=False).id == listings[7].id
+        with pytest.raises(CSFloatHTTPError):
+            ep.get_listing("1", session=session, use_cache=False)
+
+
+def test_fake_server_filters_sorts_and_fault_bursts(monkeypatch: pytest.MonkeyPatch):
+    with FakeCSFloatServer(total=2000, seed=3, fail_every=1, fail_burst=2) as srv, CSFloatSession() as session:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+
+        page = ep.get_listings_page(session=session, sort_by="lowest_price", def_index=[9], max_float=0.5, limit=50)
+        prices = [l.price for l in page.items]
+        assert prices == sorted(prices) and len(prices) == 50
+        assert all(l.item.def_index == 9 and l.item.float_value <= 0.5 for l in page.items)
+
+        nxt = ep.get_listings_page(session=session, sort_by="lowest_price", def_index=[9], max_float=0.5, cursor=page.next_cursor)
+        assert nxt.items[0].price >= prices[-1]
+        assert not {l.id for l in nxt.items} & {l.id for l in page.items}
+        # Patrón OK, 503, 503, OK: la segunda página se obtuvo tras dos reintentos
+        assert srv.faults["5xx"] == 2 and srv.requests == 4
+
+
+def test_fake_server_rate_limit_returns_retry_after():
+    with FakeCSFloatServer(total=10, rate_limit=1, rate_burst=1, retry_after_min=1) as srv:
+        with httpx.Client(base_url=srv.url) as client:
+            assert client.get("/api/v1/listings").status_code == 200
+            limited = client.get("/api/v1/listings")
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "1"
+
+
+def test_fake_server_accepts_cli_sort_values_and_closes():
+    with FakeCSFloatServer(total=10) as srv, httpx.Client(base_url=srv.url) as client:
+        assert {client.get("/api/v1/listings", params={"sort_by": v}).status_code for v in SORT_VALUES} == {200}
+        assert client.get("/api/v1/listings", params={"sort_by": "nope"}).status_code == 400
+
+    idle = FakeCSFloatServer(total=1)
+    idle.close()  # sin serve_forever: solo libera el socket
+    with pytest.raises(httpx.ConnectError):
+        httpx.get(idle.url + "/api/v1/listings")
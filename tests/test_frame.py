@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from csfloat_client.frame import ListingsFrame
+from csfloat_client.models import Listing
+
+
+def _frame(make_listing):
+    a = make_listing(id="a", price=300, fv=0.01, seed=1)
+    b = make_listing(id="b", price=100, fv=0.20, seed=2)
+    c = make_listing(id="c", price=200, fv=0.05, seed=1)
+    c["item"]["market_hash_name"] = "AK-47 | Redline (Field-Tested)"
+    d = make_listing(id="d", price=50, fv=0.5, seed=3)
+    d["item"]["float_value"] = None
+    d["item"]["scm"] = None
+    # Mezcla de modelos y dicts crudos
+    return ListingsFrame.from_listings([Listing.model_validate(a), b, Listing.model_validate(c), d])
+
+
+def test_filter_sort_and_top_k(make_listing):
+    f = _frame(make_listing)
+
+    assert len(f) == 4
+    assert list(f.filter(max_float=0.1)["id"]) == ["a", "c"]
+    assert list(f.filter(paint_seed=[1, 3], min_price=100)["id"]) == ["a", "c"]
+    assert list(f.sort("price")["id"]) == ["d", "b", "c", "a"]
+    # float ausente queda al final en ambos sentidos
+    assert list(f.sort("float_value", descending=True)["id"]) == ["b", "c", "a", "d"]
+    assert list(f.top_k("float_value", 2)["id"]) == ["a", "c"]
+    assert list(f.top_k("discount", 1, largest=True)["id"]) == ["b"]
+    assert list(f.sort("created_at")["id"]) == ["a", "b", "c", "d"]
+
+
+def test_sort_text_with_missing_values_and_numpy_scalars(make_listing):
+    rows = [make_listing(id=i, price=100, fv=0.1, seed=3) for i in "abcde"]
+    for r, name in zip(rows, ["B", None, "A", "B", None]):
+        r["item"]["market_hash_name"] = name
+    rows[2]["item"]["collection"] = None
+    f = ListingsFrame.from_listings(rows)
+
+    assert list(f.sort("market_hash_name")["id"]) == ["c", "a", "d", "b", "e"]
+    # Descendente: ausentes al final y empates en orden original
+    assert list(f.sort("market_hash_name", descending=True)["id"]) == ["a", "d", "c", "b", "e"]
+    assert list(f.sort("collection")["id"]) == ["a", "b", "d", "e", "c"]
+    assert len(f.filter(paint_seed=np.int64(3))) == 5
+    assert len(f.filter(paint_seed=np.int64(4))) == 0
+
+
+def test_group_by_aggregations(make_listing):
+    f = _frame(make_listing)
+
+    mins = f.group_by("market_hash_name", "price", "min")
+    assert mins == {"AK-47 | Redline (Field-Tested)": 200.0, "M4A4 | Poseidon (Factory New)": 50.0}
+    assert f.group_by("paint_seed", "price", "count") == {1.0: 2.0, 2.0: 1.0, 3.0: 1.0}
+    assert f.group_by("paint_seed", "float_value", "mean")[1.0] == pytest.approx(0.03)
+    with pytest.raises(ValueError):
+        f.group_by("paint_seed", agg="median")
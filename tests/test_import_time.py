@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Presupuesto del import del CLI (medido ~75 ms; holgura para máquinas lentas de CI)
+CLI_IMPORT_BUDGET_MS = 250
+HEAVY = ("httpx", "pydantic", "rich", "dotenv", "numpy", "pyarrow")
+
+
+def _import_time_us(module: str) -> int:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True)
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} no aparece en -X importtime")
+
+
+@pytest.mark.parametrize("module", ["csfloat_client", "csfloat_client.cli"])
+def test_import_does_not_load_heavy_dependencies(module):
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.split() == []
+
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "csfloat_client"
+MODULES = sorted(f"csfloat_client.{p.stem}" for p in PACKAGE_DIR.glob("*.py") if p.stem != "__init__")
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_each_module_imports_first_in_fresh_interpreter(module):
+    # Sin conftest de por medio: detecta ciclos que dependan del orden de import
+    if module == "csfloat_client.frame":
+        pytest.importorskip("numpy")
+    proc = subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True, text=True, cwd=PACKAGE_DIR.parent)
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_cli_import_time_budget():
+    best_ms = min(_import_time_us("csfloat_client.cli") for _ in range(3)) / 1000
+    assert best_ms < CLI_IMPORT_BUDGET_MS, f"import de csfloat_client.cli: {best_ms:.1f} ms"
+
+
+def test_lazy_package_attributes():
+    import csfloat_client
+
+    assert csfloat_client.Listing.__name__ == "Listing"
+    assert "get_listings_page" in dir(csfloat_client)
+    with pytest.raises(AttributeError):
+        csfloat_client.nope  # noqa: B018
+
+
+def test_cli_help_choices_match_owner_modules():
+    # Los textos de --help no pueden importar los módulos dueños; sí deben coincidir
+    from csfloat_client import bulk, cli_options, endpoints, planner, sketch, watch
+    from csfloat_client.crawl import CRAWL_STRATEGIES
+    from csfloat_client.exporters import EXPORT_FORMATS
+    from csfloat_client.sketch import STAT_GROUP_KEYS
+    from csfloat_client.utils import TOP_SCORES
+
+    assert cli_options.EXPORT_FORMAT_CHOICES == EXPORT_FORMATS
+    assert cli_options.CRAWL_STRATEGY_CHOICES == CRAWL_STRATEGIES
+    assert cli_options.TOP_SCORE_CHOICES == tuple(TOP_SCORES)
+    assert cli_options.STAT_GROUP_CHOICES == tuple(STAT_GROUP_KEYS)
+
+    assert cli_options.DEFAULT_BULK_CONCURRENCY == endpoints.DEFAULT_BULK_CONCURRENCY
+    assert cli_options.DEFAULT_POST_CONCURRENCY == bulk.DEFAULT_POST_CONCURRENCY
+    assert cli_options.DEFAULT_WATCH_MIN_INTERVAL == watch.DEFAULT_MIN_INTERVAL
+    assert cli_options.DEFAULT_WATCH_MAX_INTERVAL == watch.DEFAULT_MAX_INTERVAL
+    assert cli_options.DEFAULT_PLAN_MAX_PAGES == planner.DEFAULT_MAX_PAGES
+    assert cli_options.DEFAULT_SKETCH_K == sketch.DEFAULT_K
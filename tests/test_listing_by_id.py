@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import json
+
 import respx
 from httpx import Response
+from typer.testing import CliRunner
 
 from csfloat_client import endpoints as ep
+from csfloat_client.cli import app
+from csfloat_client.http import CSFloatHTTPError
 
 
 @respx.mock
@@ -22,3 +27,35 @@ def test_get_listing_by_id_returns_full_object(make_listing):
     assert l.state == "sold"
     assert l.item.market_hash_name is not None
     assert l.item.inspect_link is not None
+
+
+@respx.mock
+def test_get_listings_by_ids_dedupes_and_reports_errors(make_listing):
+    for listing_id in ("a", "b"):
+        respx.get(f"https://csfloat.com/api/v1/listings/{listing_id}").mock(
+            return_value=Response(200, json=make_listing(id=listing_id))
+        )
+    missing = respx.get("https://csfloat.com/api/v1/listings/zz").mock(
+        return_value=Response(404, json={"message": "not found"})
+    )
+
+    results = list(ep.get_listings_by_ids(["a", "b", "a", "zz", " ", "b\n"], concurrency=2))
+
+    assert sorted(r.id for r in results) == ["a", "b", "zz"]
+    assert {r.id for r in results if r.listing is not None} == {"a", "b"}
+    assert missing.call_count == 1
+    assert isinstance(next(r for r in results if r.id == "zz").error, CSFloatHTTPError)
+
+
+@respx.mock
+def test_listing_get_cli_reads_ids_file_as_ndjson(tmp_path, make_listing):
+    respx.get("https://csfloat.com/api/v1/listings/a").mock(return_value=Response(200, json=make_listing(id="a")))
+    respx.get("https://csfloat.com/api/v1/listings/b").mock(return_value=Response(500, json={}))
+    ids = tmp_path / "ids.txt"
+    ids.write_text("a\nb\na\n")
+
+    result = CliRunner().invoke(app, ["listing:get", "--ids-file", str(ids), "--format", "ndjson"])
+
+    assert result.exit_code == 1
+    lines = [json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")]
+    assert [l["id"] for l in lines] == ["a"]
@@ -50,3 +50,25 @@ def test_get_listings_supports_combined_filters_and_sorted_query(make_listing):
     items = ep.get_listings(**filters)
     assert len(items) == 1
     assert items[0].item.market_hash_name is not None
+
+
+@respx.mock
+def test_page_decoding_fast_path_envelopes_and_raw_mode(make_listing):
+    route = respx.get("https://csfloat.com/api/v1/listings").mock(
+        side_effect=[
+            Response(200, json=[make_listing(id="arr")], headers={"X-Next-Cursor": "c1"}),
+            Response(200, json={"data": {"listings": [make_listing(id="env")]}}),
+            Response(200, json={"results": [make_listing(id="raw")]}, headers={"X-Next-Cursor": "c2"}),
+        ]
+    )
+
+    arr = ep.get_listings_page(limit=1)
+    env = ep.get_listings_page(limit=1)
+    raw = ep.get_listings_page_raw(limit=1)
+
+    assert route.call_count == 3
+    assert arr.items[0].id == "arr" and arr.next_cursor == "c1"
+    assert arr.items[0].item.stickers[0].scm is not None
+    assert env.items[0].id == "env"
+    assert raw.items[0]["id"] == "raw" and raw.next_cursor == "c2"
+    assert isinstance(raw.items[0], dict)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+import respx
+from httpx import Response
+
+from csfloat_client import endpoints as ep
+from csfloat_client.config import get_settings
+from csfloat_client.http import CSFloatHTTPError, set_default_log_mode, set_log_mode
+
+
+@respx.mock
+def test_jsonl_log_goes_to_stderr_and_sampling_keeps_errors(capsys, monkeypatch: pytest.MonkeyPatch, make_listing):
+    respx.get("https://csfloat.com/api/v1/listings/a").mock(return_value=Response(200, json=make_listing(id="a")))
+    respx.get("https://csfloat.com/api/v1/listings/b").mock(return_value=Response(404, json={}))
+    monkeypatch.setenv("CSFLOAT_LOG", "jsonl")
+    monkeypatch.setenv("CSFLOAT_LOG_SAMPLE", "0")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+    ep.get_listing("a", use_cache=False)
+    with pytest.raises(CSFloatHTTPError):
+        ep.get_listing("b", use_cache=False)
+
+    out, err = capsys.readouterr()
+    assert out == ""
+    lines = [json.loads(line) for line in err.splitlines()]
+    assert [(l["path"], l["status"]) for l in lines] == [("/api/v1/listings/b", 404)]
+
+    set_log_mode("jsonl", sample=1.0)
+    ep.get_listing("a", use_cache=False)
+    assert json.loads(capsys.readouterr().err)["status"] == 200
+
+
+@respx.mock
+def test_log_mode_precedence(capsys, monkeypatch: pytest.MonkeyPatch, make_listing):
+    respx.get("https://csfloat.com/api/v1/listings/a").mock(return_value=Response(200, json=make_listing(id="a")))
+
+    set_default_log_mode("off")  # default de comando bulk
+    ep.get_listing("a", use_cache=False)
+    assert capsys.readouterr() == ("", "")
+
+    monkeypatch.setenv("CSFLOAT_LOG", "jsonl")  # el entorno gana sobre el default
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    ep.get_listing("a", use_cache=False)
+    assert capsys.readouterr().err.count("\n") == 1
+
+    set_log_mode("off")  # y el override explícito gana sobre el entorno
+    ep.get_listing("a", use_cache=False)
+    assert capsys.readouterr() == ("", "")
+
+    with pytest.raises(ValueError):
+        set_log_mode("verbose")
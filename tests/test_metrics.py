@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import respx
+from httpx import Response
+from typer.testing import CliRunner
+
+from csfloat_client import endpoints as ep
+from csfloat_client.cli import app
+from csfloat_client.metrics import Histogram, MetricsRegistry, endpoint_label, get_metrics
+
+
+def test_histogram_and_endpoint_labels():
+    hist = Histogram((10, 100, float("inf")))
+    for v in (1, 2, 50, 500):
+        hist.observe(v)
+    assert hist.counts == [2, 1, 1]
+    assert 0 < hist.quantile(0.5) <= 10
+    assert endpoint_label("get", "/api/v1/listings/324288155723370196?x=1") == "GET /api/v1/listings/{id}"
+
+    reg = MetricsRegistry()
+    reg.observe_response("GET", "/api/v1/listings", 200, 12.0, nbytes=10)
+    text = reg.to_prometheus()
+    assert 'csfloat_request_duration_ms_bucket{endpoint="GET /api/v1/listings",le="25"} 1' in text
+    assert 'csfloat_responses_total{endpoint="GET /api/v1/listings",status="200"} 1' in text
+    assert "csfloat_received_bytes_total 10" in text
+
+
+@respx.mock
+def test_request_feeds_metrics_and_cli_stats(tmp_path, make_listing):
+    respx.get("https://csfloat.com/api/v1/listings").mock(
+        side_effect=[Response(429, headers={"Retry-After": "0"}), Response(200, json=[make_listing(id="a")])]
+    )
+    metrics = get_metrics()
+    metrics.reset()
+
+    ep.get_listings_page(limit=1)
+
+    snap = metrics.snapshot()
+    stats = snap["endpoints"]["GET /api/v1/listings"]
+    assert stats["requests"] == 2 and stats["retries"] == 1
+    assert stats["statuses"] == {"200": 1, "429": 1}
+    assert snap["items_parsed"] == 1 and snap["bytes_received"] > 0
+
+    respx.get("https://csfloat.com/api/v1/listings").mock(return_value=Response(200, json=[make_listing(id="b")]))
+    prom = tmp_path / "metrics.prom"
+    result = CliRunner().invoke(app, ["--stats", "--metrics-file", str(prom), "listings:find", "--limit", "1"])
+    assert result.exit_code == 0, result.output
+    assert "requests=1" in result.output
+    assert 'status="200"} 1' in prom.read_text()
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import threading
 import urllib.parse as up
 
+import pytest
 import respx
 from httpx import Response
 
 from csfloat_client import endpoints as ep
+from csfloat_client.http import CSFloatHTTPError
 from csfloat_client.utils import paginate_listings, build_query
 
 
@@ -46,3 +49,46 @@ def test_limit_is_clamped_to_50(make_listing):
 
     page = ep.get_listings_page(limit=200)
     assert len(page.items) == 1
+
+
+@respx.mock
+def test_prefetch_yields_same_order_and_stops_when_consumer_breaks(make_listing):
+    calls = {"n": 0}
+    release = threading.Event()
+
+    def _callback(request):
+        calls["n"] += 1
+        n = calls["n"]
+        if n > 2:
+            # Las páginas adelantadas esperan hasta que el consumidor corte
+            release.wait(timeout=2)
+        return Response(200, json=[make_listing(id=str(n))], headers={"X-Next-Cursor": f"c{n}"})
+
+    respx.get("https://csfloat.com/api/v1/listings").mock(side_effect=_callback)
+
+    it = paginate_listings(initial_filters={"limit": 1}, prefetch=1)
+    assert [next(it).id, next(it).id] == ["1", "2"]
+    release.set()
+    it.close()
+
+    # Con profundidad 1: como mucho la página en cola y la request en curso
+    assert calls["n"] <= 4
+    # El cierre espera al worker: no queda ningún hilo de prefetch vivo
+    assert not [t for t in threading.enumerate() if t.name.startswith("csfloat-")]
+
+
+@respx.mock
+def test_prefetch_propagates_errors_and_respects_max_pages(make_listing):
+    respx.get("https://csfloat.com/api/v1/listings").mock(
+        side_effect=[
+            Response(200, json=[make_listing(id="1")], headers={"X-Next-Cursor": "a"}),
+            Response(200, json=[make_listing(id="2")], headers={"X-Next-Cursor": "b"}),
+            Response(400),
+        ]
+    )
+    items = list(paginate_listings(initial_filters={"limit": 1}, max_pages=2, prefetch=2))
+    assert [l.id for l in items] == ["1", "2"]
+
+    respx.get("https://csfloat.com/api/v1/listings").mock(return_value=Response(400))
+    with pytest.raises(CSFloatHTTPError):
+        list(paginate_listings(prefetch=2))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from csfloat_client.cli import app
+from csfloat_client.config import get_settings
+from csfloat_client.fakeserver import FakeCSFloatServer
+from csfloat_client.http import CSFloatSession
+from csfloat_client.planner import SeedTarget, naive_request_count, parse_seeds, plan_queries, run_plan
+
+
+def test_plan_collapses_targets_by_seed():
+    targets = [
+        SeedTarget(7, 44, seeds=(661, 670)),
+        SeedTarget(7, 180, seeds=(661,), max_float=0.1),
+        SeedTarget(4, 38, seeds=(670, 999), min_float=0.0, max_float=0.08),
+        SeedTarget(500, 38, min_float=0.0, max_float=0.08),
+    ]
+    queries = plan_queries(targets, extra_filters={"category": 1, "paint_seed": 1})
+    by_seed = {q.filters.get("paint_seed"): q for q in queries}
+
+    assert naive_request_count(targets) == 6
+    assert len(queries) == 4
+    # Mismo seed en dos paints del AK: sin paint_index, float sin tope inferior
+    assert by_seed[661].filters == {"category": 1, "def_index": [7], "paint_seed": 661, "limit": 50}
+    assert by_seed[670].filters["def_index"] == [4, 7]
+    assert by_seed[999].filters["paint_index"] == 38
+    assert by_seed[None].filters == {"category": 1, "def_index": [500], "paint_index": 38, "min_float": 0.0, "max_float": 0.08, "limit": 50}
+
+    scan = plan_queries(targets, scan_over=1)
+    assert {q.filters.get("paint_seed") for q in scan} == {661, None}
+
+
+def test_parse_targets_and_seed_ranges():
+    assert parse_seeds("5,1-3, 3") == (1, 2, 3, 5)
+    t = SeedTarget.parse("7:44:661,670:0-0.2")
+    assert (t.def_index, t.paint_index, t.seeds, t.min_float, t.max_float) == (7, 44, (661, 670), 0.0, 0.2)
+    assert SeedTarget.from_dict({"def_index": 4, "paint_index": 38, "paint_seed": 412}).seeds == (412,)
+    with pytest.raises(ValueError):
+        SeedTarget.parse("7")
+
+
+def test_run_plan_matches_brute_force(monkeypatch: pytest.MonkeyPatch):
+    with FakeCSFloatServer(total=3000, seed=3) as srv, CSFloatSession() as session:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+        data = srv.data
+        seeds = tuple(range(0, 1000, 7))
+        targets = [
+            SeedTarget(7, 44, seeds=seeds, name="ch"),
+            SeedTarget(7, 180, seeds=seeds, max_float=0.5),
+            SeedTarget(4, 38, seeds=seeds[:40]),
+        ]
+
+        result = run_plan(targets, concurrency=4, session=session)
+
+        for i, t in enumerate(targets):
+            expected = {
+                str(324288155723370196 + j)
+                for j in range(data.total)
+                if data.def_index(j) == t.def_index
+                and data.paint_index(j) == t.paint_index
+                and data.paint_seed[j] in t.seeds
+                and (t.max_float is None or data.float_value[j] <= t.max_float)
+            }
+            assert {l.id for l in result.matches.get(i, [])} == expected
+        assert result.requests == srv.requests == len(seeds)
+        assert result.saved == naive_request_count(targets) - len(seeds)
+        assert set(result.by_label()) == {"ch", "7:180", "4:38"}
+
+
+def test_seeds_cli_reports_savings(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    targets = tmp_path / "targets.jsonl"
+    targets.write_text(json.dumps({"def_index": 4, "paint_index": 38, "seeds": "0-99", "name": "glock"}) + "\n")
+    with FakeCSFloatServer(total=500, seed=4) as srv:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+
+        result = CliRunner().invoke(
+            app, ["listings:seeds", "--targets-file", str(targets), "--target", "500:38:0-99", "--format", "ndjson"]
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "requests=100 (ingenuo=200, ahorradas=100)" in result.output
+    lines = [json.loads(line) for line in result.output.splitlines() if line.startswith("{")]
+    assert lines and {row["target"] for row in lines} <= {"glock", "500:38"}
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import pytest
+import respx
+from httpx import Response
+
+from csfloat_client import endpoints as ep
+from csfloat_client.config import get_settings
+from csfloat_client.http import CSFloatSession
+from csfloat_client.ratelimit import FileRateLimiter, RateLimiter, get_rate_limiter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_spaces_requests_and_aimd_adjusts_rate():
+    clock = _Clock()
+    rl = RateLimiter(2.0, burst=1, clock=clock, max_rate=4.0)
+
+    assert rl.reserve() == 0.0
+    assert rl.reserve() == 0.5  # sin tokens: esperar 1/rate
+
+    rl.feedback(429, "3")
+    assert rl.rate == 1.0
+    # Retry-After pausa a todos los consumidores
+    assert rl.reserve() >= 3.0
+
+    clock.now += 10
+    for _ in range(50):
+        rl.feedback(200)
+    assert 1.0 < rl.rate <= 4.0
+
+
+def test_reservations_during_pause_are_spaced_after_it():
+    clock = _Clock()
+    rl = RateLimiter(2.0, burst=4, clock=clock, decrease=1.0)
+
+    rl.feedback(429, "5")
+    waits = [rl.reserve() for _ in range(4)]
+    wakes = [clock.now + w for w in waits]
+    # Sin manada sincronizada: cada uno sale 1/rate después del anterior
+    assert wakes == [105.5, 106.0, 106.5, 107.0]
+
+    # Pasada la pausa el bucket vuelve a rellenarse desde el fin de la pausa
+    clock.now = 109.0
+    assert rl.reserve() == 0.0
+
+
+def test_auto_limiter_is_idle_until_first_429():
+    clock = _Clock()
+    rl = RateLimiter(clock=clock)
+
+    for _ in range(20):
+        clock.now += 0.1
+        assert rl.reserve() == 0.0
+    rl.feedback(200)
+    assert rl.rate is None
+
+    # 20 requests en 2 s: arranca a la mitad de lo observado
+    rl.feedback(429)
+    assert rl.rate == pytest.approx(5.0)
+    assert rl.reserve() > 0.0
+
+
+def test_process_limiter_is_off_by_default(monkeypatch: pytest.MonkeyPatch):
+    assert get_rate_limiter().rate is None  # type: ignore[union-attr]
+
+    monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert get_rate_limiter() is None
+
+    monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "3")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert get_rate_limiter().rate == 3.0  # type: ignore[union-attr]
+
+
+def test_file_rate_limiter_shares_budget_between_instances(tmp_path):
+    clock = _Clock()
+    path = tmp_path / "bucket.json"
+    a = FileRateLimiter(path, 1.0, burst=1, clock=clock)
+    b = FileRateLimiter(path, 1.0, burst=1, clock=clock)
+
+    assert a.reserve() == 0.0
+    # El segundo "proceso" ve el bucket ya consumido
+    assert b.reserve() == 1.0
+
+
+@respx.mock
+def test_session_feeds_limiter_with_429(make_listing):
+    respx.get("https://csfloat.com/api/v1/listings").mock(
+        side_effect=[
+            Response(429, headers={"Retry-After": "0"}),
+            Response(200, json=[make_listing()]),
+        ]
+    )
+    rl = RateLimiter(10.0, sleep=lambda _: None)
+
+    with CSFloatSession(rate_limiter=rl) as session:
+        ep.get_listings_page(session=session, limit=1)
+
+    assert rl.rate < 10.0
+
+
+@respx.mock
+def test_retry_after_is_waited_once(monkeypatch: pytest.MonkeyPatch, make_listing):
+    respx.get("https://csfloat.com/api/v1/listings").mock(
+        side_effect=[
+            Response(429, headers={"Retry-After": "3"}),
+            Response(200, json=[make_listing()]),
+        ]
+    )
+    monkeypatch.delenv("CSFLOAT_TEST_NO_SLEEP")
+    backoff: list[float] = []
+    monkeypatch.setattr("csfloat_client.http.time.sleep", backoff.append)
+    waits: list[float] = []
+    rl = RateLimiter(10.0, sleep=waits.append)
+
+    with CSFloatSession(rate_limiter=rl) as session:
+        ep.get_listings_page(session=session, limit=1)
+
+    # La pausa la hace el limitador; el backoff no vuelve a dormir
+    assert backoff == []
+    assert len(waits) == 1 and 3.0 <= waits[0] < 3.5
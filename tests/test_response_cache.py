@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import time
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from csfloat_client import endpoints as ep
+from csfloat_client.cache import ResponseCache
+from csfloat_client.config import get_settings
+from csfloat_client.http import DISABLED, CSFloatSession
+
+
+@respx.mock
+def test_cache_serves_fresh_then_revalidates_with_etag(tmp_path, make_listing):
+    seen_inm: list[str | None] = []
+
+    def _callback(request):
+        seen_inm.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return Response(304, headers={"ETag": '"v1"'})
+        return Response(200, json=[make_listing(id="a")], headers={"ETag": '"v1"', "X-Next-Cursor": "c"})
+
+    route = respx.get("https://csfloat.com/api/v1/listings").mock(side_effect=_callback)
+    cache = ResponseCache(tmp_path, ttls={"/api/v1/listings": 60})
+
+    with CSFloatSession(cache=cache) as session:
+        first = ep.get_listings_page(session=session, max_float=0.1, limit=5)
+        # Mismos filtros en otro orden -> misma clave
+        second = ep.get_listings_page(session=session, limit=5, max_float=0.1)
+        assert route.call_count == 1 and cache.hits == 1
+        assert second.items[0].id == first.items[0].id and second.next_cursor == "c"
+
+        # Forzar vencimiento: revalida con If-None-Match y sirve el cuerpo cacheado
+        cache._conn.execute("UPDATE entries SET expires_at = ?", (time.time() - 1,))
+        third = ep.get_listings_page(session=session, max_float=0.1, limit=5)
+
+    assert seen_inm == [None, '"v1"']
+    assert third.items[0].id == "a" and cache.revalidated == 1
+
+
+@respx.mock
+def test_cache_honors_no_store_and_is_keyed_by_api_key(tmp_path, monkeypatch: pytest.MonkeyPatch, make_listing):
+    route = respx.get("https://csfloat.com/api/v1/listings/x").mock(
+        return_value=Response(200, json=make_listing(id="x"))
+    )
+    nostore = respx.get("https://csfloat.com/api/v1/listings/y").mock(
+        return_value=Response(200, json=make_listing(id="y"), headers={"Cache-Control": "no-store"})
+    )
+    cache = ResponseCache(tmp_path)
+
+    with CSFloatSession(cache=cache) as session:
+        ep.get_listing("x", session=session, use_cache=False)
+        ep.get_listing("x", session=session, use_cache=False)
+        monkeypatch.setenv("CSFLOAT_API_KEY", "k")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+        ep.get_listing("x", session=session, use_cache=False)
+        ep.get_listing("y", session=session, use_cache=False)
+        ep.get_listing("y", session=session, use_cache=False)
+
+    assert route.call_count == 2
+    assert nostore.call_count == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=25)
+    req = httpx.Request("GET", "https://csfloat.com/a")
+    for key in ("a", "b", "c"):
+        cache.put(key, "/x", httpx.Response(200, content=b"0123456789", request=req))
+        time.sleep(0.01)
+        if key == "b":
+            cache.get("a")  # "a" pasa a ser más reciente que "b"
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+@respx.mock
+def test_process_cache_per_endpoint_ttls_and_session_opt_out(tmp_path, monkeypatch: pytest.MonkeyPatch, make_listing):
+    from csfloat_client.cache import get_response_cache
+
+    monkeypatch.setenv("CSFLOAT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("CSFLOAT_CACHE_TTL_DETAIL", "300")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    cache = get_response_cache()
+    assert cache is not None
+    assert cache.ttl_for("/api/v1/listings", {}) == 15.0
+    assert cache.ttl_for("/api/v1/listings/x", {}) == 300.0
+
+    route = respx.get("https://csfloat.com/api/v1/listings/x").mock(
+        return_value=Response(200, json=make_listing(id="x"))
+    )
+    with CSFloatSession() as session:
+        ep.get_listing("x", session=session, use_cache=False)
+        ep.get_listing("x", session=session, use_cache=False)
+    assert route.call_count == 1
+    # cache=DISABLED ignora el cache del proceso; None usa el del proceso
+    with CSFloatSession(cache=None) as session:
+        ep.get_listing("x", session=session, use_cache=False)
+    assert route.call_count == 1
+    with CSFloatSession(cache=DISABLED) as session:
+        ep.get_listing("x", session=session, use_cache=False)
+    assert route.call_count == 2
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+import respx
+from httpx import Response
+
+from csfloat_client import endpoints as ep
+from csfloat_client.config import get_settings
+from csfloat_client.http import CSFloatSession, get_default_session
+from csfloat_client.utils import paginate_listings
+
+
+@respx.mock
+def test_pagination_reuses_single_client_from_session(make_listing):
+    calls = {"n": 0}
+
+    def _callback(request):
+        calls["n"] += 1
+        headers = {"X-Next-Cursor": f"c{calls['n']}"} if calls["n"] < 3 else {}
+        return Response(200, json=[make_listing(id=str(calls["n"]))], headers=headers)
+
+    respx.get("https://csfloat.com/api/v1/listings").mock(side_effect=_callback)
+
+    with CSFloatSession(max_connections=2) as session:
+        first = session.client
+        items = list(paginate_listings(initial_filters={"limit": 1}, session=session))
+        assert session.client is first
+
+    assert [l.id for l in items] == ["1", "2", "3"]
+
+
+@respx.mock
+def test_default_session_rebuilds_client_when_settings_change(monkeypatch: pytest.MonkeyPatch, make_listing):
+    seen: list[str | None] = []
+
+    def _callback(request):
+        seen.append(request.headers.get("Authorization"))
+        return Response(200, json=make_listing(id="x"))
+
+    respx.get("https://csfloat.com/api/v1/listings/x").mock(side_effect=_callback)
+
+    ep.get_listing("x", use_cache=False)
+    monkeypatch.setenv("CSFLOAT_API_KEY", "k1")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    ep.get_listing("x", session=get_default_session(), use_cache=False)
+
+    assert seen == [None, "k1"]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import bisect
+import json
+import random
+
+import pytest
+from typer.testing import CliRunner
+
+from csfloat_client.cli import app
+from csfloat_client.config import get_settings
+from csfloat_client.fakeserver import FakeCSFloatServer
+from csfloat_client.http import CSFloatSession
+from csfloat_client.models import Listing
+from csfloat_client.sketch import KLLSketch, PriceStatsAggregator, wear_bucket
+from csfloat_client.utils import paginate_listings
+
+
+def test_kll_quantiles_merge_and_roundtrip():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(6, 1) for _ in range(50_000)]
+    a, b = KLLSketch(200, rng=random.Random(1)), KLLSketch(200, rng=random.Random(2))
+    for v in values[:30_000]:
+        a.update(v)
+    for v in values[30_000:]:
+        b.update(v)
+    merged = KLLSketch.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+
+    ordered = sorted(values)
+    assert merged.n == len(values)
+    assert sum(len(level) for level in merged.compactors) < 1_000
+    for q in (0.1, 0.5, 0.9):
+        est = merged.quantile(q)
+        assert abs(bisect.bisect_right(ordered, est) / len(values) - q) < 0.02
+    assert KLLSketch().quantile(0.5) is None
+
+
+def test_aggregator_groups_and_merges(make_listing):
+    listings = []
+    for i, (fv, price) in enumerate([(0.01, 100), (0.02, 300), (0.2, 50), (0.5, None)]):
+        data = make_listing(id=str(i), fv=fv, price=price or 0)
+        data["price"] = price
+        data["item"]["wear_name"] = None
+        listings.append(Listing.model_validate(data))
+    assert [wear_bucket(l) for l in listings] == ["Factory New", "Factory New", "Field-Tested", "Battle-Scarred"]
+
+    first = PriceStatsAggregator(by=("item_name", "wear"))
+    first.update(listings[:2])
+    second = PriceStatsAggregator(by=("item_name", "wear"))
+    second.update(listings[2:])
+    merged = PriceStatsAggregator.from_dict(first.to_dict()).merge(second)
+
+    rows = {row["wear"]: row for row in merged.summaries()}
+    assert rows["Factory New"]["item_name"] == "M4A4 | Poseidon"
+    assert (rows["Factory New"]["count"], rows["Factory New"]["min"], rows["Factory New"]["max"]) == (2, 100, 300)
+    assert rows["Factory New"]["mean"] == 200
+    assert merged.listings == 4 and merged.skipped == 1
+    with pytest.raises(ValueError):
+        merged.merge(PriceStatsAggregator(by=("wear",)))
+
+
+def test_stats_cli_persists_and_merges(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    out = tmp_path / "stats.json"
+    with FakeCSFloatServer(total=800, seed=8) as srv, CSFloatSession() as session:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+        runner = CliRunner()
+
+        result = runner.invoke(app, ["listings:stats", "--def-index", "7", "--out", str(out), "--format", "json"])
+        assert result.exit_code == 0, result.output
+        prices = sorted(l.price for l in paginate_listings(initial_filters={"def_index": [7]}, session=session))
+
+        again = runner.invoke(app, ["listings:stats", "--offline", "--merge", str(out), "--merge", str(out), "--format", "csv"])
+
+    rows = json.loads(next(line for line in result.output.splitlines() if line.startswith("[")))
+    assert sum(r["count"] for r in rows) == len(prices)
+    assert min(r["min"] for r in rows) == prices[0]
+    assert again.exit_code == 0, again.output
+    assert "market_hash_name,count,min,p10,p50,p90,max,mean\n" in again.output
+    assert f"listings={2 * len(prices)}" in again.output
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import respx
+from httpx import Response
+from typer.testing import CliRunner
+
+from csfloat_client.cli import app
+from csfloat_client.models import Listing
+from csfloat_client.store import MarketStore
+
+
+def test_upsert_and_query_roundtrip_with_filters(tmp_path, make_listing):
+    cheap = make_listing(id="cheap", asset_id="1", price=100, fv=0.01, seed=1)
+    pricey = make_listing(id="pricey", asset_id="2", price=900, fv=0.2, seed=2)
+    other = make_listing(id="other", asset_id="3", price=500, fv=0.05, seed=1)
+    other["item"]["def_index"] = 7
+    other["item"]["stickers"] = []
+
+    with MarketStore(tmp_path / "m.db") as store:
+        store.upsert_listings([Listing.model_validate(d) for d in (cheap, pricey, other)], batch_size=2)
+        # Re-upsert con precio nuevo no duplica
+        cheap["price"] = 150
+        store.upsert_listings([Listing.model_validate(cheap)])
+        assert store.count() == 3
+
+        by_price = store.query(sort_by="lowest_price")
+        assert [l.id for l in by_price] == ["cheap", "other", "pricey"]
+        assert by_price[0].price == 150
+        assert by_price[0].item.stickers[0].stickerId == 1060
+        assert by_price[0].seller.statistics is not None
+
+        assert [l.id for l in store.query(def_index=[16], max_float=0.1)] == ["cheap"]
+        assert [l.id for l in store.query(paint_seed=1, sort_by="highest_price")] == ["other", "cheap"]
+        assert {l.id for l in store.query(stickers="1060|3")} == {"cheap", "pricey"}
+        assert store.query(user_id="nobody") == []
+
+
+@respx.mock
+def test_cli_sync_then_query_offline(tmp_path, make_listing):
+    respx.get("https://csfloat.com/api/v1/listings").mock(
+        return_value=Response(200, json=[make_listing(id="a"), make_listing(id="b", asset_id="9")])
+    )
+    db = tmp_path / "m.db"
+    runner = CliRunner()
+
+    sync = runner.invoke(app, ["listings:sync", "--db", str(db)])
+    assert sync.exit_code == 0, sync.output
+
+    respx.reset()
+    query = runner.invoke(app, ["listings:query", "--db", str(db), "--paint-index", "449"])
+    assert query.exit_code == 0, query.output
+    assert "2 resultados" in query.output
+
+    bad = runner.invoke(app, ["listings:query", "--db", str(db), "--sort-by", "num_bids"])
+    assert bad.exit_code == 1
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from typer.testing import CliRunner
+
+from csfloat_client.cli import app
+from csfloat_client.config import get_settings
+from csfloat_client.fakeserver import FakeCSFloatServer
+from csfloat_client.http import CSFloatSession
+from csfloat_client.models import Listing
+from csfloat_client.utils import TopK, paginate_listings, score_discount, score_price_per_float, top_listings, wear_position
+
+
+def test_topk_matches_full_sort_and_stays_bounded(make_listing):
+    rng = random.Random(5)
+    listings = []
+    for i in range(500):
+        data = make_listing(id=str(i), fv=rng.random(), price=rng.randrange(100, 10_000))
+        data["item"]["scm"] = {"price": 5_000, "volume": 1}
+        listings.append(Listing.model_validate(data))
+
+    entered = []
+    leaders = top_listings(listings + listings[:50], 7, score="discount", on_enter=lambda top, l: entered.append(len(top)))
+
+    expected = sorted(listings, key=lambda l: l.price)[:7]
+    assert [l.id for _, l in leaders] == [l.id for l in expected]
+    assert leaders[0][0] == pytest.approx(1 - expected[0].price / 5_000)
+    assert max(entered) == 7
+
+    by_float = TopK(3, score_price_per_float)
+    for l in listings:
+        by_float.push(l)
+    assert [v for v, _ in by_float.leaders()] == sorted((score_price_per_float(l) for l in listings), reverse=True)[:3]
+
+
+def test_scores_handle_missing_fields(make_listing):
+    data = make_listing()
+    data["item"]["scm"] = None
+    l = Listing.model_validate(data)
+    assert score_discount(l) is None
+    assert wear_position(0.0) == 0.0 and wear_position(0.07) == 0.0 and wear_position(1.0) == 1.0
+    with pytest.raises(ValueError):
+        TopK(5, "nope")
+
+
+def test_top_cli_against_fake_server(monkeypatch: pytest.MonkeyPatch):
+    with FakeCSFloatServer(total=600, seed=6) as srv, CSFloatSession() as session:
+        monkeypatch.setenv("CSFLOAT_BASE", srv.url)
+        monkeypatch.setenv("CSFLOAT_RATE_LIMIT", "off")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+
+        result = CliRunner().invoke(app, ["listings:top", "--k", "5", "--score", "discount", "--prefetch", "0"])
+        best = top_listings(paginate_listings(initial_filters={"limit": 50}, session=session), 1)
+
+    assert result.exit_code == 0, result.output
+    assert "líder" in result.output
+    assert "Recorridos 600 listings" in result.output
+    assert best[0][1].id in result.output
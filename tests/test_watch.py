@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+
+import respx
+from httpx import Response
+from typer.testing import CliRunner
+
+from csfloat_client.cli import app
+from csfloat_client.watch import ListingWatcher
+
+
+def _listing(make_listing, id: str, minute: int, price: int = 1000):
+    data = make_listing(id=id, price=price)
+    data["created_at"] = f"2024-05-01T10:{minute:02d}:00Z"
+    return data
+
+
+@respx.mock
+def test_watcher_stops_at_high_water_mark_and_tracks_prices(make_listing):
+    route = respx.get("https://csfloat.com/api/v1/listings")
+    route.side_effect = [
+        # ciclo 1: fija la marca
+        Response(200, json=[_listing(make_listing, "b", 2), _listing(make_listing, "a", 1)], headers={"X-Next-Cursor": "c1"}),
+        # ciclo 2: un nuevo ("c") y "b" bajó de precio; no pide la página siguiente
+        Response(200, json=[_listing(make_listing, "c", 3), _listing(make_listing, "b", 2, price=900)], headers={"X-Next-Cursor": "c1"}),
+        # ciclo 3: página llena de nuevos -> sigue el cursor hasta encontrar la marca
+        Response(200, json=[_listing(make_listing, "e", 5), _listing(make_listing, "d", 4)], headers={"X-Next-Cursor": "c2"}),
+        Response(200, json=[_listing(make_listing, "c", 3)], headers={"X-Next-Cursor": "c3"}),
+        # ciclo 4: sin novedades
+        Response(200, json=[_listing(make_listing, "e", 5)], headers={"X-Next-Cursor": "c1"}),
+    ]
+    sleeps = []
+    watcher = ListingWatcher(min_interval=1, max_interval=8, track_prices=True, sleep=sleeps.append)
+
+    events = [(e.event, e.listing.id) for e in watcher.run(max_cycles=4)]
+
+    assert events == [("new", "c"), ("price_change", "b"), ("new", "e"), ("new", "d")]
+    assert route.call_count == 5 and watcher.requests == 5
+    assert route.calls[1].request.url.params["sort_by"] == "most_recent"
+    assert "cursor" not in route.calls[1].request.url.params
+    assert route.calls[3].request.url.params["cursor"] == "c2"
+    assert sleeps == [1, 1, 1]  # con novedades el intervalo se mantiene en el mínimo
+    assert watcher.interval == 1.5  # el ciclo sin novedades lo estira
+
+
+@respx.mock
+def test_watcher_bypasses_disk_cache(tmp_path, monkeypatch, make_listing):
+    from csfloat_client.config import get_settings
+
+    monkeypatch.setenv("CSFLOAT_CACHE_DIR", str(tmp_path))
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    route = respx.get("https://csfloat.com/api/v1/listings")
+    route.side_effect = [
+        Response(200, json=[_listing(make_listing, "a", 1)]),
+        Response(200, json=[_listing(make_listing, "b", 2), _listing(make_listing, "a", 1)]),
+    ]
+    watcher = ListingWatcher(sleep=lambda _: None)
+
+    events = [(e.event, e.listing.id) for e in watcher.run(max_cycles=2)]
+
+    # Dentro del TTL del cache: el segundo ciclo igual va a la red y ve "b"
+    assert events == [("new", "b")]
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_watcher_survives_http_error_and_backs_off(make_listing):
+    route = respx.get("https://csfloat.com/api/v1/listings")
+    route.side_effect = [
+        Response(200, json=[_listing(make_listing, "a", 1)]),
+        Response(400, json={"detail": "bad request"}),
+        Response(200, json=[_listing(make_listing, "b", 2), _listing(make_listing, "a", 1)]),
+    ]
+    sleeps = []
+    errors = []
+    watcher = ListingWatcher(min_interval=1, max_interval=8, sleep=sleeps.append, on_error=errors.append)
+
+    events = [(e.event, e.listing.id) for e in watcher.run(max_cycles=3)]
+
+    assert events == [("new", "b")]
+    assert watcher.cycles == 3 and watcher.errors == 1
+    assert len(errors) == 1 and "HTTP 400" in str(errors[0])
+    assert sleeps == [1, 8]  # tras el error espera max_interval
+    assert watcher.interval == 4  # y vuelve a bajar con novedades
+
+
+@respx.mock
+def test_watch_cli_emits_ndjson(make_listing):
+    respx.get("https://csfloat.com/api/v1/listings").mock(
+        return_value=Response(200, json=[_listing(make_listing, "a", 1)])
+    )
+    result = CliRunner().invoke(app, ["listings:watch", "--max-cycles", "1", "--emit-initial"])
+    assert result.exit_code == 0, result.output
+    event = json.loads(result.stdout.splitlines()[0])
+    assert event["event"] == "new" and event["listing"]["id"] == "a"